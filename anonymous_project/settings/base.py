@@ -6,6 +6,8 @@ Django base settings for anonymous_project project.
 
 from pathlib import Path
 import environ
+from kombu import Queue
+from kombu.common import Broadcast
 
 # 환경 변수 초기화
 env = environ.Env(
@@ -165,6 +167,98 @@ REDIS_CONNECTION_PARAMS = {
 if REDIS_PASSWORD:
     REDIS_CONNECTION_PARAMS['password'] = REDIS_PASSWORD
 
+# 접속자 수 write-behind 버퍼 설정 (main.buffer)
+# 워커 프로세스 메모리에서 집계한 뒤 주기적으로 하나의 파이프라인으로 Redis에 반영
+VISITOR_COUNT_BUFFER_ENABLED = env.bool('VISITOR_COUNT_BUFFER_ENABLED', default=True)
+VISITOR_COUNT_BUFFER_FLUSH_INTERVAL_MS = env.int('VISITOR_COUNT_BUFFER_FLUSH_INTERVAL_MS', default=1000)  # 반영 주기 (밀리초)
+VISITOR_COUNT_BUFFER_FLUSH_MAX_EVENTS = env.int('VISITOR_COUNT_BUFFER_FLUSH_MAX_EVENTS', default=500)  # 이 이벤트 수에 도달하면 즉시 반영
+VISITOR_COUNT_BUFFER_MAX_PENDING_IPS = env.int('VISITOR_COUNT_BUFFER_MAX_PENDING_IPS', default=10000)  # 버퍼에 보관할 최대 IP 수 (메모리 상한)
+
+# 접속자 수 집계 경로
+# False로 두면 VisitorCountMiddleware를 사용하지 않음 (tail_visitor_log 커맨드로 nginx 접속 로그에서 집계할 때)
+VISITOR_COUNT_MIDDLEWARE_ENABLED = env.bool('VISITOR_COUNT_MIDDLEWARE_ENABLED', default=True)
+VISITOR_ACCESS_LOG_PATH = env('VISITOR_ACCESS_LOG_PATH', default='/var/log/nginx/anonymous_project_visitors.log')  # nginx visitor_log 형식 로그
+
+# 고유 접속자 집계 방식 (main.utils)
+# 'set': SADD/SCARD (정확, IP 수에 비례해 메모리 사용)
+# 'hll': PFADD/PFCOUNT (오차 약 0.81%, 하루 약 12KB) - 전환 전 migrate_visitor_sets_to_hll 실행
+VISITOR_UNIQUE_BACKEND = env('VISITOR_UNIQUE_BACKEND', default='set')
+
+# 방문 쿠키 (main.middleware.VisitorCountMiddleware)
+# 서명된 쿠키로 방문 단위를 판정해 고유 접속자/방문 수는 방문당 한 번만 반영하고, 이어지는 페이지뷰는 버퍼로 일괄 반영
+# (VisitorStats.visit_count=방문 수, visitor_count=페이지뷰 수, 비활성화 시 두 값이 같음)
+VISITOR_VISIT_COOKIE_ENABLED = env.bool('VISITOR_VISIT_COOKIE_ENABLED', default=False)
+VISITOR_VISIT_COOKIE_NAME = env('VISITOR_VISIT_COOKIE_NAME', default='visit')
+VISITOR_VISIT_TIMEOUT_SECONDS = env.int('VISITOR_VISIT_TIMEOUT_SECONDS', default=60 * 30)  # 마지막 페이지뷰 후 방문 종료까지의 시간 (초)
+
+# 접속자 수 표본 집계 (main.sampling)
+# 1보다 작으면 N(=1/비율)건 중 1건만 가중치 N으로 반영해 카운터는 불편 추정값이 되고, 동기화 시 VisitorStats.sample_rate에 기록
+# adaptive이면 Redis 쓰기 지연 시간이 SLOW_MS를 넘을 때 MIN_SAMPLE_RATE까지 비율을 절반씩 낮추고, 회복되면 다시 높임
+VISITOR_COUNT_SAMPLE_RATE = env.float('VISITOR_COUNT_SAMPLE_RATE', default=1.0)
+VISITOR_COUNT_ADAPTIVE_SAMPLING = env.bool('VISITOR_COUNT_ADAPTIVE_SAMPLING', default=False)
+VISITOR_COUNT_SAMPLING_SLOW_MS = env.int('VISITOR_COUNT_SAMPLING_SLOW_MS', default=50)  # 비율을 낮추는 Redis 지연 시간 이동 평균 (밀리초)
+VISITOR_COUNT_MIN_SAMPLE_RATE = env.float('VISITOR_COUNT_MIN_SAMPLE_RATE', default=0.01)  # adaptive 최소 비율
+
+# 워커별 일일 Bloom 필터 (main.bloom)
+# 이 워커가 오늘 이미 반영한 IP는 SADD/PFADD를 생략 (거짓 양성 비율만큼 고유 접속자 수가 적게 집계될 수 있음)
+# 비트 배열 크기는 용량과 비율로 정해짐 (기본값 약 180KB/워커), 지표는 날짜가 바뀔 때 로그로 기록
+VISITOR_BLOOM_FILTER_ENABLED = env.bool('VISITOR_BLOOM_FILTER_ENABLED', default=False)
+VISITOR_BLOOM_FILTER_CAPACITY = env.int('VISITOR_BLOOM_FILTER_CAPACITY', default=100000)  # 하루 예상 항목 수 (IP + 시간대별 IP)
+VISITOR_BLOOM_FILTER_ERROR_RATE = env.float('VISITOR_BLOOM_FILTER_ERROR_RATE', default=0.001)  # 거짓 양성 비율
+
+# 접속자 수 카운터 샤드 수 (main.utils)
+# 1보다 크면 visitors:daily:<날짜>, visitors:total 대신 워커 PID로 고른 샤드 키(예: {visitors:total}:3)를 증가시키고
+# 읽을 때 MGET으로 합산, 동기화 작업이 기본 키로 합침 (샤드 수를 줄이기 전에 sync_visitor_stats 실행)
+# 샤드 키는 기본 키를 해시 태그로 감싸 Redis Cluster에서도 기본 키와 같은 슬롯에 놓임
+VISITOR_COUNTER_SHARDS = env.int('VISITOR_COUNTER_SHARDS', default=1)
+
+# ASGI(uvicorn) 배포 시 True - 접속자 통계 API에 redis.asyncio 기반 비동기 뷰 사용
+# WSGI(gunicorn) 배포에서는 False로 두어야 요청마다 이벤트 루프를 만들지 않음
+VISITOR_STATS_ASYNC_VIEWS = env.bool('VISITOR_STATS_ASYNC_VIEWS', default=False)
+
+# 접속자 통계 API(/api/visitors/stats/) 마이크로 캐시 (main.stats_cache)
+VISITOR_STATS_CACHE_SECONDS = env.int('VISITOR_STATS_CACHE_SECONDS', default=2)  # 워커별 스냅샷 유지 시간 및 Cache-Control max-age (초)
+VISITOR_STATS_STALE_WHILE_REVALIDATE = env.int('VISITOR_STATS_STALE_WHILE_REVALIDATE', default=30)  # Cache-Control stale-while-revalidate (초)
+
+# 접속자 통계 실시간 스트림 (/api/visitors/stream/, main.streams)
+# 동기 gunicorn 워커에서는 연결마다 워커를 점유하므로 ASGI 또는 gthread 워커에서만 활성화 권장
+VISITOR_STATS_STREAM_ENABLED = env.bool('VISITOR_STATS_STREAM_ENABLED', default=False)
+VISITOR_STATS_STREAM_INTERVAL_SECONDS = env.int('VISITOR_STATS_STREAM_INTERVAL_SECONDS', default=5)  # 알림이 없을 때 갱신 주기 (초)
+VISITOR_STATS_STREAM_HEARTBEAT_SECONDS = env.int('VISITOR_STATS_STREAM_HEARTBEAT_SECONDS', default=15)  # keepalive 주석 전송 주기 (초)
+VISITOR_STATS_STREAM_MAX_SECONDS = env.int('VISITOR_STATS_STREAM_MAX_SECONDS', default=300)  # 연결 최대 유지 시간, 이후 브라우저가 재연결 (초)
+
+# 접속자 통계 DB 대체 조회 (main.utils.get_visitor_stats)
+# Redis 조회가 실패하거나 느리면 일정 시간 동안 증분 동기화된 DB 행(sync_today_visitor_stats_task)만 사용
+VISITOR_STATS_REDIS_SLOW_MS = env.int('VISITOR_STATS_REDIS_SLOW_MS', default=200)  # 이보다 오래 걸리면 느린 것으로 판단 (밀리초)
+VISITOR_STATS_DB_FALLBACK_SECONDS = env.int('VISITOR_STATS_DB_FALLBACK_SECONDS', default=30)  # DB만 사용하는 시간 (초)
+
+# Redis 서킷 브레이커 (main.circuit_breaker)
+# 연속 실패 시 일정 시간 동안 Redis 접근을 건너뛰고, 접속자 수는 워커별 버퍼에 보관 후 복구 시 반영
+VISITOR_REDIS_BREAKER_FAILURES = env.int('VISITOR_REDIS_BREAKER_FAILURES', default=3)  # 차단까지의 연속 실패 횟수
+VISITOR_REDIS_BREAKER_RESET_SECONDS = env.int('VISITOR_REDIS_BREAKER_RESET_SECONDS', default=10)  # 차단 후 재시도까지의 시간 (초)
+
+# 인기 주제 (main.utils.get_popular_topics)
+# 주제 상세 조회수는 항상 워커 버퍼에 모았다가 반영하고, 목록은 refresh_popular_topics_task가 주기적으로 다시 계산
+# (요청 경로에서는 계산하지 않으므로 작업 주기는 캐시 시간보다 짧아야 하며, 순위가 바뀔 때만 페이지 캐시 무효화)
+POPULAR_TOPICS_CACHE_SECONDS = env.int('POPULAR_TOPICS_CACHE_SECONDS', default=60 * 10)  # 계산된 목록 캐시 시간 (초)
+POPULAR_TOPICS_LIMIT = env.int('POPULAR_TOPICS_LIMIT', default=5)  # 메인/튜토리얼 페이지에 표시할 주제 수
+
+# 페이지 캐시 (main.page_cache)
+# 미스가 몰리면 락을 잡은 워커 하나만 렌더링하고, 나머지는 이전 본문을 제공하거나 잠시 기다림
+PAGE_CACHE_TTL_JITTER = env.float('PAGE_CACHE_TTL_JITTER', default=0.1)  # 유지 시간을 최대 이 비율만큼 무작위로 줄여 동시 만료 방지
+PAGE_CACHE_STALE_SECONDS = env.int('PAGE_CACHE_STALE_SECONDS', default=60 * 60 * 24)  # 만료/무효화 후 이전 본문을 보관할 시간 (초)
+PAGE_CACHE_LOCK_SECONDS = env.int('PAGE_CACHE_LOCK_SECONDS', default=30)  # 렌더링 락 만료 시간 (락을 잡은 워커가 죽은 경우)
+PAGE_CACHE_LOCK_WAIT_SECONDS = env.float('PAGE_CACHE_LOCK_WAIT_SECONDS', default=2.0)  # 이전 본문이 없을 때 다른 워커의 렌더링을 기다릴 시간 (초)
+
+# 정적 사이트 내보내기 (main.static_site, python manage.py export_static_site)
+# 메인/튜토리얼/주제 페이지를 HTML(.gz 포함) 파일로 저장해 nginx가 Django를 거치지 않고 직접 제공
+# 활성화하면 Category/Topic 변경과 인기 주제 갱신 시 바뀐 페이지만 다시 내보냄
+# nginx가 제공한 요청은 미들웨어를 거치지 않으므로 VISITOR_COUNT_MIDDLEWARE_ENABLED=False로 두고
+# tail_visitor_log로 접속자 수/주제 조회수를 집계해야 함 (manage.py check가 main.W001로 경고)
+STATIC_SITE_EXPORT_ENABLED = env.bool('STATIC_SITE_EXPORT_ENABLED', default=False)
+STATIC_SITE_ROOT = Path(env('STATIC_SITE_ROOT', default=str(BASE_DIR / 'static_site')))  # nginx root와 같아야 함
+STATIC_SITE_HOST = env('STATIC_SITE_HOST', default='localhost')  # 렌더링 요청의 Host (ALLOWED_HOSTS에 포함되어야 함)
+
 # Celery 설정
 CELERY_BROKER_URL = REDIS_URL  # ElastiCache Redis를 브로커로 사용
 CELERY_RESULT_BACKEND = REDIS_URL  # 작업 결과 저장소
@@ -191,18 +285,21 @@ CELERY_RESULT_CACHE_MAX = 10000  # 최대 캐시 항목 수
 CELERY_WORKER_PREFETCH_MULTIPLIER = 4  # Worker가 한 번에 가져올 작업 수
 CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000  # 작업 처리 후 프로세스 재시작 (메모리 누수 방지)
 
+# Celery 큐: 기본 큐 + 정적 사이트 갱신용 broadcast 큐
+# 정적 사이트 파일은 인스턴스마다 로컬 디스크에 있으므로 모든 워커가 같은 작업을 받아 각자 갱신
+CELERY_TASK_QUEUES = (
+    Queue('celery'),
+    Broadcast('static_site'),
+)
+CELERY_TASK_ROUTES = {
+    'main.tasks.export_static_pages_task': {'queue': 'static_site'},
+}
+
 # Celery Beat 설정 (Redis 기반 분산 락 사용)
 # DatabaseScheduler를 사용하면 Django admin에서 스케줄을 관리할 수 있음
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
 # Celery Beat 스케줄 정의 -> DB로 관리
-# from celery.schedules import crontab
-
-# CELERY_BEAT_SCHEDULE = {
-#     'sync-visitor-stats-daily': {
-#         'task': 'main.tasks.sync_visitor_stats_task',
-#         'schedule': crontab(hour=0, minute=1),  # 매일 자정 1분에 실행
-#         'options': {'expires': 60 * 60},  # 작업 만료 시간 (1시간)
-#     },
-# }
+# 주기 작업(전날/오늘 통계 동기화, 인기 주제 갱신, 페이지 캐시 예열)은
+# main/migrations/0007_register_periodic_tasks.py가 등록하며, 이후 변경은 Django admin에서 관리
 
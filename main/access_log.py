@@ -0,0 +1,255 @@
+"""
+nginx 접속 로그 기반 접속자 수 집계
+packer/scripts/04-nginx-setup.sh의 visitor_log 형식(탭 구분)으로 기록된 로그를 해석하고,
+VisitorCountMiddleware와 같은 제외 규칙(main.classifier)과 IP 판정을 적용합니다.
+
+log_format visitor_log '$msec\t$remote_addr\t$http_x_forwarded_for\t$status\t$request_uri\t$http_user_agent';
+"""
+import gzip
+import hashlib
+import heapq
+import mmap
+import os
+import socket
+import tempfile
+from datetime import datetime
+from urllib.parse import unquote
+
+from django.urls import Resolver404, resolve
+
+from .classifier import get_client_ip, get_request_classifier
+
+# visitor_log 필드 순서
+VISITOR_LOG_FIELDS = ('msec', 'remote_addr', 'x_forwarded_for', 'status', 'request_uri', 'user_agent')
+
+# 백필 시 압축되지 않은 로그를 나누어 처리하는 단위 (바이트)
+BACKFILL_CHUNK_BYTES = 64 * 1024 * 1024
+
+# 백필 시 고유 IP를 파일로 내보낼 때의 키 크기 (IPv6 주소 크기) 및 IPv4 변환 접두사
+IP_KEY_BYTES = 16
+IPV4_MAPPED_PREFIX = b'\x00' * 10 + b'\xff\xff'
+
+
+def parse_visitor_log_line(line):
+    """
+    visitor_log 형식의 한 줄을 해석합니다.
+
+    Args:
+        line: 로그 한 줄 (str)
+
+    Returns:
+        tuple: (접속 시각(datetime), 경로, User-Agent, 클라이언트 IP, 상태 코드) 또는 None (형식이 다른 경우)
+    """
+    fields = line.rstrip('\n').split('\t')
+    if len(fields) != len(VISITOR_LOG_FIELDS):
+        return None
+    msec, remote_addr, x_forwarded_for, status, request_uri, user_agent = fields
+    try:
+        when = datetime.fromtimestamp(float(msec))
+    except ValueError:
+        return None
+
+    # nginx는 값이 없는 변수를 '-'로 기록
+    if x_forwarded_for == '-':
+        x_forwarded_for = ''
+    if user_agent == '-':
+        user_agent = ''
+    path = request_uri.split('?', 1)[0]
+    return when, path, user_agent, get_client_ip(x_forwarded_for, remote_addr), status
+
+
+def topic_from_path(path):
+    """
+    주제 상세 페이지 경로면 '카테고리/주제'를 반환합니다 (VisitorCountMiddleware의 주제 조회수와 같은 키).
+
+    Args:
+        path: 로그에 기록된 요청 경로 (퍼센트 인코딩된 경로)
+    """
+    try:
+        match = resolve(unquote(path))
+    except Resolver404:
+        return None
+    if match.url_name != 'topic_detail':
+        return None
+    return f"{match.kwargs['category']}/{match.kwargs['topic']}"
+
+
+def iter_counted_requests(lines, classifier=None):
+    """
+    로그 줄에서 접속자 수에 포함되는 접속만 (접속 시각, 클라이언트 IP, 주제)로 반환합니다.
+
+    주제는 200 응답인 주제 상세 페이지 조회일 때만 '카테고리/주제', 그 밖에는 None입니다.
+    nginx가 정적 사이트 파일로 직접 제공한 요청도 로그에는 남으므로 주제 조회수도 함께 집계할 수 있습니다.
+
+    Args:
+        lines: 로그 줄 iterable
+        classifier: VisitorRequestClassifier (기본값: 공유 분류기)
+    """
+    classifier = classifier or get_request_classifier()
+    for line in lines:
+        parsed = parse_visitor_log_line(line)
+        if parsed is None:
+            continue
+        when, path, user_agent, ip_address, status = parsed
+        if classifier.is_excluded(path, user_agent, ip_address):
+            continue
+        yield when, ip_address, topic_from_path(path) if status == '200' else None
+
+
+def iter_counted_visits(lines, classifier=None):
+    """
+    로그 줄에서 접속자 수에 포함되는 접속만 (접속 시각, 클라이언트 IP)로 반환합니다.
+
+    Args:
+        lines: 로그 줄 iterable
+        classifier: VisitorRequestClassifier (기본값: 공유 분류기)
+    """
+    classifier = classifier or get_request_classifier()
+    for line in lines:
+        parsed = parse_visitor_log_line(line)
+        if parsed is None:
+            continue
+        when, path, user_agent, ip_address, _status = parsed
+        if not classifier.is_excluded(path, user_agent, ip_address):
+            yield when, ip_address
+
+
+def open_visitor_log(path):
+    """로그 파일을 텍스트로 엽니다 (logrotate로 압축된 .gz 파일 포함)."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def plan_log_chunks(paths, chunk_bytes=BACKFILL_CHUNK_BYTES):
+    """
+    백필 작업 단위를 만듭니다.
+
+    압축되지 않은 로그는 chunk_bytes 단위 (경로, 시작, 끝) 구간으로 나누어 여러 프로세스가
+    한 파일을 나누어 읽고, .gz 로그는 임의 위치에서 읽을 수 없으므로 파일 하나가 한 작업입니다.
+
+    Returns:
+        list: [(경로, 시작 위치, 끝 위치 또는 None(.gz))]
+    """
+    chunks = []
+    for path in paths:
+        if path.endswith('.gz'):
+            chunks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, size, chunk_bytes):
+            chunks.append((path, start, min(start + chunk_bytes, size)))
+    return chunks
+
+
+def count_log_chunk(chunk, spool_dir):
+    """
+    로그 구간 하나의 날짜별 접속자 수를 집계하고, 날짜별 고유 IP는 정렬해 spool_dir의 파일로 내보냅니다
+    (multiprocessing 작업 함수).
+
+    고유 IP 집합을 부모 프로세스로 넘기지 않으므로 부모의 메모리는 로그 크기와 무관하며,
+    날짜별 고유 접속자 수는 count_spooled_unique()가 파일을 병합하며 셉니다.
+    압축되지 않은 파일은 mmap으로 열어 구간만 읽습니다. 구간 경계에 걸친 줄은
+    시작 위치가 속한 구간에서 처리합니다.
+
+    Args:
+        chunk: plan_log_chunks()가 만든 (경로, 시작 위치, 끝 위치) 튜플
+        spool_dir: 고유 IP 파일을 쓸 디렉토리
+
+    Returns:
+        dict: {date: (접속자 수, 고유 IP 파일 경로)}
+    """
+    path, start, end = chunk
+    if end is None:
+        with open_visitor_log(path) as log_file:
+            days = _count_visits(iter_counted_visits(log_file))
+    else:
+        with open(path, 'rb') as log_file:
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                days = _count_visits(iter_counted_visits(_iter_mmap_lines(mapped, start, end)))
+
+    spooled = {}
+    for day, (visitor_count, ip_keys) in days.items():
+        fd, spool_path = tempfile.mkstemp(prefix=f'{day.isoformat()}-', suffix='.ips', dir=spool_dir)
+        with os.fdopen(fd, 'wb') as spool_file:
+            spool_file.write(b''.join(sorted(ip_keys)))
+        spooled[day] = (visitor_count, spool_path)
+    return spooled
+
+
+def count_spooled_unique(spool_paths):
+    """
+    count_log_chunk()가 쓴 같은 날짜의 고유 IP 파일들을 병합해 정확한 고유 접속자 수를 셉니다.
+
+    각 파일이 정렬되어 있으므로 heapq.merge로 한 번씩 읽으며 중복만 건너뛰어,
+    메모리 사용량은 파일 수에만 비례합니다.
+
+    Args:
+        spool_paths: 같은 날짜의 고유 IP 파일 경로 목록
+
+    Returns:
+        int: 고유 접속자 수
+    """
+    spool_files = [open(spool_path, 'rb') for spool_path in spool_paths]
+    try:
+        unique = 0
+        previous = None
+        for ip_key in heapq.merge(*(_iter_spooled_keys(spool_file) for spool_file in spool_files)):
+            if ip_key != previous:
+                unique += 1
+                previous = ip_key
+        return unique
+    finally:
+        for spool_file in spool_files:
+            spool_file.close()
+
+
+def _iter_spooled_keys(spool_file):
+    """고유 IP 파일에서 IP_KEY_BYTES 크기의 키를 순서대로 반환"""
+    while True:
+        block = spool_file.read(IP_KEY_BYTES * 4096)
+        if not block:
+            return
+        for offset in range(0, len(block), IP_KEY_BYTES):
+            yield block[offset:offset + IP_KEY_BYTES]
+
+
+def _iter_mmap_lines(mapped, start, end):
+    """mmap에서 시작 위치가 [start, end) 구간에 있는 줄을 반환"""
+    size = len(mapped)
+    position = mapped.find(b'\n', start - 1) + 1 if start else 0
+    if start and position == 0:
+        return
+    while position < end:
+        newline = mapped.find(b'\n', position)
+        if newline == -1:
+            newline = size
+        yield mapped[position:newline].decode('utf-8', 'replace')
+        position = newline + 1
+
+
+def _count_visits(visits):
+    days = {}
+    for when, ip_address in visits:
+        day = when.date()
+        counts = days.get(day)
+        if counts is None:
+            counts = days[day] = [0, set()]
+        counts[0] += 1
+        if ip_address:
+            counts[1].add(_ip_key(ip_address))
+    return days
+
+
+def _ip_key(ip_address):
+    """
+    IP 주소를 IP_KEY_BYTES 크기의 바이트열로 변환 (고정 크기로 정렬해 파일에 쓰기 위함)
+
+    IPv4는 IPv4-mapped IPv6 주소(::ffff:a.b.c.d)로 바꾸고, 형식이 잘못된 값은 해시합니다.
+    """
+    try:
+        if ':' in ip_address:
+            return socket.inet_pton(socket.AF_INET6, ip_address)
+        return IPV4_MAPPED_PREFIX + socket.inet_pton(socket.AF_INET, ip_address)
+    except (OSError, ValueError):
+        return hashlib.blake2b(ip_address.encode(), digest_size=IP_KEY_BYTES).digest()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Topic, VisitorStats
+from .models import Category, Topic, VisitorHourlyStats, VisitorStats
 
 
 @admin.register(Category)
@@ -23,9 +23,18 @@ class TopicAdmin(admin.ModelAdmin):
 
 @admin.register(VisitorStats)
 class VisitorStatsAdmin(admin.ModelAdmin):
-    list_display = ['date', 'visitor_count', 'unique_visitor_count', 'created_at', 'updated_at']
+    list_display = ['date', 'visitor_count', 'visit_count', 'unique_visitor_count', 'sample_rate', 'created_at', 'updated_at']
     list_filter = ['date', 'created_at']
     search_fields = ['date']
     ordering = ['-date']
     date_hierarchy = 'date'
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(VisitorHourlyStats)
+class VisitorHourlyStatsAdmin(admin.ModelAdmin):
+    list_display = ['date', 'hour', 'visitor_count', 'unique_visitor_count', 'updated_at']
+    list_filter = ['date']
+    ordering = ['-date', '-hour']
+    date_hierarchy = 'date'
+    readonly_fields = ['created_at', 'updated_at']
@@ -8,7 +8,8 @@ class MainConfig(AppConfig):
     _initial_data_loaded = False
     
     def ready(self):
-        """앱이 준비되면 signals를 import하고 초기 데이터를 로드"""
+        """앱이 준비되면 signals와 설정 검사를 import하고 초기 데이터를 로드"""
+        import main.checks  # noqa
         import main.signals  # noqa
         
         # 초기 데이터 자동 로드 (한 번만 실행)
@@ -0,0 +1,172 @@
+"""
+워커별 일일 Bloom 필터
+이 워커가 오늘 이미 Redis에 반영한 IP는 다시 SADD/PFADD하지 않도록 메모리에서 걸러냅니다.
+
+Bloom 필터는 없는 항목을 있다고 잘못 판단할 수 있으므로(거짓 양성) 그 비율만큼
+고유 접속자 수가 적게 집계될 수 있습니다. 거짓 양성 비율은 VISITOR_BLOOM_FILTER_ERROR_RATE로
+정하며, 기록된 항목 수가 용량(VISITOR_BLOOM_FILTER_CAPACITY)을 넘으면 실제 비율이 커집니다.
+현재 추정 비율은 metrics()로 확인할 수 있고(/api/visitors/status/, 워커별),
+날짜가 바뀔 때 전날 값을 로그로 남깁니다.
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DailyBloomFilter:
+    """
+    하루 단위로 초기화되는 고정 크기 Bloom 필터 (bytearray 비트 배열)
+
+    용량 n과 거짓 양성 비율 p로 비트 수 m = -n·ln(p)/(ln 2)²,
+    해시 함수 수 k = (m/n)·ln 2를 정하고, blake2b 해시 하나를 두 값으로 나누어
+    k개의 위치를 만듭니다 (double hashing).
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._reset_state()
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._date_str = None
+        self.items = 0
+        self.checked = 0
+        self.skipped = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _contains(self, positions):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def _rollover(self, date_str):
+        """날짜가 바뀌었으면 전날 지표를 기록하고 비트 배열을 비움 (락 안에서 호출)"""
+        if self._date_str == date_str:
+            return True
+        if self._date_str is not None and date_str < self._date_str:
+            # 지난 날짜(버퍼 재시도 등)는 필터를 쓰지 않음
+            return False
+        if self._date_str is not None:
+            logger.info(f"방문자 Bloom 필터 {self._date_str} 지표: {self.metrics()}")
+        self._bits = bytearray(len(self._bits))
+        self._date_str = date_str
+        self.items = 0
+        self.checked = 0
+        self.skipped = 0
+        return True
+
+    def unseen(self, date_str, items):
+        """
+        오늘 아직 기록되지 않은 항목만 반환합니다 (기록은 update()로 따로 함).
+
+        Args:
+            date_str: 항목의 날짜 (YYYY-MM-DD)
+            items: 확인할 문자열 iterable
+
+        Returns:
+            list: 필터에 없는 항목 (오늘이 아닌 날짜는 모든 항목)
+        """
+        items = list(items)
+        with self._lock:
+            if not self._rollover(date_str):
+                return items
+            result = [item for item in items if not self._contains(self._positions(item))]
+            self.checked += len(items)
+            self.skipped += len(items) - len(result)
+        return result
+
+    def update(self, date_str, items):
+        """
+        Redis 반영에 성공한 항목을 필터에 기록합니다.
+
+        반영에 실패한 항목을 기록하면 재시도 때 걸러져 유실되므로 반영 후에만 호출합니다.
+        """
+        with self._lock:
+            if not self._rollover(date_str):
+                return
+            bits = self._bits
+            for item in items:
+                positions = self._positions(item)
+                if self._contains(positions):
+                    continue
+                for position in positions:
+                    bits[position >> 3] |= 1 << (position & 7)
+                self.items += 1
+                if self.items == self.capacity:
+                    logger.warning(
+                        f"방문자 Bloom 필터 용량 도달 ({self.capacity}개), "
+                        f"이후 거짓 양성 비율이 {self.error_rate}보다 커집니다"
+                    )
+
+    @property
+    def estimated_error_rate(self):
+        """기록된 항목 수 기준 현재 거짓 양성 비율 추정값 (1 - e^(-kn/m))^k"""
+        return (1 - math.exp(-self.num_hashes * self.items / self.num_bits)) ** self.num_hashes
+
+    def metrics(self):
+        """
+        필터 상태 지표를 반환합니다.
+
+        Returns:
+            dict: {'date', 'items', 'capacity', 'bits', 'hashes', 'error_rate',
+                   'estimated_error_rate', 'checked', 'skipped'}
+        """
+        return {
+            'date': self._date_str,
+            'items': self.items,
+            'capacity': self.capacity,
+            'bits': self.num_bits,
+            'hashes': self.num_hashes,
+            'error_rate': self.error_rate,
+            'estimated_error_rate': round(self.estimated_error_rate, 6),
+            'checked': self.checked,
+            'skipped': self.skipped,
+        }
+
+
+_bloom_filter = None
+_bloom_filter_lock = threading.Lock()
+
+
+def get_visitor_bloom_filter():
+    """
+    현재 프로세스의 DailyBloomFilter를 반환합니다 (최초 호출 시 생성).
+
+    Returns:
+        DailyBloomFilter 또는 None (VISITOR_BLOOM_FILTER_ENABLED=False)
+    """
+    global _bloom_filter
+    if not getattr(settings, 'VISITOR_BLOOM_FILTER_ENABLED', False):
+        return None
+    if _bloom_filter is None:
+        with _bloom_filter_lock:
+            if _bloom_filter is None:
+                _bloom_filter = DailyBloomFilter(
+                    capacity=getattr(settings, 'VISITOR_BLOOM_FILTER_CAPACITY', 100000),
+                    error_rate=getattr(settings, 'VISITOR_BLOOM_FILTER_ERROR_RATE', 0.001),
+                )
+    return _bloom_filter
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모가 반영한 IP 기록과 락 상태를 물려받지 않도록 초기화
+    if _bloom_filter is not None:
+        _bloom_filter._reset_state()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
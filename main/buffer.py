@@ -0,0 +1,311 @@
+"""
+접속자 수 write-behind 버퍼
+요청마다 Redis에 접근하지 않고 워커 프로세스 메모리에서 집계한 뒤,
+일정 주기 또는 일정 이벤트 수마다 하나의 파이프라인으로 Redis에 반영합니다.
+"""
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PendingVisitorCounts:
+    """
+    하루치 미반영 집계
+
+    접속자 수(페이지뷰)와 방문 수, 분 단위 접속자 수(HHMM -> 건수)와 시간대별 고유 IP(HH -> 집합)를
+    보관합니다. 일별 고유 IP는 시간대별 집합의 합집합입니다.
+    주제별 조회수(주제 -> 건수)와 주제별 독자 IP(주제 -> 집합)도 함께 보관합니다.
+    표본 집계(main.sampling)된 접속은 가중치만큼 더하고, 표본 요청 수와 가중치 합계를 따로 보관합니다.
+    """
+
+    __slots__ = (
+        'count', 'visits', 'minutes', 'hour_ips', 'topics', 'topic_ips',
+        'sampled', 'sampled_weight',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.visits = 0
+        self.sampled = 0
+        self.sampled_weight = 0
+        self.minutes = {}
+        self.hour_ips = {}
+        self.topics = {}
+        self.topic_ips = {}
+
+    def add(self, when, ip_address=None, visit=True, weight=1):
+        """
+        접속 1건을 기록합니다.
+
+        Args:
+            when: 접속 시각
+            ip_address: 접속자의 IP 주소 (방문 시작이 아니면 None)
+            visit: 방문의 첫 페이지뷰이면 True (방문 쿠키를 사용하지 않으면 모든 접속)
+            weight: 표본 집계 가중치 (N건 중 1건을 반영하면 N)
+
+        Returns:
+            bool: 새 IP가 시간대 집합에 추가되었으면 True
+        """
+        self.count += weight
+        if visit:
+            self.visits += weight
+        if weight > 1:
+            self.sampled += 1
+            self.sampled_weight += weight
+        minute = when.strftime('%H%M')
+        self.minutes[minute] = self.minutes.get(minute, 0) + weight
+        if not ip_address:
+            return False
+        ips = self.hour_ips.get(minute[:2])
+        if ips is None:
+            ips = self.hour_ips[minute[:2]] = set()
+        if ip_address in ips:
+            return False
+        ips.add(ip_address)
+        return True
+
+    def add_topic_view(self, topic, ip_address=None):
+        """
+        주제 조회 1건을 기록합니다.
+
+        Returns:
+            bool: 새 IP가 주제별 독자 집합에 추가되었으면 True
+        """
+        self.topics[topic] = self.topics.get(topic, 0) + 1
+        if not ip_address:
+            return False
+        ips = self.topic_ips.get(topic)
+        if ips is None:
+            ips = self.topic_ips[topic] = set()
+        if ip_address in ips:
+            return False
+        ips.add(ip_address)
+        return True
+
+    @property
+    def ips(self):
+        """하루 동안의 고유 IP 집합"""
+        if len(self.hour_ips) == 1:
+            return next(iter(self.hour_ips.values()))
+        return set().union(*self.hour_ips.values())
+
+    @property
+    def ip_count(self):
+        return sum(len(ips) for ips in self.hour_ips.values())
+
+
+class VisitorCountBuffer:
+    """
+    gunicorn 워커 프로세스별 접속자 수 집계 버퍼
+
+    add()는 메모리 내 카운터만 갱신하므로 요청 경로에 네트워크 왕복이 없습니다.
+    백그라운드 스레드가 flush_interval마다, 또는 이벤트/IP 수가 한도에 도달하면
+    즉시 main.utils.flush_visitor_counts()로 한 번에 반영합니다.
+    프로세스 종료 시(atexit)에도 남은 집계를 반영합니다.
+
+    메모리 사용량은 max_pending_ips로 제한됩니다. Redis 장애로 반영이 계속 실패해
+    한도에 도달하면 새 IP는 버리고(접속자 수는 계속 집계) dropped_ips에 기록합니다.
+    
+    Redis 서킷 브레이커가 열려 있는 동안에는 버퍼를 사용하지 않는 경로의 접속자 수도
+    여기에 보관되며, 복구 후 다음 반영 주기에 Redis에 반영됩니다.
+    """
+
+    def __init__(self, flush_interval=1.0, flush_max_events=500, max_pending_ips=10000):
+        self.flush_interval = flush_interval
+        self.flush_max_events = flush_max_events
+        self.max_pending_ips = max_pending_ips
+        self._reset_state()
+        atexit.register(self.flush)
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {}  # 날짜 문자열 -> PendingVisitorCounts
+        self._events = 0
+        self._ip_total = 0
+        self._thread = None
+        self._retrying = False  # 직전 반영 실패 여부 (실패 중에는 한도 도달 시에도 주기마다만 재시도)
+        self.dropped_ips = 0
+
+    def add(self, ip_address=None, when=None, visit=True, weight=1):
+        """
+        접속 1건을 버퍼에 기록합니다.
+
+        Args:
+            ip_address: 접속자의 IP 주소 (중복 제거용)
+            when: 접속 시각 (datetime 객체). None이면 현재 시각 사용.
+            visit: 방문의 첫 페이지뷰이면 True, 같은 방문의 이어지는 페이지뷰이면 False
+            weight: 표본 집계 가중치 (main.sampling)
+        """
+        when = when or datetime.now()
+        date_str = when.strftime('%Y-%m-%d')
+
+        with self._lock:
+            if self._thread is None:
+                self._start()
+
+            pending = self._pending.get(date_str)
+            if pending is None:
+                pending = self._pending[date_str] = PendingVisitorCounts()
+
+            self._events += 1
+            if self._ip_total < self.max_pending_ips:
+                if pending.add(when, ip_address, visit, weight):
+                    self._ip_total += 1
+            else:
+                # IP 한도 초과 시 접속자 수만 집계
+                pending.add(when, visit=visit, weight=weight)
+                if ip_address:
+                    self.dropped_ips += 1
+
+            self._maybe_wakeup()
+
+    def add_topic_view(self, topic, ip_address=None, when=None):
+        """
+        주제 조회 1건을 버퍼에 기록합니다 (main.utils.flush_visitor_counts에서 ZINCRBY/PFADD로 반영).
+
+        Args:
+            topic: 주제 식별자 (카테고리 슬러그/주제 슬러그)
+            ip_address: 독자의 IP 주소 (주제별 고유 독자 집계용)
+            when: 조회 시각 (datetime 객체). None이면 현재 시각 사용.
+        """
+        when = when or datetime.now()
+        date_str = when.strftime('%Y-%m-%d')
+
+        with self._lock:
+            if self._thread is None:
+                self._start()
+
+            pending = self._pending.get(date_str)
+            if pending is None:
+                pending = self._pending[date_str] = PendingVisitorCounts()
+
+            self._events += 1
+            if self._ip_total < self.max_pending_ips:
+                if pending.add_topic_view(topic, ip_address):
+                    self._ip_total += 1
+            else:
+                pending.add_topic_view(topic)
+                if ip_address:
+                    self.dropped_ips += 1
+
+            self._maybe_wakeup()
+
+    def _maybe_wakeup(self):
+        # 이벤트/IP 수가 한도에 도달하면 주기를 기다리지 않고 반영 (반영 실패 중에는 주기마다만 재시도)
+        if self._retrying:
+            return
+        if self._events >= self.flush_max_events or self._ip_total >= self.max_pending_ips:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        버퍼의 집계를 Redis에 반영합니다.
+
+        Returns:
+            bool: 반영에 성공했거나 반영할 내용이 없으면 True
+        """
+        from .utils import flush_visitor_counts
+
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._events = 0
+            self._ip_total = 0
+
+        if not pending:
+            return True
+
+        if flush_visitor_counts(pending):
+            self._retrying = False
+            return True
+
+        # 반영 실패 시 다음 주기에 다시 시도하도록 버퍼에 되돌림 (메모리 한도 유지)
+        with self._lock:
+            self._merge_back(pending)
+            self._retrying = True
+        return False
+
+    def _merge_back(self, pending):
+        for date_str, counts in pending.items():
+            current = self._pending.get(date_str)
+            if current is None:
+                current = self._pending[date_str] = PendingVisitorCounts()
+            current.count += counts.count
+            current.visits += counts.visits
+            current.sampled += counts.sampled
+            current.sampled_weight += counts.sampled_weight
+            self._events += counts.count
+            for minute, count in counts.minutes.items():
+                current.minutes[minute] = current.minutes.get(minute, 0) + count
+            for topic, count in counts.topics.items():
+                current.topics[topic] = current.topics.get(topic, 0) + count
+                self._events += count
+            self._merge_ip_sets(current.hour_ips, counts.hour_ips)
+            self._merge_ip_sets(current.topic_ips, counts.topic_ips)
+
+    def _merge_ip_sets(self, current_sets, pending_sets):
+        for key, ips in pending_sets.items():
+            current_ips = current_sets.setdefault(key, set())
+            for ip_address in ips:
+                if ip_address in current_ips:
+                    continue
+                if self._ip_total >= self.max_pending_ips:
+                    self.dropped_ips += 1
+                    continue
+                current_ips.add(ip_address)
+                self._ip_total += 1
+
+    def _start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name='visitor-count-buffer',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"접속자 수 버퍼 반영 실패: {e}")
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_visitor_buffer():
+    """
+    현재 프로세스의 VisitorCountBuffer를 반환합니다 (최초 호출 시 생성).
+    """
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = VisitorCountBuffer(
+                    flush_interval=getattr(settings, 'VISITOR_COUNT_BUFFER_FLUSH_INTERVAL_MS', 1000) / 1000,
+                    flush_max_events=getattr(settings, 'VISITOR_COUNT_BUFFER_FLUSH_MAX_EVENTS', 500),
+                    max_pending_ips=getattr(settings, 'VISITOR_COUNT_BUFFER_MAX_PENDING_IPS', 10000),
+                )
+    return _buffer
+
+
+def _reset_after_fork():
+    # gunicorn --preload 등으로 fork된 경우 부모의 집계/스레드/락을 물려받지 않도록 초기화
+    # (부모의 미반영 집계는 부모가 반영하므로 자식에서 버려야 중복 집계가 없음)
+    if _buffer is not None:
+        _buffer._reset_state()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,102 @@
+"""
+페이지 캐시 예열
+배포나 초기 데이터 로드 후 비어 있는 페이지 캐시를 첫 방문자 대신 미리 채웁니다.
+Category/Topic으로 URL 목록(메인, 튜토리얼 목록, 주제 페이지)을 만들고
+스레드 풀로 동시에 렌더링해 현재 세대 번호의 키(main.page_cache)에 저장합니다.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connections
+from django.http import Http404
+from django.urls import resolve
+
+from .page_cache import current_page_cache_key, store_page
+from .static_site import all_pages, build_page_request, page_url
+
+logger = logging.getLogger(__name__)
+
+
+class WarmResult:
+    """
+    페이지 하나의 예열 결과
+
+    status: 'warmed', 'cached'(이미 캐시됨), 'skipped'(캐시 비활성화), 'failed'
+    """
+
+    __slots__ = ('url', 'status', 'seconds', 'error')
+
+    def __init__(self, url, status, seconds, error=''):
+        self.url = url
+        self.status = status
+        self.seconds = seconds
+        self.error = error
+
+
+def warm_page(view_name, category=None, topic=None, force=False):
+    """
+    페이지 하나를 렌더링해 페이지 캐시에 저장합니다.
+
+    Args:
+        force: True이면 이미 캐시된 페이지도 다시 렌더링 (유지 시간 갱신)
+
+    Returns:
+        WarmResult
+    """
+    url = page_url(view_name, category, topic)
+    started = time.perf_counter()
+    try:
+        match = resolve(url)
+        timeout = getattr(match.func, 'page_cache_timeout', 0)
+        if not timeout:
+            return WarmResult(url, 'skipped', 0.0)
+
+        key = current_page_cache_key(view_name, category, topic)
+        if key is None:
+            return WarmResult(url, 'failed', time.perf_counter() - started, '캐시에 접근할 수 없음')
+        if not force and cache.get(key) is not None:
+            return WarmResult(url, 'cached', time.perf_counter() - started)
+
+        request = build_page_request(url)
+        request.resolver_match = match
+        try:
+            response = match.func.__wrapped__(request, *match.args, **match.kwargs)
+        except Http404:
+            return WarmResult(url, 'failed', time.perf_counter() - started, '404')
+        if not store_page(key, response, timeout):
+            return WarmResult(url, 'failed', time.perf_counter() - started, f'HTTP {response.status_code}')
+        return WarmResult(url, 'warmed', time.perf_counter() - started)
+    except Exception as e:
+        logger.error(f"페이지 캐시 예열 실패 ({url}): {e}")
+        return WarmResult(url, 'failed', time.perf_counter() - started, str(e))
+    finally:
+        # 스레드 풀 스레드마다 열린 DB 연결을 남기지 않음
+        connections.close_all()
+
+
+def warm_page_cache(workers=4, force=False, pages=None):
+    """
+    전체 페이지(또는 pages)의 페이지 캐시를 동시에 예열합니다.
+
+    Args:
+        workers: 동시에 렌더링할 스레드 수
+        force: 이미 캐시된 페이지도 다시 렌더링
+        pages: [(뷰 이름, 카테고리 slug, 주제 slug)], 기본값은 static_site.all_pages()
+
+    Returns:
+        list[WarmResult]: pages 순서대로의 결과
+    """
+    from .tasks import refresh_popular_topics_task
+    from .utils import POPULAR_TOPICS_CACHE_KEY
+
+    if pages is None:
+        pages = all_pages()
+    # 요청 경로에서는 인기 주제를 계산하지 않으므로, 목록이 비어 있으면(배포 직후 등) 갱신 작업을 먼저 직접 실행해
+    # 빈 인기 주제 목록으로 페이지가 캐시되지 않도록 함 (세대 번호가 바뀌므로 렌더링 전에 실행)
+    if cache.get(POPULAR_TOPICS_CACHE_KEY) is None:
+        refresh_popular_topics_task()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='warm_cache') as executor:
+        return list(executor.map(lambda page: warm_page(*page, force=force), pages))
@@ -0,0 +1,31 @@
+"""
+설정 조합 검사 (python manage.py check)
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_static_site_visitor_counting(app_configs, **kwargs):
+    """
+    정적 사이트 내보내기를 켜면 nginx가 직접 제공한 요청은 VisitorCountMiddleware를 거치지 않으므로
+    접속자 수/주제 조회수는 tail_visitor_log로 집계해야 합니다.
+    """
+    if not getattr(settings, 'STATIC_SITE_EXPORT_ENABLED', False):
+        return []
+
+    warnings = []
+    if getattr(settings, 'VISITOR_COUNT_MIDDLEWARE_ENABLED', True):
+        warnings.append(Warning(
+            'STATIC_SITE_EXPORT_ENABLED=True인데 VISITOR_COUNT_MIDDLEWARE_ENABLED=True입니다. '
+            'nginx가 정적 파일로 제공한 페이지는 접속자 수와 주제 조회수(인기 주제)에 집계되지 않습니다.',
+            hint='VISITOR_COUNT_MIDDLEWARE_ENABLED=False로 설정하고 tail_visitor_log(supervisor visitor_log_tail)를 실행하세요.',
+            id='main.W001',
+        ))
+    if getattr(settings, 'VISITOR_VISIT_COOKIE_ENABLED', False):
+        warnings.append(Warning(
+            'STATIC_SITE_EXPORT_ENABLED=True이면 nginx가 제공한 페이지에는 방문 쿠키가 적용되지 않습니다.',
+            hint='접속 로그 기반 집계에서 방문 수는 페이지뷰 수와 같습니다. VISITOR_VISIT_COOKIE_ENABLED=False로 설정하세요.',
+            id='main.W002',
+        ))
+    return warnings
@@ -0,0 +1,140 @@
+"""
+Redis 서킷 브레이커
+Redis가 느리거나 응답하지 않을 때 요청마다 소켓 타임아웃(기본 5초)을 기다리지 않도록
+연속 실패가 일정 횟수에 도달하면 일정 시간 동안 Redis 접근을 차단합니다.
+차단 중 접속자 수 증가는 워커별 버퍼(main.buffer)에 보관했다가 복구 후 반영합니다.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커
+
+    - closed: 정상. 연속 실패가 failure_threshold에 도달하면 open으로 전환
+    - open: reset_timeout 동안 allow()가 False를 반환 (Redis 접근 없이 즉시 대체 경로 사용)
+    - half_open: reset_timeout이 지나면 호출 하나만 통과시켜 복구 여부를 확인하고,
+      성공하면 closed, 실패하면 다시 open으로 전환
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=10):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._reset_state()
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+
+    @property
+    def state(self):
+        return self._state
+
+    def metrics(self):
+        """
+        상태 지표를 반환합니다.
+
+        Returns:
+            dict: {'state', 'failures', 'failure_threshold', 'reset_timeout'}
+        """
+        return {
+            'state': self._state,
+            'failures': self._failures,
+            'failure_threshold': self.failure_threshold,
+            'reset_timeout': self.reset_timeout,
+        }
+
+    def allow(self):
+        """
+        호출을 시도해도 되는지 반환합니다.
+
+        Returns:
+            bool: closed이거나 half_open 확인 호출이면 True
+        """
+        if self._state == self.CLOSED:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_started_at = now
+                return True
+            if self._state == self.HALF_OPEN:
+                # 확인 호출이 결과를 보고하지 않은 채 오래 지나면 다음 호출로 다시 확인
+                if now - self._probe_started_at >= self.reset_timeout:
+                    self._probe_started_at = now
+                    return True
+                return False
+            return True
+
+    def record_success(self):
+        """호출 성공을 기록합니다 (half_open이면 closed로 복구)."""
+        if self._state == self.CLOSED and not self._failures:
+            return
+
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"{self.name} 서킷 브레이커 복구 (closed)")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """호출 실패를 기록합니다 (연속 실패가 한도에 도달하거나 half_open이면 open으로 전환)."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"{self.name} 서킷 브레이커 차단 (open, 연속 실패 {self._failures}회, "
+                        f"{self.reset_timeout}초 후 재시도)"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_redis_circuit_breaker():
+    """
+    현재 프로세스의 Redis 서킷 브레이커를 반환합니다 (최초 호출 시 생성).
+    """
+    global _breaker
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    'Redis',
+                    failure_threshold=getattr(settings, 'VISITOR_REDIS_BREAKER_FAILURES', 3),
+                    reset_timeout=getattr(settings, 'VISITOR_REDIS_BREAKER_RESET_SECONDS', 10),
+                )
+    return _breaker
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모의 락 상태를 물려받지 않도록 초기화
+    if _breaker is not None:
+        _breaker._reset_state()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,129 @@
+"""
+접속자 수 카운팅 제외 규칙
+VisitorCountMiddleware와 접속 로그 기반 집계가 같은 규칙을 공유하도록 한 곳에 정의합니다.
+"""
+import ipaddress
+import re
+import socket
+from functools import lru_cache
+
+# 접속자 수 카운팅에서 제외할 경로 (접두사)
+EXCLUDED_PATHS = (
+    '/admin',
+    '/static',
+    '/media',
+    '/favicon.ico',
+    '/api/',
+    '/health',
+    '/healthz',
+    '/robots.txt',
+    '/sitemap.xml',
+    '/sitemap',
+    '/.well-known',
+    '/__debug__',
+    '/debug',
+)
+
+# 제외할 User-Agent 패턴 (봇, 헬스체크, 모니터링 도구 등, 대소문자 무시)
+EXCLUDED_USER_AGENTS = (
+    r'bot', r'crawler', r'spider', r'scanner', r'crawl',  # 검색엔진 봇
+    r'HealthCheck', r'health', r'monitor', r'ping',  # 헬스체크
+    r'UptimeRobot', r'Pingdom', r'StatusCake', r'NewRelic',  # 모니터링 서비스
+    r'curl', r'wget', r'python', r'go-http', r'java',  # 자동화 도구
+    r'Amazon-Route53', r'AlwaysOn', r'AlwaysOnHealthCheck',  # AWS 관련
+    r'ELB-HealthChecker', r'ELB-HealthChecker/',  # AWS ELB 헬스체크
+    r'kube-probe', r'kubelet',  # Kubernetes 헬스체크
+    r'Zabbix', r'Nagios', r'Prometheus',  # 모니터링 도구
+    r'^$',  # 빈 User-Agent
+)
+
+# 제외할 IP 대역 (내부 IP, 로드밸런서 등)
+EXCLUDED_NETWORKS = (
+    '127.0.0.0/8',  # localhost
+    '10.0.0.0/8',  # 사설 IP (10.x.x.x)
+    '172.16.0.0/12',  # 사설 IP (172.16-31.x.x)
+    '192.168.0.0/16',  # 사설 IP (192.168.x.x)
+    '169.254.0.0/16',  # 링크 로컬
+)
+
+
+class VisitorRequestClassifier:
+    """
+    요청이 접속자 수 카운팅에서 제외되어야 하는지 한 번에 판정하는 분류기
+
+    - 경로: 접두사 튜플을 str.startswith 한 번으로 비교
+    - User-Agent: 모든 패턴을 하나의 alternation 정규식으로 합쳐 한 번만 검색하고,
+      실제 트래픽의 User-Agent 종류는 적으므로 판정 결과를 LRU 캐시에 보관
+    - IP: ipaddress로 미리 계산한 (네트워크 주소, 넷마스크) 정수와 비트 연산으로 비교
+    """
+
+    def __init__(self, excluded_paths=EXCLUDED_PATHS, excluded_user_agents=EXCLUDED_USER_AGENTS,
+                 excluded_networks=EXCLUDED_NETWORKS, user_agent_cache_size=1024):
+        self._paths = tuple(excluded_paths)
+        self._ua_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in excluded_user_agents),
+            re.IGNORECASE,
+        )
+        # (주소 길이(bytes), 네트워크 주소, 넷마스크) - 요청마다 ipaddress 객체를 만들지 않도록 정수로 보관
+        self._networks = tuple(
+            (network.max_prefixlen // 8, int(network.network_address), int(network.netmask))
+            for network in map(ipaddress.ip_network, excluded_networks)
+        )
+        # 인스턴스별 캐시 (크기 제한으로 임의의 User-Agent가 많아도 메모리 사용량 일정)
+        self.is_excluded_user_agent = lru_cache(maxsize=user_agent_cache_size)(self._match_user_agent)
+
+    def is_excluded(self, path, user_agent, ip_address):
+        """
+        경로, User-Agent, IP 주소 중 하나라도 제외 대상이면 True를 반환합니다.
+        """
+        return (
+            self.is_excluded_path(path)
+            or self.is_excluded_user_agent(user_agent or '')
+            or self.is_excluded_ip(ip_address)
+        )
+
+    def is_excluded_path(self, path):
+        return path.startswith(self._paths)
+
+    def _match_user_agent(self, user_agent):
+        return self._ua_pattern.search(user_agent) is not None
+
+    def is_excluded_ip(self, ip_address):
+        if not ip_address:
+            return False
+        try:
+            family = socket.AF_INET6 if ':' in ip_address else socket.AF_INET
+            packed = socket.inet_pton(family, ip_address)
+        except (OSError, ValueError):
+            return False
+        address = int.from_bytes(packed, 'big')
+        size = len(packed)
+        for network_size, network_address, netmask in self._networks:
+            if size == network_size and address & netmask == network_address:
+                return True
+        return False
+
+
+def get_client_ip(x_forwarded_for, remote_addr):
+    """
+    X-Forwarded-For 헤더와 접속 주소로 클라이언트의 실제 IP 주소를 구합니다.
+
+    X-Forwarded-For 헤더는 여러 IP를 포함할 수 있으며 (예: "client, proxy1, proxy2")
+    첫 번째 IP가 실제 클라이언트 IP입니다. 헤더가 없으면 접속 주소를 사용합니다.
+    """
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0].strip()
+    return remote_addr or ''
+
+
+_classifier = None
+
+
+def get_request_classifier():
+    """
+    공유 VisitorRequestClassifier 인스턴스를 반환합니다 (최초 호출 시 생성).
+    """
+    global _classifier
+    if _classifier is None:
+        _classifier = VisitorRequestClassifier()
+    return _classifier
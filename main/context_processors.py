@@ -1,15 +1,21 @@
 """
 템플릿 context processor - 모든 템플릿에서 접속자 통계 사용 가능
 """
+from django.conf import settings
 from .utils import get_today_unique_visitors_count, get_total_visitors_count
 
 
 def visitor_stats(request):
     """
     모든 템플릿에서 접속자 통계를 사용할 수 있도록 context에 추가
+    
+    함수 자체를 넘겨 템플릿이 실제로 값을 사용할 때만 조회합니다.
+    (현재 화면의 통계는 main.js가 API로 불러오므로 렌더링마다 조회하지 않음)
     """
     return {
-        'today_visitors': get_today_unique_visitors_count(),
-        'total_visitors': get_total_visitors_count(),
+        'today_visitors': get_today_unique_visitors_count,
+        'total_visitors': get_total_visitors_count,
+        # main.js가 폴링 대신 실시간 스트림(SSE)을 사용할지 여부
+        'visitor_stats_stream_enabled': getattr(settings, 'VISITOR_STATS_STREAM_ENABLED', False),
     }
 
@@ -0,0 +1,131 @@
+"""
+보관된 nginx 접속 로그로 과거 접속자 통계(VisitorStats)를 다시 채우는 커맨드
+Redis 키가 만료(30일)되었거나 유실되어 DB에 빈 날짜가 생겼을 때 사용합니다.
+
+로그는 visitor_log 형식(packer/scripts/04-nginx-setup.sh)이어야 하며, .gz 파일도 읽습니다.
+압축되지 않은 로그는 구간으로 나누어 mmap으로, .gz 로그는 파일 단위로 여러 프로세스에서
+나누어 처리하고, 미들웨어와 같은 제외 규칙(main.classifier)을 적용해 날짜별 접속자 수와
+정확한 고유 접속자 수를 계산한 뒤 bulk upsert로 한 번에 저장합니다.
+각 프로세스는 구간의 날짜별 고유 IP를 정렬해 임시 파일로 내보내고, 부모 프로세스는
+날짜별로 파일을 병합하며 세므로 메모리 사용량은 로그 전체가 아니라 구간 크기와 프로세스 수에 비례합니다.
+
+기본적으로 DB에 저장된 값보다 큰 경우에만 저장하며(--overwrite로 덮어쓰기),
+집계가 진행 중인 오늘 날짜는 저장하지 않습니다.
+로그에는 방문 쿠키 정보가 없으므로 새로 추가하는 날짜의 방문 수는 접속자 수(페이지뷰)와 같게 저장하고,
+이미 있는 날짜의 방문 수는 바꾸지 않습니다.
+
+사용법:
+    python manage.py backfill_visitor_stats /var/log/nginx/anonymous_project_visitors.log*
+    python manage.py backfill_visitor_stats archive/*.gz --workers 8 --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import connections
+from datetime import date
+from multiprocessing import Pool, cpu_count
+from main.access_log import BACKFILL_CHUNK_BYTES, count_log_chunk, count_spooled_unique, plan_log_chunks
+from main.models import VisitorStats
+from main.utils import upsert_visitor_stats
+import functools
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# 기본 프로세스 수 상한 (프로세스마다 구간 하나의 고유 IP 집합을 메모리에 보관)
+DEFAULT_MAX_WORKERS = 4
+
+
+class Command(BaseCommand):
+    help = '보관된 접속 로그로 과거 접속자 통계를 다시 채웁니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='+',
+            help='접속 로그 파일 경로 (.gz 가능)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(cpu_count(), DEFAULT_MAX_WORKERS),
+            help=f'로그를 처리할 프로세스 수 (기본값: CPU 수, 최대 {DEFAULT_MAX_WORKERS})',
+        )
+        parser.add_argument(
+            '--chunk-mb',
+            type=int,
+            default=BACKFILL_CHUNK_BYTES // (1024 * 1024),
+            help='압축되지 않은 로그를 나누는 단위 (MB, 기본값: 64)',
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='DB에 저장된 값보다 작아도 로그 집계 결과로 덮어쓰기',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='집계 결과만 출력하고 저장하지 않음',
+        )
+
+    def handle(self, *args, **options):
+        chunks = plan_log_chunks(options['paths'], options['chunk_mb'] * 1024 * 1024)
+        workers = max(1, min(options['workers'], len(chunks)))
+
+        self.stdout.write(f'로그 {len(options["paths"])}개 ({len(chunks)}개 구간)를 프로세스 {workers}개로 집계합니다...')
+
+        started = time.perf_counter()
+        today = date.today()
+        rows = []
+        with tempfile.TemporaryDirectory(prefix='backfill_visitor_stats-') as spool_dir:
+            # 날짜별 [접속자 수, 고유 IP 파일 목록] (고유 IP 자체는 부모 프로세스로 가져오지 않음)
+            days = {}
+            # fork 전에 DB 연결을 닫아 자식 프로세스와 공유하지 않도록 함
+            connections.close_all()
+            with Pool(processes=workers) as pool:
+                for chunk_days in pool.imap_unordered(functools.partial(count_log_chunk, spool_dir=spool_dir), chunks):
+                    for day, (visitor_count, spool_path) in chunk_days.items():
+                        counts = days.setdefault(day, [0, []])
+                        counts[0] += visitor_count
+                        counts[1].append(spool_path)
+
+            # 날짜별로 파일을 병합해 세고 바로 지움
+            for day, (visitor_count, spool_paths) in sorted(days.items()):
+                if day < today:
+                    rows.append(VisitorStats(
+                        date=day,
+                        visitor_count=visitor_count,
+                        unique_visitor_count=count_spooled_unique(spool_paths),
+                        visit_count=visitor_count,
+                        sample_rate=1.0,
+                    ))
+                for spool_path in spool_paths:
+                    os.remove(spool_path)
+        parse_seconds = time.perf_counter() - started
+
+        for row in rows:
+            self.stdout.write(f'{row.date}: 접속자 {row.visitor_count}명, 고유 접속자 {row.unique_visitor_count}명')
+        if today in days:
+            self.stdout.write(self.style.WARNING(f'{today}: 오늘 날짜는 저장하지 않음 (Redis 집계 사용)'))
+
+        self.stdout.write(f'로그 집계 {parse_seconds:.1f}초')
+
+        if options['dry_run'] or not rows:
+            self.stdout.write(self.style.SUCCESS(f'{len(rows)}일 집계 완료 (저장하지 않음)'))
+            return
+
+        started = time.perf_counter()
+        update_fields = ['visitor_count', 'unique_visitor_count', 'updated_at']
+        if options['overwrite']:
+            # 덮어쓴 값은 표본 추정값이 아니라 로그 전체를 센 값
+            update_fields.insert(2, 'sample_rate')
+        written, _ = upsert_visitor_stats(
+            rows,
+            high_water_mark=not options['overwrite'],
+            update_fields=update_fields,
+        )
+        self.stdout.write(f'DB 저장 {time.perf_counter() - started:.1f}초')
+        self.stdout.write(
+            self.style.SUCCESS(f'{len(rows)}일 중 {len(written)}일의 데이터를 저장했습니다.')
+        )
@@ -0,0 +1,116 @@
+"""
+접속자 수 카운팅 제외 판정 마이크로벤치마크
+기존 방식(경로 startswith 루프 + User-Agent 정규식 약 30개 + IP 정규식 5개)과
+main.classifier.VisitorRequestClassifier의 요청당 판정 비용을 비교합니다.
+
+사용법:
+    python manage.py benchmark_visitor_classifier
+    python manage.py benchmark_visitor_classifier --iterations 200000
+"""
+import re
+import timeit
+
+from django.core.management.base import BaseCommand
+from main.classifier import (
+    EXCLUDED_PATHS,
+    EXCLUDED_USER_AGENTS,
+    VisitorRequestClassifier,
+)
+
+# 기존 VisitorCountMiddleware의 IP 정규식 (비교용)
+LEGACY_IP_PATTERNS = [
+    r'^127\.',
+    r'^10\.',
+    r'^172\.(1[6-9]|2[0-9]|3[0-1])\.',
+    r'^192\.168\.',
+    r'^169\.254\.',
+]
+
+# 실제 트래픽과 비슷한 요청 샘플 (경로, User-Agent, IP)
+SAMPLE_REQUESTS = [
+    ('/', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36', '203.0.113.10'),
+    ('/network/', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15', '198.51.100.24'),
+    ('/linux/서버/', 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148', '211.234.10.5'),
+    ('/python/for/', 'Mozilla/5.0 (Linux; Android 14; SM-S918N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36', '121.134.56.78'),
+    ('/aws/', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0', '58.120.33.4'),
+    ('/healthz', 'ELB-HealthChecker/2.0', '10.0.1.23'),
+    ('/', 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)', '66.249.66.1'),
+    ('/network/ip주소/', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36', '172.20.3.4'),
+]
+
+
+class LegacyClassifier:
+    """기존 VisitorCountMiddleware._should_exclude 구현 (비교 기준)"""
+
+    def __init__(self):
+        self._ua_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in EXCLUDED_USER_AGENTS]
+        self._ip_patterns = [re.compile(pattern) for pattern in LEGACY_IP_PATTERNS]
+
+    def is_excluded(self, path, user_agent, ip_address):
+        for excluded_path in EXCLUDED_PATHS:
+            if path.startswith(excluded_path):
+                return True
+        for pattern in self._ua_patterns:
+            if pattern.search(user_agent):
+                return True
+        for pattern in self._ip_patterns:
+            if pattern.match(ip_address):
+                return True
+        return False
+
+
+class Command(BaseCommand):
+    help = '접속자 수 카운팅 제외 판정의 요청당 비용을 기존 방식과 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=100000,
+            help='측정할 판정 횟수 (기본값: 100000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='측정 반복 횟수, 가장 빠른 결과 사용 (기본값: 5)',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        repeat = options['repeat']
+
+        legacy = LegacyClassifier()
+        classifier = VisitorRequestClassifier()
+
+        # 두 구현의 판정 결과가 같은지 먼저 확인
+        for path, user_agent, ip_address in SAMPLE_REQUESTS:
+            expected = legacy.is_excluded(path, user_agent, ip_address)
+            actual = classifier.is_excluded(path, user_agent, ip_address)
+            if expected != actual:
+                self.stdout.write(
+                    self.style.ERROR(f'판정 불일치: {path} {user_agent!r} {ip_address} (기존 {expected}, 신규 {actual})')
+                )
+                return
+
+        legacy_ns = self._measure(legacy, iterations, repeat)
+        classifier_ns = self._measure(classifier, iterations, repeat)
+
+        self.stdout.write(f'샘플 요청 {len(SAMPLE_REQUESTS)}종, {iterations}회 판정 x {repeat}회 반복 (최솟값)')
+        self.stdout.write(f'  기존 방식:  요청당 {legacy_ns:,.0f} ns')
+        self.stdout.write(f'  분류기:    요청당 {classifier_ns:,.0f} ns')
+        self.stdout.write(self.style.SUCCESS(f'  {legacy_ns / classifier_ns:.1f}배 빠름'))
+
+    def _measure(self, classifier, iterations, repeat):
+        """요청당 평균 판정 시간(ns)을 반환"""
+        samples = SAMPLE_REQUESTS
+        count = len(samples)
+
+        def run():
+            is_excluded = classifier.is_excluded
+            for i in range(iterations):
+                path, user_agent, ip_address = samples[i % count]
+                is_excluded(path, user_agent, ip_address)
+
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        return best / iterations * 1e9
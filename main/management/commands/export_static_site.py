@@ -0,0 +1,59 @@
+"""
+정적 사이트 내보내기 커맨드
+메인, 모든 튜토리얼 목록, 모든 주제 페이지를 STATIC_SITE_ROOT에 HTML(.gz 포함)로 저장합니다.
+nginx는 try_files로 이 파일을 먼저 찾고 없으면 Django로 넘깁니다 (packer/scripts/04-nginx-setup.sh).
+이후에는 STATIC_SITE_EXPORT_ENABLED=True이면 시그널이 바뀐 페이지만 다시 내보냅니다.
+STATIC_SITE_EXPORT_ENABLED=False이면 갱신되지 않을 파일을 nginx가 제공하지 않도록 내보내지 않고 기존 파일을 삭제합니다.
+
+사용법:
+    # 전체 페이지 내보내기 (내용이 같은 파일은 다시 쓰지 않고, 없어진 페이지 파일은 삭제)
+    python manage.py export_static_site
+
+    # 내보낸 파일 전체 삭제 (정적 사이트를 끌 때, 이후 모든 요청은 Django가 처리)
+    python manage.py export_static_site --clear
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from main.page_cache import GLOBAL_GENERATION
+from main.static_site import clear_static_site, export_generations, get_static_site_root
+
+
+class Command(BaseCommand):
+    help = '메인/튜토리얼/주제 페이지를 nginx가 직접 제공할 HTML 파일로 내보냅니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='내보낸 파일을 모두 삭제',
+        )
+
+    def handle(self, *args, **options):
+        root = get_static_site_root()
+
+        if options['clear']:
+            clear_static_site()
+            self.stdout.write(self.style.SUCCESS(f'정적 사이트 파일을 삭제했습니다: {root}'))
+            return
+
+        if not getattr(settings, 'STATIC_SITE_EXPORT_ENABLED', False):
+            # 꺼져 있으면 시그널이 파일을 갱신하지 않으므로 남은 파일은 오래된 페이지가 됨
+            clear_static_site()
+            self.stdout.write(self.style.WARNING(
+                f'STATIC_SITE_EXPORT_ENABLED=False이므로 내보내지 않고 기존 파일을 삭제했습니다: {root}'
+            ))
+            return
+
+        started = time.monotonic()
+        results = export_generations([GLOBAL_GENERATION])
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'정적 사이트 내보내기 완료 ({root}, {elapsed:.2f}초): '
+            f'새로 씀 {results["written"]}개, 변경 없음 {results["unchanged"]}개, '
+            f'삭제 {results["removed"]}개'
+        ))
+        if results['missing']:
+            self.stdout.write(self.style.WARNING(f'렌더링하지 못한 페이지: {results["missing"]}개'))
@@ -0,0 +1,58 @@
+"""
+페이지 캐시 무효화 커맨드
+세대 번호(main.page_cache)를 올려 페이지 캐시만 무효화합니다.
+cache.clear()와 달리 같은 Redis의 Celery 데이터나 접속자 통계는 지우지 않습니다.
+
+사용법:
+    # 전체 페이지 (배포 후 정적 파일 URL이 바뀐 경우)
+    python manage.py invalidate_page_cache
+
+    # 특정 카테고리의 튜토리얼 목록과 주제 페이지
+    python manage.py invalidate_page_cache --category python
+
+    # 특정 주제 페이지
+    python manage.py invalidate_page_cache --category python --topic intro
+"""
+from django.core.management.base import BaseCommand
+from main.page_cache import (
+    GLOBAL_GENERATION,
+    bump_generation,
+    category_generation,
+    topic_generation,
+)
+
+
+class Command(BaseCommand):
+    help = '페이지 캐시를 무효화합니다 (전체, 카테고리 또는 주제 단위)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--category',
+            type=str,
+            help='무효화할 카테고리 slug',
+        )
+        parser.add_argument(
+            '--topic',
+            type=str,
+            help='무효화할 주제 slug (--category와 함께 사용)',
+        )
+
+    def handle(self, *args, **options):
+        category = options.get('category')
+        topic = options.get('topic')
+
+        if topic and not category:
+            self.stdout.write(self.style.ERROR('--topic은 --category와 함께 지정해야 합니다'))
+            return
+
+        if topic:
+            bump_generation(topic_generation(category, topic))
+            target = f'{category}/{topic} 주제 페이지'
+        elif category:
+            bump_generation(category_generation(category))
+            target = f'{category} 카테고리 페이지'
+        else:
+            bump_generation(GLOBAL_GENERATION)
+            target = '전체 페이지'
+
+        self.stdout.write(self.style.SUCCESS(f'{target} 캐시를 무효화했습니다.'))
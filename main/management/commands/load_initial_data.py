@@ -111,10 +111,10 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'\n초기 데이터 로드 완료!'))
         self.stdout.write(self.style.SUCCESS(f'생성된 주제: {topic_count}개'))
 
-        from django.core.cache import cache
+        from main.page_cache import GLOBAL_GENERATION, bump_generation
 
-        # 캐시 클리어
-        self.stdout.write('\n캐시를 클리어합니다...')
-        cache.clear()
-        self.stdout.write(self.style.SUCCESS('캐시 클리어 완료!'))
+        # 페이지 캐시 무효화 (cache.clear()는 Celery 데이터까지 지우므로 세대 번호만 올림)
+        self.stdout.write('\n페이지 캐시를 무효화합니다...')
+        bump_generation(GLOBAL_GENERATION)
+        self.stdout.write(self.style.SUCCESS('페이지 캐시 무효화 완료!'))
 
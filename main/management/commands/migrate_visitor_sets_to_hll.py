@@ -0,0 +1,98 @@
+"""
+일별 고유 접속자 집합(visitors:set:*)을 HyperLogLog(visitors:hll:*)로 변환하는 커맨드
+VISITOR_UNIQUE_BACKEND를 'hll'로 전환하기 전에 실행합니다.
+
+사용법:
+    # 모든 일별 집합 변환 (원본 집합 유지)
+    python manage.py migrate_visitor_sets_to_hll
+
+    # 변환 후 원본 집합 삭제
+    python manage.py migrate_visitor_sets_to_hll --delete-sets
+
+    # 변환 대상만 확인
+    python manage.py migrate_visitor_sets_to_hll --dry-run
+"""
+from django.core.management.base import BaseCommand
+from main.utils import (
+    get_redis_client,
+    VISITOR_HLL_KEY_PREFIX,
+    VISITOR_SET_KEY_PREFIX,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = '일별 고유 접속자 집합을 HyperLogLog로 변환합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='SSCAN/PFADD 한 번에 처리할 IP 수 (기본값: 1000)',
+        )
+        parser.add_argument(
+            '--delete-sets',
+            action='store_true',
+            help='변환이 끝난 원본 집합 삭제',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='변환하지 않고 대상 키와 크기만 출력',
+        )
+
+    def handle(self, *args, **options):
+        redis_client = get_redis_client()
+        if not redis_client:
+            self.stdout.write(self.style.ERROR('Redis에 연결할 수 없습니다.'))
+            return
+
+        batch_size = options['batch_size']
+        migrated = 0
+
+        for raw_key in redis_client.scan_iter(match=f'{VISITOR_SET_KEY_PREFIX}*', count=100):
+            set_key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+            date_str = set_key[len(VISITOR_SET_KEY_PREFIX):]
+            hll_key = f'{VISITOR_HLL_KEY_PREFIX}{date_str}'
+            set_size = redis_client.scard(set_key)
+
+            if options['dry_run']:
+                self.stdout.write(f'{set_key} -> {hll_key} (IP {set_size}개)')
+                continue
+
+            try:
+                # PFADD는 멱등이므로 중간에 실패해도 다시 실행하면 됨
+                batch = []
+                for ip_address in redis_client.sscan_iter(set_key, count=batch_size):
+                    batch.append(ip_address)
+                    if len(batch) >= batch_size:
+                        redis_client.pfadd(hll_key, *batch)
+                        batch = []
+                if batch:
+                    redis_client.pfadd(hll_key, *batch)
+
+                # 원본 집합의 남은 만료 시간을 그대로 유지
+                ttl_ms = redis_client.pttl(set_key)
+                if ttl_ms and ttl_ms > 0:
+                    redis_client.pexpire(hll_key, ttl_ms)
+
+                if options['delete_sets']:
+                    redis_client.delete(set_key)
+
+                migrated += 1
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'{date_str}: IP {set_size}개 -> 추정 {redis_client.pfcount(hll_key)}명'
+                    )
+                )
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'{set_key} 변환 실패: {e}'))
+                logger.error(f'{set_key} 변환 실패: {e}', exc_info=True)
+
+        if not options['dry_run']:
+            self.stdout.write(
+                self.style.SUCCESS(f'성공적으로 {migrated}일의 집합을 HyperLogLog로 변환했습니다.')
+            )
@@ -0,0 +1,69 @@
+"""
+주제 본문 일괄 재렌더링 커맨드
+STATIC_URL이 바뀐 경우(S3 도메인 변경 등) Topic.rendered_html을 다시 만듭니다.
+렌더링 입력 해시(content_hash)가 같은 주제는 건너뛰고, 바뀐 주제만 bulk_update로 저장한 뒤
+해당 주제 페이지 캐시와 정적 페이지를 갱신합니다 (bulk_update는 시그널을 보내지 않음).
+
+사용법:
+    # 바뀐 주제만 재렌더링
+    python manage.py rerender_topics
+
+    # 모든 주제 재렌더링 (변환 규칙을 바꾼 경우)
+    python manage.py rerender_topics --force
+"""
+from django.core.management.base import BaseCommand
+from main.models import Topic
+from main.page_cache import bump_generation, topic_generation
+from main.rendering import render_topic_html, topic_content_hash
+from main.static_site import schedule_export
+
+
+class Command(BaseCommand):
+    help = 'Topic.rendered_html을 현재 STATIC_URL 기준으로 다시 렌더링합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='해시가 같아도 모든 주제를 다시 렌더링',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='한 번에 저장할 주제 수 (기본값: 100)',
+        )
+
+    def handle(self, *args, **options):
+        force = options['force']
+        batch_size = options['batch_size']
+
+        topics = (
+            Topic.objects.select_related('category')
+            .only('id', 'slug', 'content', 'content_hash', 'category__slug')
+            .order_by('id')
+        )
+
+        checked = 0
+        changed = []
+        batch = []
+        for topic in topics.iterator(chunk_size=batch_size):
+            checked += 1
+            if not force and topic.content_hash == topic_content_hash(topic.content):
+                continue
+            topic.rendered_html, topic.content_hash = render_topic_html(topic.content)
+            batch.append(topic)
+            changed.append(topic_generation(topic.category.slug, topic.slug))
+            if len(batch) >= batch_size:
+                Topic.objects.bulk_update(batch, ['rendered_html', 'content_hash'])
+                batch = []
+        if batch:
+            Topic.objects.bulk_update(batch, ['rendered_html', 'content_hash'])
+
+        if changed:
+            bump_generation(*changed)
+            schedule_export(*changed)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'재렌더링 완료: {len(changed)}개 / 전체 {checked}개'
+        ))
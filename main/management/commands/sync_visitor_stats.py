@@ -2,25 +2,24 @@
 Redis에서 MariaDB로 접속자 수 통계 동기화 커맨드
 매일 자정에 실행 (cron): python manage.py sync_visitor_stats
 
+여러 날짜를 동기화해도 Redis 조회는 파이프라인 한 번, DB 저장은
+한 트랜잭션 안의 bulk upsert로 처리합니다 (Celery 작업과 같은 경로).
+
 사용법:
     # 전날 데이터 동기화
     python manage.py sync_visitor_stats
     
     # 특정 날짜 동기화
     python manage.py sync_visitor_stats --date 2024-01-14
+    
+    # 최근 30일 재동기화
+    python manage.py sync_visitor_stats --days 30
 """
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 from datetime import date, timedelta
-from main.models import VisitorStats
-from main.utils import (
-    get_daily_visitors_count,
-    get_daily_unique_visitors_count,
-    get_redis_client,
-    DAILY_VISITORS_KEY_PREFIX,
-    VISITOR_SET_KEY_PREFIX
-)
+from main.utils import sync_visitor_stats_range
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -57,45 +56,32 @@ class Command(BaseCommand):
 
         self.stdout.write(f'{target_date} 데이터 동기화를 시작합니다...')
 
-        sync_count = 0
-        for i in range(days):
-            sync_date = target_date - timedelta(days=i)
-            if self.sync_date(sync_date):
-                sync_count += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(f'성공적으로 {sync_count}일의 데이터를 동기화했습니다.')
-        )
-
-    def sync_date(self, target_date):
-        """특정 날짜의 데이터를 동기화"""
-        date_str = target_date.strftime('%Y-%m-%d')
-        
+        started = time.perf_counter()
         try:
-            # Redis에서 데이터 가져오기
-            visitor_count = get_daily_visitors_count(target_date)
-            unique_visitor_count = get_daily_unique_visitors_count(target_date)
-
-            # MariaDB에 저장 또는 업데이트
-            visitor_stats, created = VisitorStats.objects.update_or_create(
-                date=target_date,
-                defaults={
-                    'visitor_count': visitor_count,
-                    'unique_visitor_count': unique_visitor_count,
-                }
+            result = sync_visitor_stats_range(
+                [target_date - timedelta(days=i) for i in range(days)]
             )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'동기화 실패: {e}'))
+            logger.error(f'접속자 수 동기화 실패: {e}', exc_info=True)
+            return
+        elapsed = time.perf_counter() - started
 
-            action = '생성' if created else '업데이트'
+        for synced in result['synced']:
+            action = '생성' if synced['created'] else '업데이트'
+            sampled = f", 표본 비율 {synced['sample_rate']:.4f}" if synced['sample_rate'] < 1 else ''
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'{date_str}: 접속자 {visitor_count}명, 고유 접속자 {unique_visitor_count}명 ({action})'
-                )
+                f"{synced['date']}: 접속자 {synced['visitor_count']}명, "
+                f"고유 접속자 {synced['unique_visitor_count']}명, 방문 {synced['visit_count']}회 ({action}), "
+                f"시간별 {synced['hourly_rows']}건{sampled}"
             )
-            return True
+        for skipped in result['skipped']:
+            self.stdout.write(self.style.WARNING(f'{skipped}: Redis에 데이터가 없어 건너뜀'))
 
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f'{date_str} 동기화 실패: {e}')
-            )
-            logger.error(f'{date_str} 동기화 실패: {e}', exc_info=True)
-            return False
\ No newline at end of file
+        self.stdout.write(
+            f"Redis 조회 {result['redis_seconds'] * 1000:.1f}ms (파이프라인 1회), "
+            f"DB 저장 {result['db_seconds'] * 1000:.1f}ms, 전체 {elapsed * 1000:.1f}ms"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"성공적으로 {len(result['synced'])}일의 데이터를 동기화했습니다.")
+        )
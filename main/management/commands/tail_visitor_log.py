@@ -0,0 +1,146 @@
+"""
+nginx 접속 로그를 따라 읽으며 접속자 수를 집계하는 데몬 커맨드
+요청 경로에서 카운팅을 완전히 제거하고 싶을 때 VisitorCountMiddleware 대신 사용합니다.
+(settings.VISITOR_COUNT_MIDDLEWARE_ENABLED=False로 미들웨어 비활성화)
+
+로그는 packer/scripts/04-nginx-setup.sh의 visitor_log 형식이어야 하며,
+미들웨어와 같은 제외 규칙(main.classifier)을 적용해 워커 버퍼와 같은 방식으로
+메모리에서 집계한 뒤 일정 주기/건수마다 visitors:* 키에 한 번에 반영합니다.
+주제 상세 페이지(200 응답) 조회는 주제별 조회수(topics:*)로도 집계하므로, nginx가 정적 사이트 파일로
+직접 제공하는 요청(STATIC_SITE_EXPORT_ENABLED)도 인기 주제에 반영됩니다.
+방문 쿠키(VISITOR_VISIT_COOKIE_ENABLED)와 표본 집계는 적용되지 않아 방문 수는 페이지뷰 수와 같습니다.
+logrotate로 파일이 교체되거나 잘리면 새 파일을 처음부터 다시 읽습니다.
+
+사용법:
+    # 기본 로그 파일을 끝에서부터 따라 읽기 (supervisor로 실행)
+    python manage.py tail_visitor_log
+
+    # 로그 파일 지정, 처음부터 읽기
+    python manage.py tail_visitor_log --path /var/log/nginx/anonymous_project_visitors.log --from-start
+"""
+import logging
+import os
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from main.access_log import iter_counted_requests
+from main.buffer import VisitorCountBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'nginx 접속 로그를 따라 읽으며 접속자 수를 Redis에 반영합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=str,
+            default=getattr(settings, 'VISITOR_ACCESS_LOG_PATH', '/var/log/nginx/anonymous_project_visitors.log'),
+            help='접속 로그 파일 경로 (기본값: settings.VISITOR_ACCESS_LOG_PATH)',
+        )
+        parser.add_argument(
+            '--from-start',
+            action='store_true',
+            help='파일 처음부터 읽기 (기본값: 현재 끝에서부터 새로 기록되는 줄만 읽음)',
+        )
+        parser.add_argument(
+            '--flush-interval',
+            type=float,
+            default=getattr(settings, 'VISITOR_COUNT_BUFFER_FLUSH_INTERVAL_MS', 1000) / 1000,
+            help='Redis 반영 주기 (초, 기본값: VISITOR_COUNT_BUFFER_FLUSH_INTERVAL_MS)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=0.5,
+            help='새 줄이 없을 때 다시 확인하는 주기 (초, 기본값: 0.5)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        poll_interval = options['poll_interval']
+
+        buffer = VisitorCountBuffer(
+            flush_interval=options['flush_interval'],
+            flush_max_events=getattr(settings, 'VISITOR_COUNT_BUFFER_FLUSH_MAX_EVENTS', 500),
+            max_pending_ips=getattr(settings, 'VISITOR_COUNT_BUFFER_MAX_PENDING_IPS', 10000),
+        )
+
+        # supervisor stop(SIGTERM) 시에도 남은 집계를 반영하고 종료
+        signal.signal(signal.SIGTERM, lambda signum, frame: self._stop())
+
+        self.stdout.write(f'{path} 접속 로그 집계를 시작합니다...')
+        counted = 0
+        try:
+            for when, ip_address, topic in iter_counted_requests(
+                self._follow(path, options['from_start'], poll_interval)
+            ):
+                buffer.add(ip_address, when=when)
+                if topic:
+                    buffer.add_topic_view(topic, ip_address, when=when)
+                counted += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if buffer.flush():
+                self.stdout.write(self.style.SUCCESS(f'접속 {counted}건을 집계하고 종료합니다.'))
+            else:
+                self.stdout.write(self.style.ERROR(f'접속 {counted}건 중 미반영 집계가 남은 채 종료합니다.'))
+
+    def _stop(self):
+        raise KeyboardInterrupt
+
+    def _follow(self, path, from_start, poll_interval):
+        """
+        tail -F처럼 로그 파일의 새 줄을 계속 반환합니다.
+
+        파일의 inode가 바뀌거나(logrotate) 크기가 줄어들면(copytruncate) 다시 엽니다.
+        """
+        log_file = None
+        inode = None
+        partial = ''
+
+        while True:
+            if log_file is None:
+                try:
+                    log_file = open(path, 'r', encoding='utf-8', errors='replace')
+                except FileNotFoundError:
+                    time.sleep(poll_interval)
+                    continue
+                inode = os.fstat(log_file.fileno()).st_ino
+                if not from_start:
+                    log_file.seek(0, os.SEEK_END)
+                # 교체된 파일은 처음부터 읽음
+                from_start = True
+
+            chunk = log_file.readline()
+            if chunk:
+                partial += chunk
+                # 기록 중인 줄은 줄바꿈이 올 때까지 기다림
+                if partial.endswith('\n'):
+                    yield partial
+                    partial = ''
+                continue
+
+            try:
+                stat = os.stat(path)
+                rotated = stat.st_ino != inode or stat.st_size < log_file.tell()
+            except FileNotFoundError:
+                rotated = True
+
+            if rotated:
+                # 이전 파일에 남은 줄을 모두 읽은 뒤 새 파일로 전환
+                for line in log_file:
+                    partial += line
+                    if partial.endswith('\n'):
+                        yield partial
+                        partial = ''
+                log_file.close()
+                log_file = None
+                partial = ''
+                continue
+
+            time.sleep(poll_interval)
@@ -0,0 +1,64 @@
+"""
+페이지 캐시 예열 커맨드
+메인, 모든 튜토리얼 목록, 모든 주제 페이지를 스레드 풀로 동시에 렌더링해 페이지 캐시를 채우고
+페이지별 렌더링 시간을 출력합니다. 배포 후 CodeDeploy ValidateService 훅(scripts/warm_cache.sh)에서 실행합니다.
+
+사용법:
+    # 캐시되지 않은 페이지만 예열
+    python manage.py warm_cache
+
+    # 이미 캐시된 페이지도 다시 렌더링 (유지 시간 갱신), 스레드 8개
+    python manage.py warm_cache --force --workers 8
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from main.cache_warmup import warm_page_cache
+
+
+class Command(BaseCommand):
+    help = '페이지 캐시를 미리 채우고 페이지별 렌더링 시간을 출력합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='동시에 렌더링할 스레드 수 (기본값: 4)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='이미 캐시된 페이지도 다시 렌더링',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        results = warm_page_cache(workers=options['workers'], force=options['force'])
+        elapsed = time.monotonic() - started
+
+        counts = {'warmed': 0, 'cached': 0, 'skipped': 0, 'failed': 0}
+        for result in results:
+            counts[result.status] += 1
+            line = f'{result.seconds * 1000:8.1f}ms  {result.status:<7}  {result.url}'
+            if result.status == 'failed':
+                self.stdout.write(self.style.ERROR(f'{line}  ({result.error})'))
+            elif result.status == 'warmed':
+                self.stdout.write(line)
+
+        if counts['skipped'] == len(results) and results:
+            self.stdout.write(self.style.WARNING('페이지 캐시가 비활성화되어 있습니다 (DEBUG=True)'))
+            return
+
+        rendered = [result for result in results if result.status == 'warmed']
+        summary = (
+            f'페이지 캐시 예열 완료 ({elapsed:.2f}초): 예열 {counts["warmed"]}개, '
+            f'이미 캐시됨 {counts["cached"]}개, 실패 {counts["failed"]}개'
+        )
+        if rendered:
+            slowest = max(rendered, key=lambda result: result.seconds)
+            average = sum(result.seconds for result in rendered) / len(rendered)
+            summary += f', 평균 {average * 1000:.1f}ms, 최대 {slowest.seconds * 1000:.1f}ms ({slowest.url})'
+
+        style = self.style.WARNING if counts['failed'] else self.style.SUCCESS
+        self.stdout.write(style(summary))
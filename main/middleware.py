@@ -1,113 +1,206 @@
 """
 접속자 수 추적 미들웨어
-모든 요청에 대해 접속자 수를 카운팅합니다.
+모든 요청에 대해 접속자 수를 카운팅하고, 주제 상세 페이지는 주제별 조회수도 집계합니다.
+방문 쿠키를 사용하면 고유 접속자/방문 수는 방문당 한 번만 반영하고, 이어지는 페이지뷰는 버퍼로 일괄 반영합니다.
+표본 집계(VISITOR_COUNT_SAMPLE_RATE)를 사용하면 N건 중 1건만 가중치 N으로 반영합니다.
+WSGI(gunicorn)와 ASGI(uvicorn) 모두에서 스레드 전환 없이 동작합니다.
 """
 import logging
-import re
-from .utils import increment_visitor_count
+from datetime import date
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from .buffer import get_visitor_buffer
+from .classifier import EXCLUDED_NETWORKS, EXCLUDED_PATHS, EXCLUDED_USER_AGENTS, get_client_ip, get_request_classifier
+from .sampling import get_visitor_sampler
+from .utils import aincrement_visitor_count, increment_visitor_count, spawn_background_task
 
 logger = logging.getLogger(__name__)
 
+# 방문 쿠키 서명 salt (다른 서명 쿠키와 값이 호환되지 않도록 구분)
+VISIT_COOKIE_SALT = 'main.middleware.visit'
+
 
 class VisitorCountMiddleware:
     """
     접속자 수를 추적하는 미들웨어
     
     특정 경로와 봇/헬스체크 요청은 제외할 수 있습니다.
+    ASGI에서는 비동기 체인에 그대로 참여하며, 버퍼를 사용하지 않는 경우
+    접속자 수 증가를 백그라운드 작업으로 실행해 응답을 지연시키지 않습니다.
     """
     
-    # 접속자 수 카운팅에서 제외할 경로
-    EXCLUDED_PATHS = [
-        '/admin',
-        '/static',
-        '/media',
-        '/favicon.ico',
-        '/api/',
-        '/health',
-        '/healthz',
-        '/robots.txt',
-        '/sitemap.xml',
-        '/sitemap',
-        '/.well-known',
-        '/__debug__',
-        '/debug',
-    ]
-    
-    # 제외할 User-Agent 패턴 (봇, 헬스체크, 모니터링 도구 등)
-    EXCLUDED_USER_AGENTS = [
-        r'bot', r'crawler', r'spider', r'scanner', r'crawl',  # 검색엔진 봇
-        r'HealthCheck', r'health', r'monitor', r'ping',  # 헬스체크
-        r'UptimeRobot', r'Pingdom', r'StatusCake', r'NewRelic',  # 모니터링 서비스
-        r'curl', r'wget', r'python', r'go-http', r'java',  # 자동화 도구
-        r'Amazon-Route53', r'AlwaysOn', r'AlwaysOnHealthCheck',  # AWS 관련
-        r'ELB-HealthChecker', r'ELB-HealthChecker/',  # AWS ELB 헬스체크
-        r'kube-probe', r'kubelet',  # Kubernetes 헬스체크
-        r'Zabbix', r'Nagios', r'Prometheus',  # 모니터링 도구
-        r'^$',  # 빈 User-Agent
-    ]
+    sync_capable = True
+    async_capable = True
     
-    # 제외할 IP 주소 패턴 (내부 IP, 로드밸런서 등)
-    EXCLUDED_IP_PATTERNS = [
-        r'^127\.',  # localhost
-        r'^10\.',  # 사설 IP (10.x.x.x)
-        r'^172\.(1[6-9]|2[0-9]|3[0-1])\.',  # 사설 IP (172.16-31.x.x)
-        r'^192\.168\.',  # 사설 IP (192.168.x.x)
-        r'^169\.254\.',  # 링크 로컬
-    ]
+    # 제외 규칙은 main.classifier에서 공유 (접속 로그 기반 집계와 동일한 규칙 사용)
+    EXCLUDED_PATHS = EXCLUDED_PATHS
+    EXCLUDED_USER_AGENTS = EXCLUDED_USER_AGENTS
+    EXCLUDED_NETWORKS = EXCLUDED_NETWORKS
     
     def __init__(self, get_response):
+        # 접속 로그 기반 집계(tail_visitor_log 커맨드)를 사용하면 요청 경로에서 카운팅하지 않음
+        if not getattr(settings, 'VISITOR_COUNT_MIDDLEWARE_ENABLED', True):
+            raise MiddlewareNotUsed('VISITOR_COUNT_MIDDLEWARE_ENABLED=False')
         self.get_response = get_response
-        # User-Agent 패턴 컴파일 (성능 최적화)
-        self._ua_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.EXCLUDED_USER_AGENTS]
-        # IP 패턴 컴파일
-        self._ip_patterns = [re.compile(pattern) for pattern in self.EXCLUDED_IP_PATTERNS]
+        # 경로/User-Agent/IP 제외 판정을 미리 컴파일된 분류기 하나로 처리 (성능 최적화)
+        self._classifier = get_request_classifier()
+        # write-behind 버퍼 사용 여부 (요청 경로에서 Redis 왕복 제거)
+        self._use_buffer = getattr(settings, 'VISITOR_COUNT_BUFFER_ENABLED', True)
+        # 방문 쿠키 (Django 세션 대신 서명된 1st-party 쿠키로 방문 단위 판정, 비활성화 시 None)
+        self._visit_cookie = (
+            getattr(settings, 'VISITOR_VISIT_COOKIE_NAME', 'visit')
+            if getattr(settings, 'VISITOR_VISIT_COOKIE_ENABLED', False)
+            else None
+        )
+        self._visit_timeout = getattr(settings, 'VISITOR_VISIT_TIMEOUT_SECONDS', 60 * 30)
+        # 표본 집계 판정 (워커별, adaptive이면 Redis 지연 시간에 따라 비율 조정)
+        self._sampler = get_visitor_sampler()
+        # 다음 핸들러가 비동기이면 이 미들웨어도 비동기로 동작
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
     
     def __call__(self, request):
-        # 접속자 수 카운팅 (제외 조건 체크)
-        if not self._should_exclude(request):
-            try:
-                # IP 주소 가져오기 (프록시 뒤에 있는 경우 X-Forwarded-For 헤더 확인)
-                ip_address = self._get_client_ip(request)
-                user_agent = request.META.get('HTTP_USER_AGENT', '')
-                
-                # 접속자 수 증가
-                increment_visitor_count(ip_address=ip_address, user_agent=user_agent)
-            except Exception as e:
-                # 접속자 수 카운팅 실패해도 요청은 계속 진행
-                logger.warning(f"접속자 수 카운팅 실패: {e}")
+        if self._is_async:
+            return self.__acall__(request)
+        
+        counted_ip = None
+        try:
+            # IP 주소 가져오기 (프록시 뒤에 있는 경우 X-Forwarded-For 헤더 확인)
+            ip_address = self._get_client_ip(request)
+            
+            # 접속자 수 카운팅 (제외 조건 체크)
+            if not self._should_exclude(request, ip_address):
+                counted_ip = ip_address
+                # 표본 집계 시 표본에 포함되지 않은 요청은 건너뜀 (포함되면 가중치만큼 반영)
+                weight = self._sampler.sample()
+                if weight:
+                    if not self._is_new_visit(request):
+                        # 같은 방문의 이어지는 페이지뷰는 고유 접속자 반영 없이 버퍼에서 일괄 반영
+                        get_visitor_buffer().add(visit=False, weight=weight)
+                    # 접속자 수 증가 (버퍼 사용 시 메모리에만 기록하고 주기적으로 Redis에 반영)
+                    elif self._use_buffer:
+                        get_visitor_buffer().add(ip_address, weight=weight)
+                    else:
+                        user_agent = request.META.get('HTTP_USER_AGENT', '')
+                        increment_visitor_count(ip_address=ip_address, user_agent=user_agent, weight=weight)
+        except Exception as e:
+            # 접속자 수 카운팅 실패해도 요청은 계속 진행
+            logger.warning(f"접속자 수 카운팅 실패: {e}")
         
         response = self.get_response(request)
+        self._count_topic_view(request, response, counted_ip)
+        if counted_ip is not None:
+            self._set_visit_cookie(request, response)
+        return response
+    
+    async def __acall__(self, request):
+        """ASGI 요청 처리 - 카운팅은 이벤트 루프를 블로킹하지 않음"""
+        counted_ip = None
+        try:
+            ip_address = self._get_client_ip(request)
+            if not self._should_exclude(request, ip_address):
+                counted_ip = ip_address
+                weight = self._sampler.sample()
+                if weight:
+                    if not self._is_new_visit(request):
+                        get_visitor_buffer().add(visit=False, weight=weight)
+                    elif self._use_buffer:
+                        # 메모리 내 집계만 하므로 이벤트 루프에서 바로 호출해도 됨
+                        get_visitor_buffer().add(ip_address, weight=weight)
+                    else:
+                        user_agent = request.META.get('HTTP_USER_AGENT', '')
+                        spawn_background_task(
+                            aincrement_visitor_count(ip_address=ip_address, user_agent=user_agent, weight=weight)
+                        )
+        except Exception as e:
+            logger.warning(f"접속자 수 카운팅 실패: {e}")
+        
+        response = await self.get_response(request)
+        # 메모리 내 집계만 하므로 이벤트 루프에서 바로 호출해도 됨
+        self._count_topic_view(request, response, counted_ip)
+        if counted_ip is not None:
+            self._set_visit_cookie(request, response)
         return response
     
-    def _should_exclude(self, request):
+    def _is_new_visit(self, request):
+        """
+        요청이 새 방문의 첫 페이지뷰인지 확인합니다.
+        
+        방문 쿠키는 서명된 오늘 날짜를 담고 있으며, 마지막 페이지뷰 후
+        VISITOR_VISIT_TIMEOUT_SECONDS가 지나거나 날짜가 바뀌면 새 방문으로 봅니다.
+        방문 쿠키를 사용하지 않으면 모든 페이지뷰가 방문입니다.
+        
+        Returns:
+            bool: 새 방문이면 True
+        """
+        if not self._visit_cookie:
+            return True
+        visit_date = request.get_signed_cookie(
+            self._visit_cookie,
+            default=None,
+            salt=VISIT_COOKIE_SALT,
+            max_age=self._visit_timeout,
+        )
+        return visit_date != date.today().isoformat()
+    
+    def _set_visit_cookie(self, request, response):
+        """방문 쿠키를 (다시) 발급해 방문 만료 시각을 마지막 페이지뷰 기준으로 연장합니다."""
+        if not self._visit_cookie or response.status_code >= 400:
+            return
+        response.set_signed_cookie(
+            self._visit_cookie,
+            date.today().isoformat(),
+            salt=VISIT_COOKIE_SALT,
+            max_age=self._visit_timeout,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite='Lax',
+        )
+    
+    def _count_topic_view(self, request, response, ip_address):
+        """
+        주제 상세 페이지 조회를 주제별 조회수로 집계합니다.
+        
+        topic_detail은 페이지 캐시(main.page_cache)로 응답되어 뷰가 실행되지 않을 수 있으므로
+        응답 후 URL 해석 결과로 판단합니다. 조회수는 항상 워커 버퍼에 모았다가
+        접속자 수와 같은 파이프라인으로 반영합니다 (ZINCRBY/PFADD).
+        
+        Args:
+            request: Django request 객체
+            response: 응답 객체
+            ip_address: 카운팅 대상 요청의 클라이언트 IP (제외된 요청이면 None)
+        """
+        if ip_address is None or response.status_code != 200:
+            return
+        match = getattr(request, 'resolver_match', None)
+        if match is None or match.url_name != 'topic_detail':
+            return
+        try:
+            topic = f"{match.kwargs['category']}/{match.kwargs['topic']}"
+            get_visitor_buffer().add_topic_view(topic, ip_address)
+        except Exception as e:
+            logger.warning(f"주제 조회수 카운팅 실패: {e}")
+    
+    def _should_exclude(self, request, ip_address=None):
         """
         해당 요청이 카운팅에서 제외되어야 하는지 확인
         
         Args:
             request: Django request 객체
+            ip_address: 이미 구한 클라이언트 IP (없으면 request에서 다시 구함)
             
         Returns:
             bool: 제외해야 하면 True
         """
-        # 경로 확인
-        path = request.path
-        for excluded_path in self.EXCLUDED_PATHS:
-            if path.startswith(excluded_path):
-                return True
-        
-        # User-Agent 확인
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        for pattern in self._ua_patterns:
-            if pattern.search(user_agent):
-                return True
-        
-        # IP 주소 확인
-        ip_address = self._get_client_ip(request)
-        for pattern in self._ip_patterns:
-            if pattern.match(ip_address):
-                return True
-        
-        return False
+        if ip_address is None:
+            ip_address = self._get_client_ip(request)
+        return self._classifier.is_excluded(
+            request.path,
+            request.META.get('HTTP_USER_AGENT', ''),
+            ip_address,
+        )
     
     def _get_client_ip(self, request):
         """
@@ -121,12 +214,8 @@ class VisitorCountMiddleware:
         Returns:
             str: IP 주소
         """
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            # X-Forwarded-For 헤더는 여러 IP를 포함할 수 있음 (예: "client, proxy1, proxy2")
-            # 첫 번째 IP가 실제 클라이언트 IP
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-        return ip
-
+        # 접속 로그 기반 집계(main.access_log)와 같은 규칙 사용
+        return get_client_ip(
+            request.META.get('HTTP_X_FORWARDED_FOR'),
+            request.META.get('REMOTE_ADDR', ''),
+        )
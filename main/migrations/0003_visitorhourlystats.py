@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_visitorstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitorHourlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True, verbose_name='날짜')),
+                ('hour', models.PositiveSmallIntegerField(verbose_name='시')),
+                ('visitor_count', models.PositiveIntegerField(default=0, verbose_name='접속자 수')),
+                ('unique_visitor_count', models.PositiveIntegerField(default=0, verbose_name='고유 접속자 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '시간별 접속자 통계',
+                'verbose_name_plural': '시간별 접속자 통계',
+                'ordering': ['-date', '-hour'],
+                'unique_together': {('date', 'hour')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_visitorhourlystats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitorstats',
+            name='visit_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='방문 수'),
+        ),
+    ]
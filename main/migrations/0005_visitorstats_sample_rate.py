@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_visitorstats_visit_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitorstats',
+            name='sample_rate',
+            field=models.FloatField(default=1.0, verbose_name='표본 비율'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+def render_topics(apps, schema_editor):
+    from main.rendering import render_topic_html
+
+    Topic = apps.get_model('main', 'Topic')
+    topics = list(Topic.objects.only('id', 'content'))
+    for topic in topics:
+        topic.rendered_html, topic.content_hash = render_topic_html(topic.content)
+    Topic.objects.bulk_update(topics, ['rendered_html', 'content_hash'], batch_size=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_visitorstats_sample_rate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='내용 해시'),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='rendered_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='렌더링된 내용'),
+        ),
+        migrations.RunPython(render_topics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+# Celery Beat(DatabaseScheduler) 주기 작업
+# (이름, 작업, 스케줄(crontab 필드 dict 또는 주기 초), 만료 시간(초))
+PERIODIC_TASKS = [
+    # 매일 자정 1분에 전날 통계를 DB에 동기화
+    ('sync-visitor-stats-daily', 'main.tasks.sync_visitor_stats_task', {'minute': '1', 'hour': '0'}, 60 * 60),
+    # 5분마다 오늘 통계를 DB에 반영
+    ('sync-today-visitor-stats', 'main.tasks.sync_today_visitor_stats_task', 60 * 5, 60 * 4),
+    # 5분마다 인기 주제 목록 갱신 (POPULAR_TOPICS_CACHE_SECONDS보다 짧게)
+    ('refresh-popular-topics', 'main.tasks.refresh_popular_topics_task', 60 * 5, 60 * 4),
+    # 6시간마다 모든 페이지를 다시 렌더링 (24시간 캐시가 한꺼번에 만료되지 않도록)
+    ('warm-page-cache', 'main.tasks.warm_page_cache_task', 60 * 60 * 6, 60 * 30),
+]
+
+
+def register_periodic_tasks(apps, schema_editor):
+    """
+    주기 작업을 등록합니다.
+
+    같은 작업이 이미 등록되어 있으면(admin에서 직접 만든 경우 포함) 이름이나 스케줄을 바꾸지 않습니다.
+    """
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTasks = apps.get_model('django_celery_beat', 'PeriodicTasks')
+    CrontabSchedule = apps.get_model('django_celery_beat', 'CrontabSchedule')
+    IntervalSchedule = apps.get_model('django_celery_beat', 'IntervalSchedule')
+
+    created = False
+    for name, task, schedule, expire_seconds in PERIODIC_TASKS:
+        if PeriodicTask.objects.filter(task=task).exists():
+            continue
+        if isinstance(schedule, dict):
+            crontab, _ = CrontabSchedule.objects.get_or_create(
+                day_of_week='*',
+                day_of_month='*',
+                month_of_year='*',
+                timezone=settings.CELERY_TIMEZONE,
+                **schedule,
+            )
+            schedule_fields = {'crontab': crontab}
+        else:
+            interval, _ = IntervalSchedule.objects.get_or_create(every=schedule, period='seconds')
+            schedule_fields = {'interval': interval}
+        PeriodicTask.objects.create(name=name, task=task, expire_seconds=expire_seconds, **schedule_fields)
+        created = True
+
+    # 실행 중인 beat가 스케줄을 다시 읽도록 변경 시각 갱신 (마이그레이션에서는 시그널이 동작하지 않음)
+    if created:
+        PeriodicTasks.objects.update_or_create(ident=1, defaults={'last_update': timezone.now()})
+
+
+def unregister_periodic_tasks(apps, schema_editor):
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTask.objects.filter(name__in=[name for name, *_ in PERIODIC_TASKS]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_topic_rendered_html'),
+        ('django_celery_beat', '0018_improve_crontab_helptext'),
+    ]
+
+    operations = [
+        migrations.RunPython(register_periodic_tasks, unregister_periodic_tasks),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.urls import reverse
 
+from .rendering import render_topic_html, topic_content_hash
+
 
 class Category(models.Model):
     """카테고리 모델"""
@@ -34,6 +36,9 @@ class Topic(models.Model):
     title = models.CharField(max_length=200, verbose_name='제목')
     slug = models.SlugField(verbose_name='슬러그')
     content = models.TextField(blank=True, verbose_name='내용')
+    # 저장 시 content에서 만든 출력용 HTML (main.rendering, 요청마다 static_url 필터를 실행하지 않음)
+    rendered_html = models.TextField(blank=True, editable=False, verbose_name='렌더링된 내용')
+    content_hash = models.CharField(max_length=64, blank=True, editable=False, verbose_name='내용 해시')
     order = models.PositiveIntegerField(default=0, verbose_name='순서')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
@@ -47,6 +52,25 @@ class Topic(models.Model):
     def __str__(self):
         return f"{self.category.name} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            if self.render_content() and update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'rendered_html', 'content_hash'}
+        super().save(*args, **kwargs)
+
+    def render_content(self):
+        """
+        content가 바뀌었거나 STATIC_URL이 바뀌었으면 rendered_html을 다시 만듭니다.
+
+        Returns:
+            bool: 다시 렌더링했으면 True
+        """
+        if self.content_hash == topic_content_hash(self.content):
+            return False
+        self.rendered_html, self.content_hash = render_topic_html(self.content)
+        return True
+
     def get_absolute_url(self):
         return reverse('topic_detail', kwargs={
             'category': self.category.slug,
@@ -55,10 +79,19 @@ class Topic(models.Model):
 
 
 class VisitorStats(models.Model):
-    """일별 접속자 수 통계 모델"""
+    """
+    일별 접속자 수 통계 모델
+
+    visitor_count는 페이지뷰 수, visit_count는 방문 쿠키 기준 방문 수입니다
+    (방문 쿠키를 사용하지 않으면 페이지뷰 수와 같음).
+    sample_rate가 1보다 작으면 표본 집계한 날이며, 접속자/방문 수는 가중치로 보정한 추정값이고
+    고유 접속자 수는 표본에 포함된 IP만 센 값입니다.
+    """
     date = models.DateField(unique=True, verbose_name='날짜', db_index=True)
     visitor_count = models.PositiveIntegerField(default=0, verbose_name='접속자 수')
     unique_visitor_count = models.PositiveIntegerField(default=0, verbose_name='고유 접속자 수')
+    visit_count = models.PositiveIntegerField(default=0, verbose_name='방문 수')
+    sample_rate = models.FloatField(default=1.0, verbose_name='표본 비율')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
@@ -68,4 +101,27 @@ class VisitorStats(models.Model):
         ordering = ['-date']
 
     def __str__(self):
-        return f"{self.date} - {self.visitor_count}명"
\ No newline at end of file
+        return f"{self.date} - {self.visitor_count}명"
+
+    @property
+    def is_sampled(self):
+        """표본 집계한 날이면 True"""
+        return self.sample_rate < 1
+
+class VisitorHourlyStats(models.Model):
+    """시간별 접속자 수 통계 모델 (Redis 분/시간 시계열을 시간 단위로 다운샘플링)"""
+    date = models.DateField(verbose_name='날짜', db_index=True)
+    hour = models.PositiveSmallIntegerField(verbose_name='시')
+    visitor_count = models.PositiveIntegerField(default=0, verbose_name='접속자 수')
+    unique_visitor_count = models.PositiveIntegerField(default=0, verbose_name='고유 접속자 수')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        verbose_name = '시간별 접속자 통계'
+        verbose_name_plural = '시간별 접속자 통계'
+        ordering = ['-date', '-hour']
+        unique_together = [['date', 'hour']]
+
+    def __str__(self):
+        return f"{self.date} {self.hour:02d}시 - {self.visitor_count}명"
@@ -0,0 +1,342 @@
+"""
+버전 기반 페이지 캐시
+cache_page는 URL 해시로 키를 만들어 특정 페이지만 무효화할 수 없으므로,
+(뷰, 카테고리 slug, 주제 slug, 세대 번호)로 키를 만들고 세대 번호를 올려 무효화합니다.
+
+세대 번호(generation)는 캐시에 만료 없이 저장하는 정수이며, 페이지마다 의존하는 세대가 다릅니다.
+    index:        global, index, popular
+    tutorial:     global, category:<카테고리>, popular
+    topic_detail: global, category:<카테고리>, topic:<카테고리>/<주제>
+
+세대 번호 하나를 INCR하면 그 세대에 의존하는 페이지의 키가 모두 바뀌므로 O(1)로 무효화되고,
+이전 키는 삭제하지 않고 만료 시간이 지나면 사라집니다. 요청마다 세대 번호 조회(MGET 1회)와
+페이지 조회(GET 1회)만 하며, 캐시 전체를 비우는 cache.clear()(Celery 데이터 포함)는 쓰지 않습니다.
+
+캐시 미스가 한꺼번에 몰려도 같은 페이지를 여러 번 렌더링하지 않도록(stampede 방지)
+    - 같은 워커 안의 같은 키 미스는 한 스레드만 렌더링하고 나머지는 결과를 공유하며,
+    - 워커 사이에서는 렌더링 락(SET NX, 토큰 비교 후 해제)을 잡은 한 워커만 렌더링하고, 나머지는 세대와 무관하게 남겨 둔
+      이전 본문(page:stale:...)을 제공하거나 이전 본문이 없으면 잠시 기다립니다.
+    - 유지 시간은 무작위로 조금씩 줄여(PAGE_CACHE_TTL_JITTER) 함께 저장된 페이지가 동시에 만료되지 않게 합니다.
+"""
+import functools
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_KEY_PREFIX = 'page'  # 페이지 캐시 키 (예: page:topic_detail:python:intro:3.17.42)
+GENERATION_KEY_PREFIX = 'page:gen:'  # 세대 번호 키 (예: page:gen:category:python)
+STALE_KEY_PREFIX = 'page:stale:'  # 세대와 무관한 마지막 본문 (예: page:stale:topic_detail:python:intro)
+LOCK_KEY_SUFFIX = ':lock'  # 렌더링 락 (페이지 캐시 키 + 접미사)
+
+# 다른 워커가 렌더링하는 동안 캐시가 채워졌는지 확인하는 간격 (초)
+LOCK_POLL_INTERVAL_SECONDS = 0.05
+
+# 렌더링 락 해제: 자신이 잡은 락(토큰이 같은 경우)만 삭제
+# 렌더링이 락 만료 시간보다 오래 걸려 다른 워커가 새로 잡은 락을 지우지 않도록 함
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+GLOBAL_GENERATION = 'global'  # 배포(정적 파일 변경), 초기 데이터 로드
+INDEX_GENERATION = 'index'  # 메인 페이지 (카테고리 목록)
+POPULAR_GENERATION = 'popular'  # 인기 주제 목록 (메인, 튜토리얼 페이지)
+
+
+def category_generation(category_slug):
+    """카테고리 정보/주제 목록 세대 (튜토리얼 목록, 같은 카테고리 주제 페이지의 사이드바)"""
+    return f'category:{category_slug}'
+
+
+def topic_generation(category_slug, topic_slug):
+    """주제 본문 세대"""
+    return f'topic:{category_slug}/{topic_slug}'
+
+
+def page_generations(view_name, category=None, topic=None):
+    """페이지가 의존하는 세대 이름 목록"""
+    if view_name == 'index':
+        return [GLOBAL_GENERATION, INDEX_GENERATION, POPULAR_GENERATION]
+    if view_name == 'tutorial':
+        return [GLOBAL_GENERATION, category_generation(category), POPULAR_GENERATION]
+    return [GLOBAL_GENERATION, category_generation(category), topic_generation(category, topic)]
+
+
+def _initial_generation():
+    # 세대 키가 유실(메모리 정책에 의한 삭제 등)되어도 예전 번호로 되돌아가지 않도록 현재 시각으로 시작
+    return int(time.time() * 1000)
+
+
+def get_generations(names):
+    """
+    세대 번호를 한 번에 조회합니다 (없는 세대는 새로 만듦).
+
+    Returns:
+        list: 세대 번호 목록 또는 None (캐시에 접근할 수 없는 경우)
+    """
+    keys = [f'{GENERATION_KEY_PREFIX}{name}' for name in names]
+    values = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        value = values.get(key)
+        if value is None:
+            cache.add(key, _initial_generation(), None)
+            value = cache.get(key)
+            if value is None:
+                return None
+        generations.append(value)
+    return generations
+
+
+def bump_generation(*names):
+    """
+    세대 번호를 올려 해당 세대에 의존하는 페이지 캐시를 무효화합니다.
+
+    Args:
+        names: 세대 이름 (GLOBAL_GENERATION, category_generation(...) 등)
+    """
+    for name in dict.fromkeys(names):
+        key = f'{GENERATION_KEY_PREFIX}{name}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            # 세대 키가 없으면 새 번호로 시작 (이전 키와 겹치지 않음)
+            cache.set(key, _initial_generation(), None)
+        except Exception as e:
+            logger.error(f"페이지 캐시 무효화 실패 ({name}): {e}")
+
+
+def page_cache_key(view_name, generations, category=None, topic=None):
+    version = '.'.join(str(generation) for generation in generations)
+    return f'{PAGE_CACHE_KEY_PREFIX}:{view_name}:{category or ""}:{topic or ""}:{version}'
+
+
+def current_page_cache_key(view_name, category=None, topic=None):
+    """현재 세대 번호 기준 페이지 캐시 키 (캐시에 접근할 수 없으면 None)"""
+    generations = get_generations(page_generations(view_name, category, topic))
+    if generations is None:
+        return None
+    return page_cache_key(view_name, generations, category, topic)
+
+
+def stale_page_cache_key(key):
+    """페이지 캐시 키에서 세대 번호를 뺀 이전 본문 키"""
+    return STALE_KEY_PREFIX + key[len(PAGE_CACHE_KEY_PREFIX) + 1:].rsplit(':', 1)[0]
+
+
+def _jittered(timeout):
+    # 유지 시간을 최대 PAGE_CACHE_TTL_JITTER 비율만큼 무작위로 줄임
+    jitter = getattr(settings, 'PAGE_CACHE_TTL_JITTER', 0.1)
+    return max(1, int(timeout * (1 - random.uniform(0, jitter))))
+
+
+def store_page(key, response, timeout):
+    """
+    200 응답 본문을 페이지 캐시와 이전 본문 키에 저장합니다.
+
+    Returns:
+        tuple: 저장한 (본문, Content-Type) 또는 None (저장하지 않은 경우)
+    """
+    stale_key = stale_page_cache_key(key)
+    if response.status_code != 200 or response.streaming:
+        # 없어진 페이지의 이전 본문이 제공되지 않도록 삭제
+        cache.delete(stale_key)
+        return None
+    payload = (response.content, response['Content-Type'])
+    cache.set(key, payload, _jittered(timeout))
+    cache.set(stale_key, payload, timeout + getattr(settings, 'PAGE_CACHE_STALE_SECONDS', 60 * 60 * 24))
+    return payload
+
+
+def _page_response(payload):
+    content, content_type = payload
+    return HttpResponse(content, content_type=content_type)
+
+
+class _InflightRender:
+    __slots__ = ('done', 'payload')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _coalesce(key, render):
+    """
+    같은 프로세스에서 같은 키의 동시 미스는 첫 스레드만 render()를 실행하고
+    나머지 스레드는 그 결과 본문을 공유합니다.
+
+    Returns:
+        tuple: (본문 또는 None, 직접 렌더링한 응답 또는 None)
+    """
+    with _inflight_lock:
+        inflight = _inflight.get(key)
+        leader = inflight is None
+        if leader:
+            inflight = _inflight[key] = _InflightRender()
+
+    if not leader:
+        inflight.done.wait(getattr(settings, 'PAGE_CACHE_LOCK_SECONDS', 30))
+        return inflight.payload, None
+
+    try:
+        payload, response = render()
+        inflight.payload = payload
+        return payload, response
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        inflight.done.set()
+
+
+def _wait_for_page(key, seconds):
+    """다른 워커가 렌더링한 본문이 저장될 때까지 최대 seconds초 기다립니다."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL_SECONDS)
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+    return None
+
+
+def _render_and_store(key, timeout, render):
+    try:
+        response = render()
+    except Http404:
+        cache.delete(stale_page_cache_key(key))
+        raise
+    return store_page(key, response, timeout), response
+
+
+def _render_single_flight(key, timeout, render):
+    """
+    락을 잡은 워커만 렌더링해 저장합니다. 락을 잡지 못하면 이전 본문을 제공하거나
+    PAGE_CACHE_LOCK_WAIT_SECONDS 동안 기다리고, 그래도 없으면 직접 렌더링합니다.
+
+    Returns:
+        tuple: (본문 또는 None, 직접 렌더링한 응답 또는 None)
+    """
+    lock_key = key + LOCK_KEY_SUFFIX
+    token = _acquire_lock(lock_key)
+    if token is None:
+        payload = cache.get(stale_page_cache_key(key))
+        if payload is None:
+            payload = _wait_for_page(key, getattr(settings, 'PAGE_CACHE_LOCK_WAIT_SECONDS', 2.0))
+        if payload is not None:
+            return payload, None
+        return _render_and_store(key, timeout, render)
+
+    try:
+        return _render_and_store(key, timeout, render)
+    finally:
+        _release_lock(lock_key, token)
+
+
+def _lock_redis_client():
+    """렌더링 락에 쓸 Redis 클라이언트 (Redis가 아닌 캐시 백엔드이면 None)"""
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def _acquire_lock(lock_key):
+    """
+    렌더링 락을 잡고 토큰을 반환합니다 (다른 워커가 잡고 있으면 None).
+
+    Redis 오류로 락을 확인할 수 없으면 캐시도 쓸 수 없으므로 기다리지 않고 렌더링하도록 토큰을 반환합니다.
+    """
+    token = uuid.uuid4().hex
+    lock_seconds = getattr(settings, 'PAGE_CACHE_LOCK_SECONDS', 30)
+    redis_client = _lock_redis_client()
+    if redis_client is None:
+        return token if cache.add(lock_key, token, lock_seconds) else None
+    try:
+        # 캐시와 같은 키 접두사를 쓰도록 cache.make_key로 키 생성
+        return token if redis_client.set(cache.make_key(lock_key), token, nx=True, ex=lock_seconds) else None
+    except Exception as e:
+        logger.error(f"페이지 렌더링 락 획득 실패 ({lock_key}): {e}")
+        return token
+
+
+def _release_lock(lock_key, token):
+    """_acquire_lock()이 반환한 토큰과 같을 때만 렌더링 락을 해제합니다."""
+    redis_client = _lock_redis_client()
+    if redis_client is None:
+        # Redis가 아닌 캐시 백엔드(개발/테스트)는 원자적 비교 삭제가 없음
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+        return
+    try:
+        redis_client.register_script(RELEASE_LOCK_SCRIPT)(keys=[cache.make_key(lock_key)], args=[token])
+    except Exception as e:
+        logger.error(f"페이지 렌더링 락 해제 실패 ({lock_key}): {e}")
+
+
+def versioned_cache_page(view_name, timeout):
+    """
+    cache_page 대신 사용하는 버전 기반 페이지 캐시 데코레이터
+
+    GET/HEAD 요청의 200 응답 본문만 저장하며, URL의 category/topic 인자로 키를 만듭니다.
+    캐시 예열(main.cache_warmup)에서 쓰도록 뷰 이름과 유지 시간을 wrapper 속성으로 남깁니다.
+
+    Args:
+        view_name: 'index', 'tutorial', 'topic_detail'
+        timeout: 캐시 유지 시간 (초, 0이면 캐시하지 않음)
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not timeout or request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            key = current_page_cache_key(view_name, kwargs.get('category'), kwargs.get('topic'))
+            if key is None:
+                return view_func(request, *args, **kwargs)
+
+            cached = cache.get(key)
+            if cached is not None:
+                return _page_response(cached)
+
+            payload, response = _coalesce(
+                key,
+                lambda: _render_single_flight(key, timeout, lambda: view_func(request, *args, **kwargs)),
+            )
+            if response is not None:
+                return response
+            if payload is not None:
+                return _page_response(payload)
+            # 함께 기다린 렌더링이 캐시할 수 없는 응답(404 등)이었으면 직접 처리
+            return view_func(request, *args, **kwargs)
+        wrapper.page_cache_view_name = view_name
+        wrapper.page_cache_timeout = timeout
+        return wrapper
+    return decorator
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모의 렌더링 대기 목록과 락 상태를 물려받지 않도록 초기화
+    global _inflight_lock
+    _inflight.clear()
+    _inflight_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
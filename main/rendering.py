@@ -0,0 +1,68 @@
+"""
+주제 본문 사전 렌더링
+요청마다 static_url 필터(정규식 치환)를 실행하지 않도록 Topic 저장 시 본문을 한 번 변환해
+Topic.rendered_html에 저장하고, 렌더링 입력(STATIC_URL + 본문)의 해시를 content_hash에 남깁니다.
+STATIC_URL이 바뀌면 해시가 달라지므로 rerender_topics 커맨드로 바뀐 주제만 다시 렌더링합니다.
+"""
+import hashlib
+import re
+
+from django.conf import settings
+
+# src="/static/...", href="/static/..." 등의 패턴
+STATIC_PATH_PATTERN = re.compile(r'(src|href)=["\'](/static/[^"\']+)["\']')
+
+
+def _static_url_prefix():
+    # STATIC_URL 가져오기 (끝에 슬래시 하나만 보장)
+    static_url = settings.STATIC_URL.rstrip('/')
+    if static_url and not static_url.endswith('/'):
+        static_url += '/'
+    return static_url
+
+
+def render_static_urls(value):
+    """
+    HTML 콘텐츠 내부의 /static/ 경로를 STATIC_URL로 변환합니다.
+
+    변환 예:
+        /static/img/image.png -> https://bucket.s3.region.amazonaws.com/static/img/image.png
+        또는 (로컬인 경우) -> /static/img/image.png
+    """
+    if not value:
+        return value
+
+    static_url = _static_url_prefix()
+
+    def replace_static(match):
+        attr = match.group(1)  # src 또는 href
+        path = match.group(2)  # /static/... 경로 (예: /static/img/image.png)
+
+        # /static/ 이후의 경로만 추출 (예: /static/img/image.png -> img/image.png)
+        relative_path = path[8:]
+        if relative_path.startswith('/'):
+            relative_path = relative_path[1:]
+
+        # STATIC_URL이 이미 /로 끝나므로 바로 결합
+        return f'{attr}="{static_url}{relative_path}"'
+
+    return STATIC_PATH_PATTERN.sub(replace_static, str(value))
+
+
+def topic_content_hash(content):
+    """렌더링 입력(STATIC_URL + 본문)의 SHA-256 해시 (값이 같으면 다시 렌더링하지 않음)"""
+    digest = hashlib.sha256()
+    digest.update(settings.STATIC_URL.encode())
+    digest.update(b'\0')
+    digest.update((content or '').encode())
+    return digest.hexdigest()
+
+
+def render_topic_html(content):
+    """
+    주제 본문을 페이지에 그대로 출력할 HTML로 변환합니다.
+
+    Returns:
+        tuple: (rendered_html, content_hash)
+    """
+    return render_static_urls(content or ''), topic_content_hash(content)
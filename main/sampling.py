@@ -0,0 +1,142 @@
+"""
+접속자 수 표본 집계
+트래픽이 몰릴 때 모든 요청을 Redis에 반영하지 않고 N건 중 1건만 가중치 N으로 반영합니다.
+가중치만큼 카운터를 증가시키므로 일별/누적/시계열 접속자 수는 그대로 불편 추정값이 되며,
+표본 집계한 요청 수와 가중치 합계는 visitors:sampling:<날짜> 해시에 함께 기록해
+동기화 시 VisitorStats.sample_rate로 남깁니다.
+
+고유 접속자 수는 표본에 포함된 IP만 반영되므로 표본 집계한 날에는 실제보다 적을 수 있습니다.
+"""
+import logging
+import os
+import random
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 지연 시간 이동 평균 가중치
+LATENCY_EWMA_ALPHA = 0.2
+
+# 표본 간격 조정 최소 주기 (초, 조정 결과가 지연 시간에 반영될 시간을 둠)
+ADJUST_INTERVAL_SECONDS = 1.0
+
+
+def _interval_from_rate(rate):
+    """표본 비율(0~1]을 N건 중 1건의 N으로 변환"""
+    if not rate or rate >= 1:
+        return 1
+    return max(1, int(round(1 / rate)))
+
+
+class VisitorSampler:
+    """
+    워커 프로세스별 표본 집계 판정
+
+    기본 간격은 VISITOR_COUNT_SAMPLE_RATE로 정하고, adaptive이면 Redis 쓰기 지연 시간의
+    이동 평균이 slow_ms를 넘을 때 간격을 두 배로 늘리고(최대 max_interval),
+    slow_ms의 절반 아래로 내려가면 절반으로 줄입니다(최소 기본 간격).
+    """
+
+    def __init__(self, sample_rate=1.0, adaptive=False, slow_ms=50, min_sample_rate=0.01):
+        self.base_interval = _interval_from_rate(sample_rate)
+        self.max_interval = max(self.base_interval, _interval_from_rate(min_sample_rate))
+        self.adaptive = adaptive
+        self.slow_seconds = slow_ms / 1000
+        self._reset_state()
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self.interval = self.base_interval
+        self._latency = None
+        self._adjusted_at = 0.0
+
+    @property
+    def sample_rate(self):
+        return 1 / self.interval
+
+    def metrics(self):
+        """
+        표본 집계 상태 지표를 반환합니다.
+
+        Returns:
+            dict: {'sample_rate', 'interval', 'base_interval', 'max_interval', 'adaptive', 'latency_ms'}
+        """
+        latency = self._latency
+        return {
+            'sample_rate': self.sample_rate,
+            'interval': self.interval,
+            'base_interval': self.base_interval,
+            'max_interval': self.max_interval,
+            'adaptive': self.adaptive,
+            'latency_ms': None if latency is None else round(latency * 1000, 2),
+        }
+
+    def sample(self):
+        """
+        이번 요청을 반영할지 판정합니다.
+
+        Returns:
+            int: 반영할 가중치 (N건 중 1건이면 N), 건너뛸 요청이면 0
+        """
+        interval = self.interval
+        if interval == 1:
+            return 1
+        return interval if random.randrange(interval) == 0 else 0
+
+    def observe(self, seconds):
+        """Redis 쓰기 지연 시간을 기록하고 adaptive이면 간격을 조정합니다."""
+        if not self.adaptive:
+            return
+        with self._lock:
+            if self._latency is None:
+                self._latency = seconds
+            else:
+                self._latency += LATENCY_EWMA_ALPHA * (seconds - self._latency)
+
+            now = time.monotonic()
+            if now - self._adjusted_at < ADJUST_INTERVAL_SECONDS:
+                return
+            if self._latency > self.slow_seconds and self.interval < self.max_interval:
+                self.interval = min(self.interval * 2, self.max_interval)
+                self._adjusted_at = now
+                logger.warning(
+                    f"Redis 지연 {self._latency * 1000:.0f}ms, 접속자 수 표본 비율 1/{self.interval}로 낮춤"
+                )
+            elif self._latency < self.slow_seconds / 2 and self.interval > self.base_interval:
+                self.interval = max(self.interval // 2, self.base_interval)
+                self._adjusted_at = now
+                logger.info(f"접속자 수 표본 비율 1/{self.interval}로 높임")
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_visitor_sampler():
+    """
+    현재 프로세스의 VisitorSampler를 반환합니다 (최초 호출 시 생성).
+    """
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = VisitorSampler(
+                    sample_rate=getattr(settings, 'VISITOR_COUNT_SAMPLE_RATE', 1.0),
+                    adaptive=getattr(settings, 'VISITOR_COUNT_ADAPTIVE_SAMPLING', False),
+                    slow_ms=getattr(settings, 'VISITOR_COUNT_SAMPLING_SLOW_MS', 50),
+                    min_sample_rate=getattr(settings, 'VISITOR_COUNT_MIN_SAMPLE_RATE', 0.01),
+                )
+    return _sampler
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모의 지연 시간 기록과 락 상태를 물려받지 않도록 초기화
+    if _sampler is not None:
+        _sampler._reset_state()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
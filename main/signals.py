@@ -1,43 +1,77 @@
 """
 Django signals for cache invalidation
+페이지 캐시(main.page_cache)의 세대 번호를 올려 바뀐 페이지만 무효화하고,
+정적 사이트(main.static_site)를 사용하면 같은 페이지를 커밋 후 다시 내보냅니다.
 """
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from django.core.cache import cache
 from .models import Category, Topic
+from .page_cache import INDEX_GENERATION, bump_generation, category_generation, topic_generation
+from .static_site import schedule_export
+
+# 튜토리얼 목록/사이드바/인기 주제에 표시되는 Topic 필드 (바뀌면 카테고리 목록도 무효화)
+TOPIC_LIST_FIELDS = ('category_id', 'slug', 'title', 'order')
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_slug(sender, instance, **kwargs):
+    """저장 전 slug를 기억해 slug가 바뀌면 이전 URL의 캐시도 무효화 (post_save에서 사용)"""
+    instance._previous_slug = None
+    if instance.pk:
+        instance._previous_slug = Category.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
 
 
 @receiver(post_save, sender=Category)
 @receiver(post_delete, sender=Category)
 def invalidate_category_cache(sender, instance, **kwargs):
-    """Category가 변경되면 관련 캐시 무효화"""
-    # 메인 페이지 캐시 무효화
-    cache.delete('index_categories')
-    
-    # 해당 카테고리의 튜토리얼 목록 캐시 무효화
-    cache_key_pattern = f'tutorial_{instance.slug}'
-    # cache_page는 URL 기반으로 키를 생성하므로 정확한 키를 알기 어려움
-    # 대신 cache.clear()를 사용하거나, 더 세밀한 제어가 필요하면 수동 캐싱으로 변경
+    """Category가 변경되면 메인 페이지와 해당 카테고리의 페이지 캐시 무효화"""
+    generations = [INDEX_GENERATION, category_generation(instance.slug)]
+    previous_slug = getattr(instance, '_previous_slug', None)
+    if previous_slug and previous_slug != instance.slug:
+        generations.append(category_generation(previous_slug))
+    bump_generation(*generations)
+    schedule_export(*generations)
+
+
+@receiver(pre_save, sender=Topic)
+def remember_topic_list_fields(sender, instance, **kwargs):
+    """저장 전 값을 기억해 목록에 보이는 필드가 바뀌었는지 판단 (post_save에서 사용)"""
+    instance._previous_list_fields = None
+    if instance.pk:
+        instance._previous_list_fields = (
+            Topic.objects.filter(pk=instance.pk)
+            .values_list(*TOPIC_LIST_FIELDS)
+            .first()
+        )
 
 
 @receiver(post_save, sender=Topic)
 @receiver(post_delete, sender=Topic)
-def invalidate_topic_cache(sender, instance, **kwargs):
-    """Topic이 변경되면 관련 캐시 무효화"""
-    # 해당 주제의 상세 페이지 캐시 무효화
-    cache_key_pattern = f'topic_detail_{instance.category.slug}_{instance.slug}'
-    
-    # 해당 카테고리의 튜토리얼 목록 캐시 무효화
-    tutorial_cache_key_pattern = f'tutorial_{instance.category.slug}'
-    
-    # 메인 페이지 캐시 무효화
-    cache.delete('index_categories')
-    
-    # cache_page는 내부적으로 복잡한 키를 사용하므로
-    # 전체 캐시를 클리어하거나, 더 세밀한 제어를 위해
-    # django.core.cache.cache.clear()를 사용할 수 있지만
-    # 이는 모든 캐시를 지우므로 주의가 필요함
-    
-    # 대안: 특정 패턴의 키만 삭제하려면 Redis를 직접 사용
-    # 또는 cache_page 대신 수동 캐싱을 사용하는 것이 더 나을 수 있음
+def invalidate_topic_cache(sender, instance, created=False, **kwargs):
+    """
+    Topic이 변경되면 관련 페이지 캐시 무효화
+
+    본문만 바뀌면 해당 주제 페이지만, 생성/삭제되거나 제목/slug/순서/카테고리가 바뀌면
+    카테고리 목록(튜토리얼 목록과 같은 카테고리 주제 페이지의 사이드바)과 메인 페이지도 무효화합니다.
+    """
+    category_slug = instance.category.slug
+    generations = [topic_generation(category_slug, instance.slug)]
+
+    previous = getattr(instance, '_previous_list_fields', None)
+    current = tuple(getattr(instance, field) for field in TOPIC_LIST_FIELDS)
+    if kwargs.get('signal') is post_delete or created or previous != current:
+        generations += [category_generation(category_slug), INDEX_GENERATION]
+
+    # 카테고리나 slug가 바뀌었으면 이전 URL의 페이지와 이전 카테고리 목록도 무효화
+    if previous is not None and previous[:2] != current[:2]:
+        previous_category = category_slug
+        if previous[0] != instance.category_id:
+            previous_category = Category.objects.filter(pk=previous[0]).values_list('slug', flat=True).first()
+        if previous_category:
+            generations += [
+                category_generation(previous_category),
+                topic_generation(previous_category, previous[1]),
+            ]
 
+    bump_generation(*generations)
+    schedule_export(*generations)
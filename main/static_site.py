@@ -0,0 +1,278 @@
+"""
+정적 사이트 내보내기
+메인/튜토리얼/주제 페이지를 STATIC_SITE_ROOT 아래에 URL 경로 그대로 index.html(과 .gz)로 저장하고,
+nginx가 try_files로 파일을 직접 제공하며 파일이 없을 때만 Django로 넘깁니다.
+    /                    -> index.html
+    /<카테고리>/           -> <카테고리>/index.html
+    /<카테고리>/<주제>/     -> <카테고리>/<주제>/index.html
+
+페이지 캐시(main.page_cache)와 같은 세대 이름으로 다시 내보낼 페이지를 정하므로,
+시그널이 세대 번호를 올릴 때 schedule_export()를 함께 호출하면 Celery 작업(export_static_pages_task)이
+바뀐 페이지만 다시 씁니다.
+내용이 같은 파일은 다시 쓰지 않고, 임시 파일에 쓴 뒤 교체하므로 nginx가 쓰는 중인 파일을 읽지 않습니다.
+
+nginx가 제공한 요청은 Django 미들웨어를 거치지 않으므로 접속자 수와 주제 조회수는
+VISITOR_COUNT_MIDDLEWARE_ENABLED=False로 두고 tail_visitor_log 커맨드(nginx 접속 로그)로 집계해야 합니다
+(잘못 설정하면 manage.py check가 main.W001 경고).
+"""
+import functools
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpRequest
+from django.urls import resolve, reverse
+
+from .page_cache import GLOBAL_GENERATION, INDEX_GENERATION, POPULAR_GENERATION
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'index.html'
+
+
+def get_static_site_root():
+    return Path(getattr(settings, 'STATIC_SITE_ROOT', settings.BASE_DIR / 'static_site'))
+
+
+def page_url(view_name, category=None, topic=None):
+    """페이지 URL 경로 (request.path처럼 디코딩된 경로)"""
+    kwargs = {}
+    if category is not None:
+        kwargs['category'] = category
+    if topic is not None:
+        kwargs['topic'] = topic
+    return unquote(reverse(view_name, kwargs=kwargs))
+
+
+def page_file(url):
+    """URL 경로에 해당하는 파일 경로 (nginx의 $uri도 디코딩된 경로이므로 그대로 저장)"""
+    return get_static_site_root() / url.lstrip('/') / INDEX_FILE
+
+
+def all_pages():
+    """내보낼 전체 페이지 목록 [(뷰 이름, 카테고리 slug, 주제 slug)]"""
+    from main.models import Category, Topic
+
+    pages = [('index', None, None)]
+    pages += [('tutorial', slug, None) for slug in Category.objects.values_list('slug', flat=True)]
+    pages += [
+        ('topic_detail', category, topic)
+        for category, topic in Topic.objects.values_list('category__slug', 'slug')
+    ]
+    return pages
+
+
+def pages_for_generations(names):
+    """
+    세대 이름으로 다시 내보낼 페이지를 정합니다 (main.page_cache.page_generations의 역방향).
+
+    Returns:
+        tuple: (페이지 목록, 전체 내보내기 여부)
+    """
+    from main.models import Category, Topic
+
+    pages = []
+    for name in names:
+        if name == GLOBAL_GENERATION:
+            return all_pages(), True
+        if name == INDEX_GENERATION:
+            pages.append(('index', None, None))
+        elif name == POPULAR_GENERATION:
+            pages.append(('index', None, None))
+            pages += [('tutorial', slug, None) for slug in Category.objects.values_list('slug', flat=True)]
+        elif name.startswith('category:'):
+            category = name[len('category:'):]
+            pages.append(('tutorial', category, None))
+            pages += [
+                ('topic_detail', category, topic)
+                for topic in Topic.objects.filter(category__slug=category).values_list('slug', flat=True)
+            ]
+            # 카테고리 slug가 바뀌면 이전 경로의 주제 파일은 DB로 찾을 수 없으므로 디스크에서 찾아 지움
+            directory = page_file(page_url('tutorial', category)).parent
+            pages += [('topic_detail', category, path.parent.name) for path in directory.glob(f'*/{INDEX_FILE}')]
+        elif name.startswith('topic:'):
+            category, topic = name[len('topic:'):].split('/', 1)
+            pages.append(('topic_detail', category, topic))
+    return list(dict.fromkeys(pages)), False
+
+
+def build_page_request(url):
+    """미들웨어를 거치지 않고 뷰를 직접 호출할 GET 요청 (캐시 예열에서도 사용)"""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = url
+    host = getattr(settings, 'STATIC_SITE_HOST', 'localhost')
+    request.META = {
+        'REQUEST_METHOD': 'GET',
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'HTTP_HOST': host,
+    }
+    return request
+
+
+def render_page(url):
+    """
+    페이지를 렌더링합니다 (페이지 캐시를 거치지 않고 뷰를 직접 호출).
+
+    Returns:
+        bytes: 페이지 HTML 또는 None (페이지가 없거나 200이 아닌 경우)
+    """
+    match = resolve(url)
+    view = getattr(match.func, '__wrapped__', match.func)
+    request = build_page_request(url)
+    request.resolver_match = match
+    try:
+        response = view(request, *match.args, **match.kwargs)
+    except Http404:
+        return None
+    if response.status_code != 200 or response.streaming:
+        return None
+    return response.content
+
+
+def _write_if_changed(path, content):
+    """내용이 다를 때만 임시 파일에 쓰고 교체합니다. 다시 썼으면 True"""
+    try:
+        if path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)  # nginx 사용자가 읽을 수 있도록
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def _remove_page(path):
+    """페이지 파일과 .gz를 지우고 빈 디렉토리를 정리합니다. 지웠으면 True"""
+    removed = False
+    for target in (path, path.with_name(path.name + '.gz')):
+        try:
+            target.unlink()
+            removed = True
+        except FileNotFoundError:
+            pass
+    root = get_static_site_root()
+    directory = path.parent
+    while directory != root and root in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            break
+        directory = directory.parent
+    return removed
+
+
+def export_page(view_name, category=None, topic=None):
+    """
+    페이지 하나를 파일로 내보냅니다 (gzip_static용 .gz 포함).
+
+    페이지가 없어졌거나 렌더링에 실패하면 파일을 지워 nginx가 Django로 넘기도록 합니다.
+
+    Returns:
+        str: 'written', 'unchanged', 'removed', 'missing' 중 하나
+    """
+    url = page_url(view_name, category, topic)
+    path = page_file(url)
+    try:
+        content = render_page(url)
+    except Exception as e:
+        logger.error(f"정적 페이지 렌더링 실패 ({url}): {e}")
+        content = None
+
+    if content is None:
+        return 'removed' if _remove_page(path) else 'missing'
+
+    # mtime=0으로 압축해 같은 HTML이면 같은 .gz가 되도록 함
+    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+    written = _write_if_changed(path, content)
+    written = _write_if_changed(path.with_name(path.name + '.gz'), compressed) or written
+    return 'written' if written else 'unchanged'
+
+
+def remove_stale_pages(pages):
+    """pages에 없는 페이지 파일을 지웁니다 (삭제되었거나 slug가 바뀐 페이지). 지운 수를 반환"""
+    root = get_static_site_root()
+    expected = {page_file(page_url(*page)) for page in pages}
+    removed = 0
+    for path in list(root.rglob(INDEX_FILE)):
+        if path not in expected and _remove_page(path):
+            removed += 1
+    return removed
+
+
+def export_pages(pages, prune=False):
+    """
+    페이지를 내보내고 결과 수를 반환합니다.
+
+    Args:
+        pages: [(뷰 이름, 카테고리 slug, 주제 slug)]
+        prune: True이면 pages에 없는 파일도 지움 (전체 내보내기)
+
+    Returns:
+        dict: {'written', 'unchanged', 'removed', 'missing'} 별 페이지 수
+    """
+    results = {'written': 0, 'unchanged': 0, 'removed': 0, 'missing': 0}
+    for page in pages:
+        results[export_page(*page)] += 1
+    if prune:
+        results['removed'] += remove_stale_pages(pages)
+    return results
+
+
+def export_generations(names):
+    """
+    세대 이름에 해당하는 페이지만 다시 내보냅니다.
+
+    Returns:
+        dict: export_pages()의 결과 수
+    """
+    try:
+        pages, full = pages_for_generations(names)
+        return export_pages(pages, prune=full)
+    except Exception as e:
+        logger.error(f"정적 페이지 내보내기 실패 ({', '.join(names)}): {e}")
+        return {'written': 0, 'unchanged': 0, 'removed': 0, 'missing': 0}
+
+
+def _enqueue_export(names):
+    from .tasks import export_static_pages_task
+
+    try:
+        export_static_pages_task.delay(names)
+    except Exception as e:
+        logger.error(f"정적 페이지 내보내기 작업 등록 실패 ({', '.join(names)}): {e}")
+
+
+def schedule_export(*names):
+    """
+    트랜잭션 커밋 후 세대 이름에 해당하는 페이지를 다시 내보내는 Celery 작업을 등록합니다.
+
+    웹 요청에서는 렌더링/파일 쓰기를 하지 않으며, 작업은 broadcast 큐(static_site)로 보내
+    인스턴스마다 실행 중인 Celery 워커가 각자의 STATIC_SITE_ROOT를 갱신합니다.
+    STATIC_SITE_EXPORT_ENABLED=False이면 아무것도 하지 않습니다.
+    """
+    if not getattr(settings, 'STATIC_SITE_EXPORT_ENABLED', False):
+        return
+    transaction.on_commit(functools.partial(_enqueue_export, list(dict.fromkeys(names))))
+
+
+def clear_static_site():
+    """내보낸 파일을 모두 지웁니다 (정적 사이트를 끌 때)."""
+    root = get_static_site_root()
+    if root.exists():
+        shutil.rmtree(root)
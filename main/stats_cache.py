@@ -0,0 +1,111 @@
+"""
+접속자 통계 API용 워커별 마이크로 캐시
+/api/visitors/stats/는 모든 페이지에서 호출되므로, 짧은 시간(기본 2초) 동안
+한 번 계산한 통계를 직렬화된 JSON과 ETag로 보관해 요청마다 Redis/DB에 접근하지 않습니다.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+from .utils import aget_visitor_stats, get_visitor_stats
+
+
+class StatsSnapshot:
+    """직렬화된 통계 한 건 (본문, ETag, 만료 시각)"""
+
+    __slots__ = ('stats', 'body', 'etag', 'expires_at')
+
+    def __init__(self, stats, ttl):
+        self.stats = stats
+        self.body = json.dumps(stats).encode()
+        self.etag = f'"{hashlib.md5(self.body).hexdigest()}"'
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def is_fresh(self):
+        return time.monotonic() < self.expires_at
+
+
+class VisitorStatsCache:
+    """
+    워커 프로세스별 접속자 통계 스냅샷
+
+    유효 기간 내에는 저장된 스냅샷을 그대로 반환하고, 만료되면 한 스레드(코루틴)만
+    다시 계산합니다. 다시 계산하는 동안 다른 요청은 직전 스냅샷을 받습니다.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._snapshot = None
+        self._lock = threading.Lock()
+        # 이벤트 루프별 asyncio.Lock (asyncio.Lock은 처음 사용한 루프에 묶임)
+        self._async_locks = weakref.WeakKeyDictionary()
+
+    def peek(self):
+        """
+        유효한 스냅샷이 있으면 반환합니다 (Redis/DB에 접근하지 않음).
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.is_fresh:
+            return snapshot
+        return None
+
+    def get(self):
+        """유효한 스냅샷을 반환하고, 만료되었으면 다시 계산합니다."""
+        snapshot = self.peek()
+        if snapshot is not None:
+            return snapshot
+
+        stale = self._snapshot
+        # 이미 다른 스레드가 계산 중이면 직전 스냅샷을 반환 (없을 때만 기다림)
+        if not self._lock.acquire(blocking=stale is None):
+            return stale
+        try:
+            snapshot = self.peek()
+            if snapshot is None:
+                snapshot = self._snapshot = StatsSnapshot(get_visitor_stats(), self.ttl)
+            return snapshot
+        finally:
+            self._lock.release()
+
+    async def aget(self):
+        """get()의 비동기 버전"""
+        snapshot = self.peek()
+        if snapshot is not None:
+            return snapshot
+
+        stale = self._snapshot
+        lock = self._async_lock()
+        # 이미 다른 코루틴이 계산 중이면 직전 스냅샷을 반환 (없을 때만 기다림)
+        if lock.locked() and stale is not None:
+            return stale
+        async with lock:
+            snapshot = self.peek()
+            if snapshot is None:
+                snapshot = self._snapshot = StatsSnapshot(await aget_visitor_stats(), self.ttl)
+            return snapshot
+
+    def _async_lock(self):
+        loop = asyncio.get_running_loop()
+        lock = self._async_locks.get(loop)
+        if lock is None:
+            lock = self._async_locks[loop] = asyncio.Lock()
+        return lock
+
+
+_cache = None
+
+
+def get_visitor_stats_cache():
+    """
+    현재 프로세스의 VisitorStatsCache를 반환합니다 (최초 호출 시 생성).
+    """
+    global _cache
+    if _cache is None:
+        _cache = VisitorStatsCache(ttl=getattr(settings, 'VISITOR_STATS_CACHE_SECONDS', 2))
+    return _cache
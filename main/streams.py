@@ -0,0 +1,179 @@
+"""
+접속자 통계 실시간 스트림 (Server-Sent Events)
+워커 프로세스마다 백그라운드 스레드 하나가 Redis pub/sub 채널을 구독하고,
+갱신된 통계를 해당 워커에 연결된 모든 클라이언트에 전달합니다.
+브라우저 탭이 많아도 Redis 구독은 워커당 하나입니다.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from .stats_cache import get_visitor_stats_cache
+from .utils import VISITOR_UPDATES_CHANNEL, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class VisitorStatsHub:
+    """
+    워커별 접속자 통계 팬아웃 허브
+
+    구독 스레드는 VISITOR_UPDATES_CHANNEL 알림을 받거나 interval이 지나면
+    통계 스냅샷(main.stats_cache)을 갱신하고, 값이 바뀌었을 때만 대기 중인
+    동기 스트림(threading.Condition)과 비동기 스트림(asyncio.Event)을 깨웁니다.
+    """
+
+    def __init__(self, interval=5, heartbeat=15):
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self._reset_state()
+
+    def _reset_state(self):
+        self._condition = threading.Condition()
+        self._snapshot = None
+        self._async_waiters = set()  # (이벤트 루프, asyncio.Event)
+        # 구독 스레드가 순회하는 동안 이벤트 루프 스레드들이 추가/제거하므로 락으로 보호
+        self._waiters_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='visitor-stats-hub', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            pubsub = None
+            try:
+                redis_client = get_redis_client()
+                if redis_client:
+                    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(VISITOR_UPDATES_CHANNEL)
+                while True:
+                    if pubsub is not None:
+                        # 알림이 오면 바로, 없으면 interval마다 갱신
+                        pubsub.get_message(timeout=self.interval)
+                    else:
+                        time.sleep(self.interval)
+                    self._refresh()
+            except Exception as e:
+                logger.warning(f"접속자 통계 구독 실패, 재연결합니다: {e}")
+                time.sleep(self.interval)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _refresh(self):
+        snapshot = get_visitor_stats_cache().get()
+        if self._snapshot is not None and snapshot.etag == self._snapshot.etag:
+            return
+        with self._condition:
+            self._snapshot = snapshot
+            self._condition.notify_all()
+        with self._waiters_lock:
+            waiters = list(self._async_waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 경우
+                with self._waiters_lock:
+                    self._async_waiters.discard((loop, event))
+
+    def stream(self, max_seconds=None):
+        """
+        동기(WSGI) 클라이언트용 SSE 이벤트 생성기
+
+        max_seconds가 지나면 연결을 끝내고 EventSource의 자동 재연결에 맡겨
+        워커 스레드가 무기한 점유되지 않도록 합니다.
+        """
+        self._ensure_started()
+        deadline = time.monotonic() + max_seconds if max_seconds else None
+
+        snapshot = get_visitor_stats_cache().get()
+        yield _format_event(snapshot)
+
+        while deadline is None or time.monotonic() < deadline:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._snapshot is not None and self._snapshot.etag != snapshot.etag,
+                    timeout=self.heartbeat,
+                )
+                latest = self._snapshot
+            if latest is None or latest.etag == snapshot.etag:
+                yield b': keepalive\n\n'
+                continue
+            snapshot = latest
+            yield _format_event(snapshot)
+
+    async def astream(self, max_seconds=None):
+        """비동기(ASGI) 클라이언트용 SSE 이벤트 생성기 (연결마다 스레드를 쓰지 않음)"""
+        self._ensure_started()
+        deadline = time.monotonic() + max_seconds if max_seconds else None
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._waiters_lock:
+            self._async_waiters.add(waiter)
+        try:
+            snapshot = await get_visitor_stats_cache().aget()
+            yield _format_event(snapshot)
+
+            while deadline is None or time.monotonic() < deadline:
+                event = waiter[1]
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b': keepalive\n\n'
+                    continue
+                event.clear()
+                latest = self._snapshot
+                if latest is not None and latest.etag != snapshot.etag:
+                    snapshot = latest
+                    yield _format_event(snapshot)
+        finally:
+            with self._waiters_lock:
+                self._async_waiters.discard(waiter)
+
+
+def _format_event(snapshot):
+    """스냅샷을 SSE 메시지로 변환 (ETag를 이벤트 id로 사용)"""
+    return b'id: ' + snapshot.etag.strip('"').encode() + b'\ndata: ' + snapshot.body + b'\n\n'
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_visitor_stats_hub():
+    """
+    현재 프로세스의 VisitorStatsHub를 반환합니다 (최초 호출 시 생성).
+    """
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = VisitorStatsHub(
+                    interval=getattr(settings, 'VISITOR_STATS_STREAM_INTERVAL_SECONDS', 5),
+                    heartbeat=getattr(settings, 'VISITOR_STATS_STREAM_HEARTBEAT_SECONDS', 15),
+                )
+    return _hub
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모의 구독 스레드를 물려받지 않으므로 새로 시작하도록 초기화
+    if _hub is not None:
+        _hub._reset_state()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
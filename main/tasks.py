@@ -7,8 +7,16 @@ from datetime import date, timedelta
 
 logger = logging.getLogger(__name__)
 
+# 실패 시 재시도 (1분, 2분, 4분 간격의 지수 백오프)
+SYNC_MAX_RETRIES = 3
+SYNC_RETRY_BASE_SECONDS = 60
 
-@shared_task(bind=True, name='main.tasks.sync_visitor_stats_task')
+
+def _retry_countdown(task):
+    return SYNC_RETRY_BASE_SECONDS * 2 ** task.request.retries
+
+
+@shared_task(bind=True, name='main.tasks.sync_visitor_stats_task', max_retries=SYNC_MAX_RETRIES)
 def sync_visitor_stats_task(self):
     """
     매일 자정에 실행되는 배치 작업
@@ -17,8 +25,7 @@ def sync_visitor_stats_task(self):
     Returns:
         dict: 동기화 결과 정보
     """
-    from main.models import VisitorStats
-    from main.utils import get_daily_visitors_count, get_daily_unique_visitors_count
+    from main.utils import get_unique_backend, sync_visitor_stats_range
     
     try:
         # 전날 날짜
@@ -27,23 +34,29 @@ def sync_visitor_stats_task(self):
         
         logger.info(f'접속자 수 동기화 시작: {date_str}')
         
-        # Redis에서 데이터 가져오기
-        visitor_count = get_daily_visitors_count(target_date)
-        unique_visitor_count = get_daily_unique_visitors_count(target_date)
-        
-        # MariaDB에 저장 또는 업데이트
-        visitor_stats, created = VisitorStats.objects.update_or_create(
-            date=target_date,
-            defaults={
-                'visitor_count': visitor_count,
-                'unique_visitor_count': unique_visitor_count,
+        # Redis에서 파이프라인 한 번으로 조회해 MariaDB에 bulk upsert
+        # (누적 합계 증분 갱신, 시간별 다운샘플링 포함, sync_visitor_stats 커맨드와 같은 경로)
+        # 증분 동기화로 저장된 값보다 줄어들지 않도록 최고 수위 기준으로 저장
+        result = sync_visitor_stats_range([target_date], high_water_mark=True)
+        if not result['synced']:
+            logger.warning(f'접속자 수 동기화 건너뜀: {date_str} (Redis에 데이터 없음)')
+            return {
+                'success': True,
+                'date': date_str,
+                'action': 'skipped',
+                'message': f'{date_str}: Redis에 데이터가 없어 건너뜀',
             }
-        )
         
-        action = '생성' if created else '업데이트'
+        synced = result['synced'][0]
+        visitor_count = synced['visitor_count']
+        unique_visitor_count = synced['unique_visitor_count']
+        hourly_rows = synced['hourly_rows']
+        
+        action = '생성' if synced['created'] else '업데이트'
         result_msg = (
             f'{date_str}: 접속자 {visitor_count}명, '
-            f'고유 접속자 {unique_visitor_count}명 ({action})'
+            f'고유 접속자 {unique_visitor_count}명 ({action}), '
+            f'시간별 {hourly_rows}건'
         )
         
         logger.info(f'접속자 수 동기화 완료: {result_msg}')
@@ -53,6 +66,11 @@ def sync_visitor_stats_task(self):
             'date': date_str,
             'visitor_count': visitor_count,
             'unique_visitor_count': unique_visitor_count,
+            'unique_backend': get_unique_backend(),
+            'sample_rate': synced['sample_rate'],
+            'hourly_rows': hourly_rows,
+            'redis_seconds': result['redis_seconds'],
+            'db_seconds': result['db_seconds'],
             'action': action,
             'message': result_msg,
         }
@@ -61,8 +79,9 @@ def sync_visitor_stats_task(self):
         error_msg = f'접속자 수 동기화 실패: {exc}'
         logger.error(error_msg, exc_info=True)
         
-        # Celery의 retry 메커니즘 활용 (선택사항)
-        # raise self.retry(exc=exc, countdown=60, max_retries=3)
+        # Celery의 retry 메커니즘 활용 (지수 백오프, 재시도 횟수를 모두 쓰면 실패 결과 반환)
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=_retry_countdown(self))
         
         return {
             'success': False,
@@ -70,3 +89,123 @@ def sync_visitor_stats_task(self):
             'message': error_msg,
         }
 
+
+@shared_task(bind=True, name='main.tasks.sync_today_visitor_stats_task', max_retries=SYNC_MAX_RETRIES)
+def sync_today_visitor_stats_task(self):
+    """
+    몇 분마다 실행되는 증분 동기화 작업
+    Redis의 오늘 접속자 수 통계를 MariaDB에 반영합니다.
+    
+    DB에 저장된 값을 최고 수위로 보고 값이 늘어났을 때만 저장하므로
+    여러 번 실행되거나 Redis 데이터가 유실되어도 DB 값이 줄어들지 않습니다.
+    Redis 장애 시 get_visitor_stats()는 이 행을 사용합니다.
+    
+    Returns:
+        dict: 동기화 결과 정보
+    """
+    from main.utils import sync_visitor_stats_range
+    
+    date_str = date.today().strftime('%Y-%m-%d')
+    
+    try:
+        result = sync_visitor_stats_range([date.today()], high_water_mark=True)
+        synced = result['synced'][0] if result['synced'] else None
+        
+        if synced is None:
+            return {'success': True, 'date': date_str, 'action': 'skipped'}
+        
+        return {
+            'success': True,
+            'date': date_str,
+            'visitor_count': synced['visitor_count'],
+            'unique_visitor_count': synced['unique_visitor_count'],
+            'sample_rate': synced['sample_rate'],
+            'hourly_rows': synced['hourly_rows'],
+            'action': 'updated' if synced['changed'] else 'unchanged',
+        }
+        
+    except Exception as exc:
+        error_msg = f'오늘 접속자 수 증분 동기화 실패: {exc}'
+        logger.error(error_msg, exc_info=True)
+        
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=_retry_countdown(self))
+        
+        return {
+            'success': False,
+            'error': str(exc),
+            'message': error_msg,
+        }
+
+
+@shared_task(name='main.tasks.refresh_popular_topics_task')
+def refresh_popular_topics_task():
+    """
+    몇 분마다 실행되는 인기 주제 갱신 작업
+    최근 7일 주제별 조회수를 합산해 캐시된 인기 주제 목록을 다시 계산합니다.
+    
+    요청 경로에서는 이 작업이 저장한 목록만 읽으므로 Redis를 스캔하거나 정렬하지 않습니다.
+    순위가 바뀌면 인기 주제를 표시하는 페이지(메인, 튜토리얼 목록)의 캐시를 무효화하고 정적 페이지를 갱신합니다.
+    
+    Returns:
+        dict: 갱신 결과 정보
+    """
+    from main.page_cache import POPULAR_GENERATION, bump_generation
+    from main.static_site import schedule_export
+    from main.utils import refresh_popular_topics
+    
+    changed = refresh_popular_topics()
+    if changed:
+        bump_generation(POPULAR_GENERATION)
+        schedule_export(POPULAR_GENERATION)
+    logger.info(f'인기 주제 갱신 완료 (순위 변경: {changed})')
+    return {
+        'success': True,
+        'changed': changed,
+    }
+
+
+@shared_task(name='main.tasks.warm_page_cache_task')
+def warm_page_cache_task(force=True, workers=4):
+    """
+    페이지 캐시 예열 작업 (warm_cache 커맨드와 같은 경로)
+    
+    주기적으로 force=True로 실행하면 모든 페이지의 유지 시간이 갱신되어
+    같은 시각에 캐시된 페이지들이 한꺼번에 만료되어 방문자가 렌더링 비용을 내는 일을 막습니다.
+    
+    Returns:
+        dict: 예열 결과 정보
+    """
+    from main.cache_warmup import warm_page_cache
+    
+    results = warm_page_cache(workers=workers, force=force)
+    failed = [result.url for result in results if result.status == 'failed']
+    rendered = [result.seconds for result in results if result.status == 'warmed']
+    logger.info(f'페이지 캐시 예열 완료: {len(rendered)}개 렌더링, 실패 {len(failed)}개')
+    return {
+        'success': not failed,
+        'warmed': len(rendered),
+        'failed': failed,
+        'max_ms': round(max(rendered) * 1000, 1) if rendered else 0,
+    }
+
+
+@shared_task(name='main.tasks.export_static_pages_task')
+def export_static_pages_task(generations):
+    """
+    정적 사이트 페이지 갱신 작업 (main.static_site.schedule_export가 등록)
+    
+    settings.CELERY_TASK_ROUTES에서 broadcast 큐(static_site)로 보내므로
+    인스턴스마다 실행 중인 Celery 워커가 각자 로컬 STATIC_SITE_ROOT의 페이지를 다시 씁니다.
+    
+    Args:
+        generations: 바뀐 페이지 캐시 세대 이름 목록 (main.page_cache)
+    
+    Returns:
+        dict: {'written', 'unchanged', 'removed', 'missing'} 별 페이지 수
+    """
+    from main.static_site import export_generations
+    
+    results = export_generations(generations)
+    logger.info(f'정적 페이지 갱신 완료 ({", ".join(generations)}): {results}')
+    return results
@@ -1,3 +1,919 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import fakeredis
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from redis.crc import key_slot
+
+from main import utils, views
+from main.access_log import (
+    count_log_chunk,
+    count_spooled_unique,
+    iter_counted_requests,
+    parse_visitor_log_line,
+    plan_log_chunks,
+    topic_from_path,
+)
+from main.bloom import DailyBloomFilter
+from main.buffer import VisitorCountBuffer
+from main.circuit_breaker import CircuitBreaker, get_redis_circuit_breaker
+from main.classifier import VisitorRequestClassifier
+from main.management.commands.benchmark_visitor_classifier import LegacyClassifier, SAMPLE_REQUESTS
+from main.models import Category, Topic, VisitorHourlyStats, VisitorStats
+from main import page_cache
+from main.page_cache import POPULAR_GENERATION, current_page_cache_key, get_generations
+from main.sampling import VisitorSampler
+from main.static_site import export_generations, schedule_export
+from main.stats_cache import VisitorStatsCache
+from main.tasks import refresh_popular_topics_task
+
+
+# Redis 없이 페이지 캐시/세대 번호를 확인하는 테스트용 캐시
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# collectstatic 없이 페이지를 렌더링하는 테스트용 정적 파일 저장소 (매니페스트 불필요)
+PLAIN_STORAGES = {'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}
+
+
+class VisitorCountBufferTests(SimpleTestCase):
+    """반영에 실패한 버퍼 집계가 되돌려져 다음 반영에 합쳐지는지 확인"""
+
+    def setUp(self):
+        self.buffer = VisitorCountBuffer(flush_interval=3600, flush_max_events=1000, max_pending_ips=3)
+        self.buffer._thread = mock.Mock()  # 백그라운드 반영 스레드를 시작하지 않음
+        self.when = datetime(2024, 1, 15, 9, 30)
+
+    def flush(self, succeeded):
+        with mock.patch('main.utils.flush_visitor_counts', return_value=succeeded) as flush_visitor_counts:
+            result = self.buffer.flush()
+        return result, flush_visitor_counts.call_args[0][0] if flush_visitor_counts.called else None
+
+    def test_failed_flush_merges_back_into_next_flush(self):
+        self.buffer.add('10.0.0.1', when=self.when)
+        self.buffer.add('10.0.0.2', when=self.when, weight=4)
+        self.buffer.add_topic_view('python/intro', '10.0.0.1', when=self.when)
+
+        result, _ = self.flush(succeeded=False)
+        self.assertFalse(result)
+        self.assertTrue(self.buffer._retrying)
+
+        self.buffer.add('10.0.0.1', when=self.when)
+        result, pending = self.flush(succeeded=True)
+        self.assertTrue(result)
+        self.assertFalse(self.buffer._retrying)
+
+        counts = pending['2024-01-15']
+        self.assertEqual(counts.count, 6)
+        self.assertEqual(counts.visits, 6)
+        self.assertEqual((counts.sampled, counts.sampled_weight), (1, 4))
+        self.assertEqual(counts.minutes, {'0930': 6})
+        self.assertEqual(counts.ips, {'10.0.0.1', '10.0.0.2'})
+        self.assertEqual(counts.topics, {'python/intro': 1})
+        self.assertEqual(counts.topic_ips, {'python/intro': {'10.0.0.1'}})
+        self.assertEqual(self.buffer._pending, {})
+
+    def test_merge_back_keeps_ip_limit(self):
+        for ip_address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            self.buffer.add(ip_address, when=self.when)
+        self.flush(succeeded=False)
+
+        # 되돌린 IP로 한도가 찼으므로 새 IP는 버리고 접속자 수만 집계
+        self.buffer.add('10.0.0.4', when=self.when)
+        self.assertEqual(self.buffer.dropped_ips, 1)
+
+        _, pending = self.flush(succeeded=True)
+        self.assertEqual(pending['2024-01-15'].count, 4)
+        self.assertEqual(pending['2024-01-15'].ip_count, 3)
+
+
+class VisitorRequestClassifierTests(SimpleTestCase):
+    """분류기가 기존 VisitorCountMiddleware 판정(LegacyClassifier)과 같은 결과를 내는지 확인"""
+
+    BROWSER = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+    def test_matches_legacy_classifier(self):
+        paths = ('/', '/python/for/', '/admin/', '/static/css/style.css', '/api/visitors/stats/', '/apis/',
+                 '/healthz', '/sitemap.xml', '/.well-known/acme-challenge/x', '/debugging/')
+        user_agents = (self.BROWSER, '', 'Googlebot/2.1', 'ELB-HealthChecker/2.0', 'CURL/8.0', 'python-requests/2.31',
+                       'Mozilla/5.0 (compatible; YandexSpider)', 'kube-probe/1.29')
+        ip_addresses = ('203.0.113.10', '127.0.0.1', '10.1.2.3', '172.15.0.1', '172.16.0.1', '172.31.255.255',
+                        '172.32.0.1', '192.168.0.5', '192.169.0.5', '169.254.169.254', '2001:db8::1', 'unknown')
+        legacy = LegacyClassifier()
+        classifier = VisitorRequestClassifier()
+
+        requests = list(SAMPLE_REQUESTS)
+        requests += [(path, self.BROWSER, '203.0.113.10') for path in paths]
+        requests += [('/', user_agent, '203.0.113.10') for user_agent in user_agents]
+        requests += [('/', self.BROWSER, ip_address) for ip_address in ip_addresses]
+        for path, user_agent, ip_address in requests:
+            with self.subTest(path=path, user_agent=user_agent, ip_address=ip_address):
+                self.assertEqual(
+                    classifier.is_excluded(path, user_agent, ip_address),
+                    legacy.is_excluded(path, user_agent, ip_address),
+                )
+
+
+@override_settings(VISITOR_BLOOM_FILTER_ENABLED=False)
+class RedisTestCase(TestCase):
+    """main.utils의 Redis 연결을 fakeredis(+ lupa, requirements-dev.txt)로 바꾼 테스트 기반 클래스"""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch('main.utils.get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_redis_circuit_breaker()._reset_state()
+        utils._stats_redis_suspended_until = 0.0
+        self.today = utils.get_today_date_str()
+        self.daily_key = f'{utils.DAILY_VISITORS_KEY_PREFIX}{self.today}'
+
+
+class HistoricalTotalTests(RedisTestCase):
+    def test_historical_total_scripts(self):
+        yesterday = utils._historical_through_str()
+        VisitorStats.objects.create(date=date.fromisoformat(yesterday), visitor_count=9, unique_visitor_count=4)
+
+        self.assertEqual(utils.rebuild_historical_visitors_total(self.redis), 4)
+        self.assertEqual(utils.get_visitor_stats()['total'], 4)
+
+        # 합계에 이미 포함된 날짜만 증분 반영
+        utils.apply_historical_total_delta(yesterday, 3)
+        utils.apply_historical_total_delta(self.today, 100)
+        self.assertEqual(self.redis.hget(utils.HISTORICAL_TOTAL_KEY, 'total'), b'7')
+
+
+class VisitorStatsCacheTests(RedisTestCase):
+    """접속자 통계 API 마이크로 캐시와 조건부 요청"""
+
+    def setUp(self):
+        super().setUp()
+        self.stats_cache = VisitorStatsCache(ttl=60)
+        patcher = mock.patch('main.views.get_visitor_stats_cache', return_value=self.stats_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    def test_matching_etag_returns_304_without_redis(self):
+        self.redis.set(self.daily_key, 3)
+        response = views.visitor_stats(self.factory.get('/api/visitors/stats/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['today'], 3)
+        etag = response['ETag']
+
+        with mock.patch('main.utils.get_redis_connection', side_effect=AssertionError('Redis에 접근함')):
+            response = views.visitor_stats(self.factory.get('/api/visitors/stats/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_stale_etag_returns_current_body(self):
+        response = views.visitor_stats(self.factory.get('/api/visitors/stats/', HTTP_IF_NONE_MATCH='"outdated"'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.stats_cache.peek().etag)
+
+    def test_concurrent_async_misses_compute_once(self):
+        calls = []
+
+        async def aget_visitor_stats():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'today': len(calls)}
+
+        async def run():
+            return await asyncio.gather(*(self.stats_cache.aget() for _ in range(10)))
+
+        with mock.patch('main.stats_cache.aget_visitor_stats', aget_visitor_stats):
+            snapshots = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({snapshot.stats['today'] for snapshot in snapshots}, {1})
+
+
+class VisitorTimeseriesApiTests(RedisTestCase):
+    """분/시간 단위 시계열 API의 구간과 기간 검증"""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def get_series(self, **params):
+        return views.visitor_stats_series(self.factory.get('/api/visitors/series/', params))
+
+    def test_hourly_series_from_db_fills_empty_hours(self):
+        day = date.today() - timedelta(days=3)
+        VisitorHourlyStats.objects.create(date=day, hour=9, visitor_count=5, unique_visitor_count=2)
+
+        response = self.get_series(**{'from': day.isoformat(), 'to': day.isoformat()})
+
+        self.assertEqual(response.status_code, 200)
+        series = json.loads(response.content)['series']
+        self.assertEqual(len(series), 24)
+        self.assertEqual(series[0], {'time': f'{day.isoformat()}T00:00', 'visitors': 0, 'unique_visitors': 0})
+        self.assertEqual(series[9], {'time': f'{day.isoformat()}T09:00', 'visitors': 5, 'unique_visitors': 2})
+        self.assertEqual(sum(bucket['visitors'] for bucket in series), 5)
+
+    def test_minute_series_from_redis(self):
+        day = date.today() - timedelta(days=1)
+        self.redis.hset(f'{utils.VISITOR_TIMESERIES_KEY_PREFIX}{day.isoformat()}', mapping={'m:0930': 4, 'h:09': 4})
+
+        response = self.get_series(**{'from': day.isoformat(), 'to': day.isoformat(), 'resolution': 'minute'})
+
+        series = json.loads(response.content)['series']
+        self.assertEqual(len(series), 24 * 60)
+        self.assertEqual(series[9 * 60 + 30], {'time': f'{day.isoformat()}T09:30', 'visitors': 4})
+        self.assertEqual(sum(bucket['visitors'] for bucket in series), 4)
+
+    def test_invalid_ranges_are_rejected(self):
+        today = date.today()
+        cases = [
+            {'resolution': 'second'},
+            {'from': today.isoformat(), 'to': (today - timedelta(days=1)).isoformat()},
+            {'from': (today - timedelta(days=3)).isoformat(), 'to': today.isoformat(), 'resolution': 'minute'},
+            {'from': (today - timedelta(days=92)).isoformat(), 'to': today.isoformat()},
+            {'from': '2024-13-01'},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                response = self.get_series(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', json.loads(response.content))
+
+
+class VisitorStatsRangeApiTests(RedisTestCase):
+    """?from=&to= 기간 조회 API의 일별 결과와 기간 검증"""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def get_detail(self, **params):
+        return views.visitor_stats_detail(self.factory.get('/api/visitors/detail/', params))
+
+    def test_range_returns_one_entry_per_day(self):
+        start = date.today() - timedelta(days=6)
+        end = start + timedelta(days=2)
+        VisitorStats.objects.create(date=start, visitor_count=10, unique_visitor_count=4, visit_count=6)
+        VisitorStats.objects.create(date=end, visitor_count=7, unique_visitor_count=3, visit_count=5)
+
+        response = self.get_detail(**{'from': start.isoformat(), 'to': end.isoformat()})
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual((data['from'], data['to']), (start.isoformat(), end.isoformat()))
+        self.assertEqual(
+            [(day['date'], day['visitor_count'], day['unique_visitor_count']) for day in data['days']],
+            [(start.isoformat(), 10, 4), ((start + timedelta(days=1)).isoformat(), 0, 0), (end.isoformat(), 7, 3)],
+        )
+
+    def test_today_comes_from_redis(self):
+        self.redis.set(self.daily_key, 12)
+        VisitorStats.objects.create(date=date.today(), visitor_count=5, unique_visitor_count=1)
+
+        response = self.get_detail(to=self.today)
+
+        days = json.loads(response.content)['days']
+        self.assertEqual([(day['date'], day['visitor_count']) for day in days], [(self.today, 12)])
+
+    def test_invalid_ranges_are_rejected(self):
+        today = date.today()
+        cases = [
+            {'from': today.isoformat(), 'to': (today - timedelta(days=1)).isoformat()},
+            {'from': (today - timedelta(days=utils.VISITOR_STATS_RANGE_MAX_DAYS)).isoformat(), 'to': today.isoformat()},
+            {'from': 'yesterday'},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                response = self.get_detail(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', json.loads(response.content))
+
+
+class UpsertVisitorStatsTests(TestCase):
+    def setUp(self):
+        self.day = date(2024, 1, 15)
+        VisitorStats.objects.create(
+            date=self.day, visitor_count=100, unique_visitor_count=40, visit_count=70, sample_rate=0.5,
+        )
+
+    def stored(self):
+        return VisitorStats.objects.values_list(
+            'visitor_count', 'unique_visitor_count', 'visit_count', 'sample_rate',
+        ).get(date=self.day)
+
+    def test_unique_change_schedules_historical_delta(self):
+        row = VisitorStats(date=self.day, visitor_count=100, unique_visitor_count=45, visit_count=70)
+
+        with mock.patch('main.utils.apply_historical_total_delta') as apply_delta:
+            with self.captureOnCommitCallbacks(execute=True):
+                utils.upsert_visitor_stats([row], high_water_mark=True)
+
+        apply_delta.assert_called_once_with(self.day, 5)
+
+    def test_high_water_mark_keeps_larger_values(self):
+        row = VisitorStats(date=self.day, visitor_count=90, unique_visitor_count=50, visit_count=60, sample_rate=0.5)
+
+        written, previous = utils.upsert_visitor_stats([row], high_water_mark=True)
+
+        self.assertEqual(written, [row])
+        self.assertEqual(previous, {self.day: (100, 40, 70)})
+        self.assertEqual(self.stored(), (100, 50, 70, 0.5))
+
+    def test_high_water_mark_skips_smaller_rows(self):
+        new_day = date(2024, 1, 16)
+        rows = [
+            VisitorStats(date=self.day, visitor_count=80, unique_visitor_count=30, visit_count=50),
+            VisitorStats(date=new_day, visitor_count=5, unique_visitor_count=2, visit_count=5),
+        ]
+
+        written, _ = utils.upsert_visitor_stats(rows, high_water_mark=True)
+
+        self.assertEqual([row.date for row in written], [new_day])
+        self.assertEqual(self.stored(), (100, 40, 70, 0.5))
+        self.assertTrue(VisitorStats.objects.filter(date=new_day, visitor_count=5).exists())
+
+
+    def test_overwrite_with_update_fields_keeps_visit_count(self):
+        row = VisitorStats(date=self.day, visitor_count=80, unique_visitor_count=30, visit_count=80, sample_rate=1.0)
+
+        utils.upsert_visitor_stats(
+            [row], update_fields=['visitor_count', 'unique_visitor_count', 'sample_rate', 'updated_at'],
+        )
+
+        # 로그 백필 등 방문 쿠키 정보가 없는 쓰기는 방문 수를 바꾸지 않음
+        self.assertEqual(self.stored(), (80, 30, 70, 1.0))
+
+class PeriodicTaskRegistrationTests(TestCase):
+    def test_migration_registers_periodic_tasks(self):
+        from django_celery_beat.models import PeriodicTask
+
+        self.assertEqual(
+            set(PeriodicTask.objects.filter(enabled=True).values_list('task', flat=True)),
+            {
+                'main.tasks.sync_visitor_stats_task',
+                'main.tasks.sync_today_visitor_stats_task',
+                'main.tasks.refresh_popular_topics_task',
+                'main.tasks.warm_page_cache_task',
+            },
+        )
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch('main.circuit_breaker.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=10)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()  # 성공하면 연속 실패 횟수 초기화
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.now += 9.9
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_lets_one_probe_through(self):
+        self.open_breaker()
+        self.now += 10
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.metrics()['failures'], 0)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        self.open_breaker()
+        self.now += 10
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.now += 5
+        self.assertFalse(self.breaker.allow())
+        self.now += 5
+        self.assertTrue(self.breaker.allow())
+
+    def test_unreported_probe_is_retried(self):
+        self.open_breaker()
+        self.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+class CircuitBreakerFallbackTests(RedisTestCase):
+    def test_open_breaker_buffers_without_redis(self):
+        breaker = get_redis_circuit_breaker()
+        self.addCleanup(breaker._reset_state)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        with mock.patch('main.utils.get_redis_connection', side_effect=AssertionError('Redis에 접근함')), \
+                mock.patch('main.utils.get_visitor_buffer') as get_visitor_buffer:
+            self.assertIsNone(utils.increment_visitor_count('203.0.113.10'))
+
+        get_visitor_buffer.return_value.add.assert_called_once()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+class AccessLogTests(SimpleTestCase):
+    """nginx visitor_log 형식 해석과 주제 경로 판정"""
+
+    BROWSER = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0'
+
+    def line(self, path, status='200', user_agent=BROWSER, remote_addr='10.0.0.2', x_forwarded_for='203.0.113.7'):
+        return f'1705278600.123\t{remote_addr}\t{x_forwarded_for}\t{status}\t{path}\t{user_agent}\n'
+
+    def test_parse_line(self):
+        when, path, user_agent, ip_address, status = parse_visitor_log_line(
+            self.line('/python/for/?page=2', x_forwarded_for='203.0.113.7, 10.0.0.1')
+        )
+        self.assertEqual(when, datetime.fromtimestamp(1705278600.123))
+        self.assertEqual((path, user_agent, ip_address, status), ('/python/for/', self.BROWSER, '203.0.113.7', '200'))
+
+    def test_parse_line_with_missing_values(self):
+        parsed = parse_visitor_log_line(self.line('/', user_agent='-', x_forwarded_for='-', remote_addr='198.51.100.1'))
+        self.assertEqual(parsed[2:4], ('', '198.51.100.1'))
+
+    def test_parse_malformed_line(self):
+        self.assertIsNone(parse_visitor_log_line('not a visitor_log line\n'))
+        self.assertIsNone(parse_visitor_log_line(self.line('/').replace('1705278600.123', 'abc')))
+
+    def test_topic_from_path(self):
+        self.assertEqual(topic_from_path('/python/for/'), 'python/for')
+        self.assertEqual(topic_from_path('/linux/%EC%84%9C%EB%B2%84/'), 'linux/서버')
+        for path in ('/', '/python/', '/search/', '/api/visitors/stats/', '/python/for/extra/'):
+            with self.subTest(path=path):
+                self.assertIsNone(topic_from_path(path))
+
+    def test_iter_counted_requests(self):
+        lines = [
+            self.line('/python/for/'),
+            self.line('/python/missing/', status='404'),
+            self.line('/'),
+            self.line('/static/css/style.css'),
+            self.line('/python/for/', user_agent='Googlebot/2.1'),
+            self.line('/python/for/', x_forwarded_for='-'),  # 사설 IP
+            'garbage\n',
+        ]
+        self.assertEqual(
+            [(ip_address, topic) for _, ip_address, topic in iter_counted_requests(lines)],
+            [('203.0.113.7', 'python/for'), ('203.0.113.7', None), ('203.0.113.7', None)],
+        )
+
+
+class BackfillCountTests(SimpleTestCase):
+    """로그 구간 집계 결과를 파일로 내보내 병합해도 고유 접속자 수가 정확한지 확인"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.spool_dir = os.path.join(self.tmp, 'spool')
+        os.mkdir(self.spool_dir)
+
+    def write_log(self, name, visits):
+        path = os.path.join(self.tmp, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt') as log_file:
+            for when, ip_address in visits:
+                log_file.write(f'{when.timestamp():.3f}\t{ip_address}\t-\t200\t/\tMozilla/5.0 Chrome/120.0\n')
+        return path
+
+    def test_unique_count_across_chunks_and_files(self):
+        day1, day2 = datetime(2024, 1, 15, 9), datetime(2024, 1, 16, 9)
+        ip_addresses = ['203.0.113.1', '203.0.113.2', '2001:db8::1', '198.51.100.9', 'not-an-ip']
+        visits = [(day1 + timedelta(seconds=i), ip_addresses[i % len(ip_addresses)]) for i in range(200)]
+        visits += [(day2, '203.0.113.1'), (day2, '::ffff:203.0.113.1'), (day2, '10.0.0.1')]
+        plain = self.write_log('visitors.log', visits)
+        compressed = self.write_log('visitors.log.1.gz', [(day1, '192.0.2.77'), (day1, '203.0.113.2')])
+
+        chunks = plan_log_chunks([plain, compressed], chunk_bytes=1024)
+        self.assertGreater(len(chunks), 3)
+        days = {}
+        for chunk in chunks:
+            for day, (visitor_count, spool_path) in count_log_chunk(chunk, self.spool_dir).items():
+                counts = days.setdefault(day, [0, []])
+                counts[0] += visitor_count
+                counts[1].append(spool_path)
+
+        totals = {day: (visitor_count, count_spooled_unique(paths)) for day, (visitor_count, paths) in days.items()}
+        # IPv4와 IPv4-mapped IPv6 주소는 같은 접속자, 사설 IP는 제외
+        self.assertEqual(totals, {day1.date(): (202, 6), day2.date(): (2, 1)})
+
+
+class CounterShardKeyTests(SimpleTestCase):
+    def test_shards_share_slot_with_base_key(self):
+        with override_settings(VISITOR_COUNTER_SHARDS=8):
+            for key in ('visitors:daily:2024-01-15', 'visitors:visits:2024-01-15', utils.TOTAL_VISITORS_KEY):
+                keys = utils.get_counter_keys(key)
+                self.assertEqual(keys[0], key)
+                self.assertEqual(keys[3], f'{{{key}}}:2')
+                self.assertEqual({key_slot(k.encode()) for k in keys}, {key_slot(key.encode())})
+
+    def test_single_shard_uses_base_key(self):
+        with override_settings(VISITOR_COUNTER_SHARDS=1):
+            self.assertEqual(utils.get_counter_keys(utils.TOTAL_VISITORS_KEY), [utils.TOTAL_VISITORS_KEY])
+
+
+@override_settings(VISITOR_COUNTER_SHARDS=4)
+class CounterShardRedisTests(RedisTestCase):
+    """샤드 카운터 증가/합산과 합치기 Lua 스크립트"""
+
+    def test_increment_writes_shard_and_reads_sum(self):
+        self.redis.set(self.daily_key, 10)
+        utils.increment_visitor_count('10.0.0.1')
+        utils.increment_visitor_count('10.0.0.2')
+
+        self.assertEqual(self.redis.get(self.daily_key), b'10')
+        self.assertEqual(utils.get_daily_visitors_count(), 12)
+        stats = utils.get_visitor_stats()
+        self.assertEqual((stats['today'], stats['today_unique']), (12, 2))
+
+    def test_collapse_moves_shards_into_base_key(self):
+        self.redis.set(self.daily_key, 5)
+        self.redis.set(f'{{{self.daily_key}}}:1', 3)
+        self.redis.set(f'{{{self.daily_key}}}:3', 2)
+        self.redis.set(f'{{{utils.TOTAL_VISITORS_KEY}}}:0', 7)
+
+        collapsed = utils.collapse_counter_shards([self.today])
+
+        self.assertEqual(collapsed, 12)
+        self.assertEqual(self.redis.get(self.daily_key), b'10')
+        self.assertEqual(self.redis.get(utils.TOTAL_VISITORS_KEY), b'7')
+        self.assertEqual(self.redis.keys('{*}:*'), [])
+        self.assertGreater(self.redis.ttl(self.daily_key), 0)
+        self.assertEqual(utils.get_daily_visitors_count(), 10)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PopularTopicsTests(RedisTestCase):
+    """인기 주제 순위가 바뀔 때만 인기 주제 페이지 세대 번호를 올리는지 확인"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        category = Category.objects.create(name='Popular', slug='popular-test')
+        for slug in ('first', 'second'):
+            Topic.objects.create(category=category, title=slug.title(), slug=slug)
+        patcher = mock.patch('main.static_site.schedule_export')
+        self.schedule_export = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def add_views(self, topic, count):
+        self.redis.zincrby(f'{utils.TOPIC_VIEWS_KEY_PREFIX}{self.today}', count, f'popular-test/{topic}')
+
+    def refresh(self):
+        return refresh_popular_topics_task()['changed']
+
+    def generation(self):
+        return get_generations([POPULAR_GENERATION])[0]
+
+    def ranking(self):
+        return [(topic['slug'], topic['views']) for topic in utils.get_popular_topics()]
+
+    def test_ranking_change_bumps_generation(self):
+        self.add_views('first', 5)
+        self.add_views('second', 3)
+        generation = self.generation()
+
+        self.assertTrue(self.refresh())
+        self.assertEqual(self.ranking(), [('first', 5), ('second', 3)])
+        self.assertGreater(self.generation(), generation)
+
+        # 조회수만 바뀌고 순위가 같으면 목록만 갱신
+        generation = self.generation()
+        self.add_views('first', 1)
+        self.assertFalse(self.refresh())
+        self.assertEqual(self.ranking(), [('first', 6), ('second', 3)])
+        self.assertEqual(self.generation(), generation)
+
+        self.add_views('second', 10)
+        self.assertTrue(self.refresh())
+        self.assertEqual(self.ranking(), [('second', 13), ('first', 6)])
+        self.assertGreater(self.generation(), generation)
+        self.assertEqual(self.schedule_export.call_args_list, [mock.call(POPULAR_GENERATION)] * 2)
+
+    def test_redis_failure_keeps_list(self):
+        self.add_views('first', 5)
+        self.refresh()
+        generation = self.generation()
+
+        with mock.patch('main.utils.get_redis_connection', side_effect=ConnectionError):
+            self.assertFalse(self.refresh())
+        self.assertEqual(self.ranking(), [('first', 5)])
+        self.assertEqual(self.generation(), generation)
+
+
+class DailyBloomFilterTests(SimpleTestCase):
+    def setUp(self):
+        self.bloom = DailyBloomFilter(capacity=1000, error_rate=0.01)
+        self.known = [f'203.0.113.{i % 256}/{i}' for i in range(1000)]
+        self.bloom.update('2024-01-15', self.known)
+
+    def test_known_items_are_filtered(self):
+        self.assertEqual(self.bloom.unseen('2024-01-15', self.known), [])
+        # 기록 중 거짓 양성으로 이미 있다고 판단된 항목은 세지 않음
+        self.assertGreaterEqual(self.bloom.metrics()['items'], 990)
+
+    def test_false_positive_rate_within_bounds(self):
+        candidates = [f'198.51.100.{i % 256}/{i}' for i in range(20000)]
+        false_positives = len(candidates) - len(self.bloom.unseen('2024-01-15', candidates))
+
+        self.assertLessEqual(false_positives / len(candidates), 0.01 * 1.5)
+        self.assertAlmostEqual(self.bloom.estimated_error_rate, 0.01, delta=0.002)
+
+    def test_new_day_resets_and_past_day_bypasses(self):
+        self.assertEqual(self.bloom.unseen('2024-01-14', self.known[:3]), self.known[:3])
+        self.assertEqual(self.bloom.metrics()['date'], '2024-01-15')
+
+        self.assertEqual(self.bloom.unseen('2024-01-16', self.known[:3]), self.known[:3])
+        self.assertEqual(self.bloom.metrics()['items'], 0)
+
+
+class VisitorSamplerTests(SimpleTestCase):
+    def test_weights_sum_to_true_count(self):
+        sampler = VisitorSampler(sample_rate=0.25)
+        with mock.patch('main.sampling.random.randrange', side_effect=itertools.cycle(range(4))):
+            weights = [sampler.sample() for _ in range(400)]
+
+        self.assertEqual(sum(weights), 400)
+        self.assertEqual(sum(1 for weight in weights if weight), 100)
+
+    def test_random_weights_are_unbiased(self):
+        state = random.getstate()
+        self.addCleanup(random.setstate, state)
+        random.seed(20240115)
+        sampler = VisitorSampler(sample_rate=0.1)
+
+        total = sum(sampler.sample() for _ in range(100000))
+
+        self.assertAlmostEqual(total / 100000, 1, delta=0.03)
+
+    def test_adaptive_interval_follows_latency(self):
+        sampler = VisitorSampler(sample_rate=1.0, adaptive=True, slow_ms=50, min_sample_rate=0.25)
+        with mock.patch('main.sampling.time.monotonic', side_effect=itertools.count(10, 2)):
+            for _ in range(5):
+                sampler.observe(0.2)
+            self.assertEqual(sampler.interval, 4)
+            for _ in range(30):
+                sampler.observe(0.001)
+            self.assertEqual(sampler.interval, 1)
+
+
+class SampledCountTests(RedisTestCase):
+    def test_sampled_weight_is_counted_and_recorded(self):
+        utils.increment_visitor_count('203.0.113.1', weight=4)
+        utils.increment_visitor_count('203.0.113.2')
+
+        self.assertEqual(utils.get_daily_visitors_count(), 5)
+        self.assertEqual(
+            self.redis.hgetall(f'{utils.VISITOR_SAMPLING_KEY_PREFIX}{self.today}'),
+            {b'requests': b'1', b'weight': b'4'},
+        )
+        # 실제로 반영한 요청은 5건 중 2건
+        today = date.fromisoformat(self.today)
+        self.assertEqual(utils.get_visitor_stats_range(today, today)[0]['sample_rate'], 0.4)
+
+
+class PageRenderLockTests(SimpleTestCase):
+    """렌더링 락은 자신이 잡은 락만 해제"""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch('main.page_cache.get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.lock_key = 'page:index:::1.2.3:lock'
+
+    def test_lock_is_exclusive(self):
+        token = page_cache._acquire_lock(self.lock_key)
+        self.assertIsNotNone(token)
+        self.assertIsNone(page_cache._acquire_lock(self.lock_key))
+
+        page_cache._release_lock(self.lock_key, token)
+        self.assertIsNotNone(page_cache._acquire_lock(self.lock_key))
+
+    def test_expired_lock_does_not_release_new_owner(self):
+        token = page_cache._acquire_lock(self.lock_key)
+        # 렌더링이 락 만료 시간보다 오래 걸려 다른 워커가 락을 새로 잡은 상황
+        self.redis.delete(cache.make_key(self.lock_key))
+        other_token = page_cache._acquire_lock(self.lock_key)
+
+        page_cache._release_lock(self.lock_key, token)
+
+        self.assertEqual(self.redis.get(cache.make_key(self.lock_key)), other_token.encode())
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STATIC_URL='/static/')
+class TopicRenderingTests(TestCase):
+    """Topic 저장 시 본문 해시가 바뀐 경우에만 rendered_html을 다시 만드는지 확인"""
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Render', slug='render-test')
+        self.topic = Topic.objects.create(
+            category=self.category, title='Intro', slug='intro', content='<img src="/static/img/a.png">',
+        )
+
+    def test_save_renders_content(self):
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.rendered_html, '<img src="/static/img/a.png">')
+        self.assertEqual(len(self.topic.content_hash), 64)
+
+    def test_content_change_rerenders_with_update_fields(self):
+        self.topic.content = '<a href="/static/doc.pdf">doc</a>'
+        self.topic.save(update_fields=['content'])
+
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.rendered_html, '<a href="/static/doc.pdf">doc</a>')
+
+    def test_unchanged_content_is_not_rerendered(self):
+        self.topic.title = 'Introduction'
+        with mock.patch('main.models.render_topic_html') as render_topic_html:
+            self.topic.save()
+            self.topic.save(update_fields=['title'])
+        render_topic_html.assert_not_called()
+
+    def test_static_url_change_rerenders(self):
+        with override_settings(STATIC_URL='https://cdn.example.com/static/'):
+            self.assertTrue(self.topic.render_content())
+            self.assertFalse(self.topic.render_content())
+        self.assertEqual(self.topic.rendered_html, '<img src="https://cdn.example.com/static/img/a.png">')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STORAGES=PLAIN_STORAGES, STATIC_SITE_EXPORT_ENABLED=True)
+class StaticSiteExportTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name) / 'static_site'
+        settings_override = override_settings(STATIC_SITE_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+        category = Category.objects.create(name='Export', slug='export-test')
+        self.topic = Topic.objects.create(category=category, title='Intro', slug='intro', content='<p>본문</p>')
+
+    def exported_files(self):
+        return sorted(str(path.relative_to(self.root)) for path in self.root.rglob('*') if path.is_file())
+
+    def test_export_writes_pages_and_gzip(self):
+        call_command('export_static_site', stdout=StringIO())
+
+        self.assertEqual(self.exported_files(), [
+            'export-test/index.html',
+            'export-test/index.html.gz',
+            'export-test/intro/index.html',
+            'export-test/intro/index.html.gz',
+            'index.html',
+            'index.html.gz',
+        ])
+        html = (self.root / 'export-test/intro/index.html').read_bytes()
+        self.assertIn('<p>본문</p>'.encode(), html)
+        self.assertEqual(gzip.decompress((self.root / 'export-test/intro/index.html.gz').read_bytes()), html)
+
+        results = export_generations(['global'])
+        self.assertEqual((results['written'], results['unchanged']), (0, 3))
+
+    def test_deleted_topic_file_is_removed(self):
+        call_command('export_static_site', stdout=StringIO())
+        self.topic.delete()
+
+        export_generations(['category:export-test'])
+
+        self.assertFalse((self.root / 'export-test/intro').exists())
+        self.assertTrue((self.root / 'export-test/index.html').exists())
+
+    def test_schedule_export_enqueues_after_commit(self):
+        with mock.patch('main.tasks.export_static_pages_task.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_export('topic:export-test/intro', 'topic:export-test/intro')
+        delay.assert_called_once_with(['topic:export-test/intro'])
+
+    def test_disabled_export_clears_files(self):
+        call_command('export_static_site', stdout=StringIO())
+
+        with override_settings(STATIC_SITE_EXPORT_ENABLED=False):
+            call_command('export_static_site', stdout=StringIO())
+
+        self.assertFalse(self.root.exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STORAGES=PLAIN_STORAGES)
+class WarmCacheTests(TransactionTestCase):
+    """warm_cache 커맨드가 모든 페이지의 현재 세대 키를 채우는지 확인 (스레드 풀이 커밋된 데이터를 읽도록 TransactionTestCase)"""
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Warm', slug='warm-test')
+        Topic.objects.create(category=category, title='Intro', slug='intro', content='<p>본문</p>')
+        self.pages = [('index', None, None), ('tutorial', 'warm-test', None), ('topic_detail', 'warm-test', 'intro')]
+        patcher = mock.patch('main.tasks.refresh_popular_topics_task')
+        self.refresh_popular_topics_task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def warm(self, *args):
+        out = StringIO()
+        call_command('warm_cache', '--workers', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_warm_cache_fills_every_page(self):
+        output = self.warm()
+
+        self.assertIn('예열 3개', output)
+        for page in self.pages:
+            with self.subTest(page=page):
+                self.assertIsNotNone(cache.get(current_page_cache_key(*page)))
+        # 인기 주제 목록이 비어 있으면 렌더링 전에 먼저 계산
+        self.refresh_popular_topics_task.assert_called_once_with()
+
+    def test_cached_pages_are_skipped_unless_forced(self):
+        self.warm()
+        self.assertIn('이미 캐시됨 3개', self.warm())
+        self.assertIn('예열 3개', self.warm('--force'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PAGE_CACHE_TTL_JITTER=0.2)
+class PageCacheStampedeTests(SimpleTestCase):
+    """유지 시간 분산과 동시 미스의 단일 렌더링 확인 (LocMem 캐시에서는 cache.add 락 사용)"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_jittered_timeout_stays_within_bounds(self):
+        for _ in range(1000):
+            self.assertTrue(800 <= page_cache._jittered(1000) <= 1000)
+        with mock.patch('main.page_cache.random.uniform', return_value=0.2):
+            self.assertEqual(page_cache._jittered(1000), 800)
+        # 아주 짧은 유지 시간도 0(만료 없음)이 되지 않음
+        self.assertEqual(page_cache._jittered(1), 1)
+
+    def test_concurrent_misses_render_once(self):
+        renders = []
+        workers = 8
+        barrier = threading.Barrier(workers)
+
+        @page_cache.versioned_cache_page('index', 60)
+        def view(request):
+            renders.append(threading.get_ident())
+            time.sleep(0.2)
+            return HttpResponse('본문')
+
+        responses = []
+
+        def request_page():
+            barrier.wait()
+            responses.append(view(RequestFactory().get('/')))
+
+        threads = [threading.Thread(target=request_page) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(renders), 1)
+        self.assertEqual([response.content.decode() for response in responses], ['본문'] * workers)
+        self.assertIsNotNone(cache.get(current_page_cache_key('index')))
+
+    def test_other_worker_holding_lock_serves_stale_page(self):
+        key = current_page_cache_key('index')
+        cache.set(page_cache.stale_page_cache_key(key), (b'old', 'text/html'))
+        # 다른 워커가 렌더링 중인 상황
+        cache.add(key + page_cache.LOCK_KEY_SUFFIX, 'other-token')
+        render = mock.Mock()
+
+        payload, response = page_cache._render_single_flight(key, 60, render)
+
+        self.assertEqual(payload, (b'old', 'text/html'))
+        self.assertIsNone(response)
+        render.assert_not_called()
@@ -1,13 +1,28 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# ASGI(uvicorn) 배포에서는 비동기 뷰를 사용해 sync_to_async 스레드 전환을 피함
+# WSGI(gunicorn)에서는 요청마다 이벤트 루프를 만들지 않도록 동기 뷰를 사용
+if getattr(settings, 'VISITOR_STATS_ASYNC_VIEWS', False):
+    visitor_stats_view = views.avisitor_stats
+    visitor_stats_detail_view = views.avisitor_stats_detail
+    visitor_stats_stream_view = views.avisitor_stats_stream
+else:
+    visitor_stats_view = views.visitor_stats
+    visitor_stats_detail_view = views.visitor_stats_detail
+    visitor_stats_stream_view = views.visitor_stats_stream
+
 urlpatterns = [
     path('', views.index, name='index'),
     path('search/', views.search, name='search'),
     path('<str:category>/', views.tutorial, name='tutorial'),
     path('<str:category>/<str:topic>/', views.topic_detail, name='topic_detail'),
     # 접속자 수 통계 API
-    path('api/visitors/stats/', views.visitor_stats, name='visitor_stats'),
-    path('api/visitors/detail/', views.visitor_stats_detail, name='visitor_stats_detail'),
+    path('api/visitors/stats/', visitor_stats_view, name='visitor_stats'),
+    path('api/visitors/detail/', visitor_stats_detail_view, name='visitor_stats_detail'),
+    path('api/visitors/stream/', visitor_stats_stream_view, name='visitor_stats_stream'),
+    path('api/visitors/series/', views.visitor_stats_series, name='visitor_stats_series'),
+    path('api/visitors/status/', views.visitor_counting_status, name='visitor_counting_status'),
 ]
 
@@ -1,25 +1,121 @@
 """
 접속자 수 추적을 위한 Redis 유틸리티 함수들
+
+a로 시작하는 함수(aincrement_visitor_count, aget_visitor_stats 등)는
+ASGI 배포에서 redis.asyncio 클라이언트와 비동기 ORM을 사용하는 비동기 버전입니다.
 """
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from django.conf import settings
-from django.db import models
+from django.db import connection, models, transaction
 from django_redis import get_redis_connection
+import asyncio
 import logging
+import os
+import time
+import weakref
+
+import redis.asyncio as aioredis
+
+from .bloom import get_visitor_bloom_filter
+from .buffer import PendingVisitorCounts, get_visitor_buffer
+from .circuit_breaker import get_redis_circuit_breaker
+from .sampling import get_visitor_sampler
 
 logger = logging.getLogger(__name__)
 
 # Redis 키 패턴
-TODAY_VISITORS_KEY = 'visitors:today'  # 오늘 접속자 수
 TOTAL_VISITORS_KEY = 'visitors:total'  # 누적 접속자 수
-DAILY_VISITORS_KEY_PREFIX = 'visitors:daily:'  # 일별 접속자 수 (예: visitors:daily:2024-01-01)
+DAILY_VISITORS_KEY_PREFIX = 'visitors:daily:'  # 일별 접속자 수(페이지뷰) (예: visitors:daily:2024-01-01)
+DAILY_VISITS_KEY_PREFIX = 'visitors:visits:'  # 일별 방문 수 (방문 쿠키 기준, 예: visitors:visits:2024-01-01)
+VISITOR_SAMPLING_KEY_PREFIX = 'visitors:sampling:'  # 일별 표본 집계 기록 (해시: requests=표본 요청 수, weight=가중치 합계)
 VISITOR_SET_KEY_PREFIX = 'visitors:set:'  # 일별 접속자 집합 (중복 제거용)
+VISITOR_HLL_KEY_PREFIX = 'visitors:hll:'  # 일별 접속자 HyperLogLog (중복 제거용, 하루 약 12KB)
+VISITOR_WEEKLY_KEY_PREFIX = 'visitors:weekly:'  # 주별 고유 접속자 병합 결과 (예: visitors:weekly:hll:2024-W01)
+VISITOR_MONTHLY_KEY_PREFIX = 'visitors:monthly:'  # 월별 고유 접속자 병합 결과 (예: visitors:monthly:hll:2024-01)
+HISTORICAL_TOTAL_KEY = 'visitors:total:historical'  # 어제까지의 누적 고유 접속자 수 (해시: through, total)
+VISITOR_TIMESERIES_KEY_PREFIX = 'visitors:ts:'  # 일별 시계열 해시 (필드 m:HHMM=분별, h:HH=시간별 접속자 수)
+VISITOR_HOURLY_UNIQUE_KEY_PREFIX = 'visitors:ts:uniq:'  # 시간별 고유 접속자 HyperLogLog (예: visitors:ts:uniq:2024-01-01:09)
+VISITOR_UPDATES_CHANNEL = 'visitors:updates'  # 접속자 수 변경 알림 pub/sub 채널 (main.streams 구독)
+TOPIC_VIEWS_KEY_PREFIX = 'topics:views:'  # 일별 주제 조회수 정렬 집합 (멤버: 카테고리/주제, 예: topics:views:2024-01-01)
+TOPIC_READERS_KEY_PREFIX = 'topics:readers:'  # 일별 주제별 고유 독자 HyperLogLog (예: topics:readers:2024-01-01:python/intro)
+POPULAR_TOPICS_KEY = 'topics:popular:weekly'  # 최근 7일 조회수 합계 (ZUNIONSTORE 결과)
+
+# 인기 주제 목록 (Django 캐시 키, 최근 7일 기준, 상위 후보 수)
+POPULAR_TOPICS_CACHE_KEY = 'main:popular_topics'
+POPULAR_TOPICS_RANKING_CACHE_KEY = 'main:popular_topics:ranking'  # 페이지 캐시 무효화 판단용 순위 (카테고리, 주제) 목록
+POPULAR_TOPICS_DAYS = 7
+POPULAR_TOPICS_CANDIDATES = 50
+
+# Redis 통계 조회를 건너뛰고 DB에서만 조회할 시각 (time.monotonic 기준, 워커 프로세스별)
+_stats_redis_suspended_until = 0.0
+
+# 고유 접속자 집계 방식
+UNIQUE_BACKEND_SET = 'set'  # SADD/SCARD - 정확하지만 IP 수에 비례해 메모리 사용
+UNIQUE_BACKEND_HLL = 'hll'  # PFADD/PFCOUNT - 표준 오차 0.81%, 키당 최대 약 12KB
+
+# 시계열 조회 단위와 한 번에 조회할 수 있는 최대 기간(일)
+TIMESERIES_RESOLUTION_MINUTE = 'minute'  # Redis에만 보관 (VISITOR_KEY_TTL 동안)
+TIMESERIES_RESOLUTION_HOUR = 'hour'  # Redis + MariaDB(VisitorHourlyStats)
+TIMESERIES_MAX_DAYS = {
+    TIMESERIES_RESOLUTION_MINUTE: 3,
+    TIMESERIES_RESOLUTION_HOUR: 92,
+}
+
+VISITOR_STATS_RANGE_MAX_DAYS = 366  # 일별 통계 기간 조회 최대 일수
+DAILY_STATS_READS_PER_DAY = 4  # 날짜별 일별 통계 조회 명령 수 (_queue_daily_stats_reads)
+
+VISITOR_KEY_TTL = 60 * 60 * 24 * 30  # 일별 키 만료 시간 (30일)
+MERGED_UNIQUE_KEY_TTL = 60 * 10  # 주별/월별 병합 결과 캐시 시간 (10분)
+
+# 누적 합계 저장 (through가 기존 값보다 최신일 때만 덮어써 동시 재계산 시 역행 방지)
+STORE_HISTORICAL_TOTAL_SCRIPT = """
+local through = redis.call('HGET', KEYS[1], 'through')
+if (not through) or through < ARGV[1] then
+    redis.call('HSET', KEYS[1], 'through', ARGV[1], 'total', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# 누적 합계 증분 반영 (이미 합계에 포함된 날짜(through 이하)가 변경된 경우에만 반영)
+APPLY_HISTORICAL_TOTAL_DELTA_SCRIPT = """
+local through = redis.call('HGET', KEYS[1], 'through')
+if through and through >= ARGV[1] then
+    return redis.call('HINCRBY', KEYS[1], 'total', ARGV[2])
+end
+return false
+"""
+
+
+# 카운터 샤드를 기본 키로 합침 (샤드 값을 읽고 지운 뒤 기본 키에 더함, 원자적으로 실행)
+# KEYS: 기본 키, 샤드 키...(모두 같은 슬롯, _counter_shard_key 참고) / ARGV: 기본 키 만료 시간(초, 0이면 설정하지 않음)
+COLLAPSE_COUNTER_SHARDS_SCRIPT = """
+local collapsed = 0
+for i = 2, #KEYS do
+    local value = redis.call('GET', KEYS[i])
+    if value then
+        collapsed = collapsed + tonumber(value)
+        redis.call('DEL', KEYS[i])
+    end
+end
+if collapsed > 0 then
+    redis.call('INCRBY', KEYS[1], collapsed)
+    if tonumber(ARGV[1]) > 0 then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+end
+return collapsed
+"""
 
 
 def get_redis_client():
     """
     Redis 클라이언트 연결 반환
+    
+    서킷 브레이커가 열려 있으면(연속 실패 후 재시도 대기 중) 타임아웃을 기다리지 않도록 None을 반환합니다.
     """
+    if not get_redis_circuit_breaker().allow():
+        return None
     try:
         return get_redis_connection('default')
     except Exception as e:
@@ -27,6 +123,21 @@ def get_redis_client():
         return None
 
 
+def _get_script(redis_client, source):
+    """
+    Lua 스크립트 객체를 반환합니다 (EVALSHA 사용, 서버에 없으면 자동으로 EVAL).
+    클라이언트 종류(동기/비동기)별로 한 번만 생성해 재사용합니다.
+    """
+    cache_key = (type(redis_client), source)
+    script = _scripts.get(cache_key)
+    if script is None:
+        script = _scripts[cache_key] = redis_client.register_script(source)
+    return script
+
+
+_scripts = {}
+
+
 def get_today_date_str():
     """
     오늘 날짜를 YYYY-MM-DD 형식 문자열로 반환
@@ -34,71 +145,324 @@ def get_today_date_str():
     return date.today().strftime('%Y-%m-%d')
 
 
-def increment_visitor_count(ip_address=None, user_agent=None):
+def get_unique_backend():
+    """
+    현재 고유 접속자 집계 방식을 반환합니다 (settings.VISITOR_UNIQUE_BACKEND).
+    
+    Returns:
+        str: UNIQUE_BACKEND_SET 또는 UNIQUE_BACKEND_HLL
+    """
+    backend = getattr(settings, 'VISITOR_UNIQUE_BACKEND', UNIQUE_BACKEND_SET)
+    return UNIQUE_BACKEND_HLL if backend == UNIQUE_BACKEND_HLL else UNIQUE_BACKEND_SET
+
+
+def get_unique_visitors_key(date_str):
+    """
+    현재 집계 방식에 맞는 일별 고유 접속자 키를 반환합니다.
+    """
+    if get_unique_backend() == UNIQUE_BACKEND_HLL:
+        return f"{VISITOR_HLL_KEY_PREFIX}{date_str}"
+    return f"{VISITOR_SET_KEY_PREFIX}{date_str}"
+
+
+def get_counter_shards():
+    """
+    접속자 수 카운터 샤드 수 (settings.VISITOR_COUNTER_SHARDS, 1이면 샤딩하지 않음)
+    """
+    return max(1, int(getattr(settings, 'VISITOR_COUNTER_SHARDS', 1)))
+
+
+def _counter_shard_key(key, shard):
+    """
+    카운터 샤드 키 (예: {visitors:daily:2024-01-01}:3)
+    
+    기본 키 전체를 해시 태그로 감싸 Redis Cluster에서 한 카운터의 샤드가 모두 기본 키와 같은 슬롯에
+    놓이므로, 샤드를 합산하는 MGET과 합치는 Lua 스크립트(COLLAPSE_COUNTER_SHARDS_SCRIPT)를 한 노드에서 실행할 수 있습니다.
+    """
+    return f"{{{key}}}:{shard}"
+
+
+def _counter_write_key(key):
+    """현재 프로세스가 증가시킬 카운터 키 (워커 PID로 샤드 선택)"""
+    shards = get_counter_shards()
+    if shards == 1:
+        return key
+    return _counter_shard_key(key, os.getpid() % shards)
+
+
+def get_counter_keys(key):
+    """
+    카운터 값을 읽을 때 합산할 키 목록
+    
+    샤드 값은 동기화 작업이 기본 키로 합치므로(collapse_counter_shards) 기본 키도 항상 포함합니다.
+    """
+    shards = get_counter_shards()
+    if shards == 1:
+        return [key]
+    return [key] + [_counter_shard_key(key, shard) for shard in range(shards)]
+
+
+def _sum_counter_values(values):
+    """GET/MGET 결과를 합산 (모든 키가 없으면 None)"""
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    present = [int(value) for value in values if value is not None]
+    return sum(present) if present else None
+
+
+def collapse_counter_shards(date_strs):
+    """
+    일별/누적 카운터 샤드를 기본 키로 합칩니다 (동기화 작업에서 호출).
+    
+    Args:
+        date_strs: 합칠 날짜 목록 (YYYY-MM-DD)
+    
+    Returns:
+        int: 합친 접속자 수
+    """
+    if get_counter_shards() == 1:
+        return 0
+    
+    redis_client = get_redis_client()
+    if not redis_client:
+        return 0
+    
+    try:
+        script = _get_script(redis_client, COLLAPSE_COUNTER_SHARDS_SCRIPT)
+        pipe = redis_client.pipeline(transaction=False)
+        for date_str in date_strs:
+            script(keys=get_counter_keys(f"{DAILY_VISITORS_KEY_PREFIX}{date_str}"), args=[VISITOR_KEY_TTL], client=pipe)
+            script(keys=get_counter_keys(f"{DAILY_VISITS_KEY_PREFIX}{date_str}"), args=[VISITOR_KEY_TTL], client=pipe)
+        script(keys=get_counter_keys(TOTAL_VISITORS_KEY), args=[0], client=pipe)
+        return sum(pipe.execute())
+    except Exception as e:
+        logger.error(f"카운터 샤드 합치기 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        return 0
+
+
+def _to_date_str(target_date):
+    """date 객체, YYYY-MM-DD 문자열 또는 None(오늘)을 YYYY-MM-DD 문자열로 변환"""
+    if target_date is None:
+        return get_today_date_str()
+    if isinstance(target_date, date):
+        return target_date.strftime('%Y-%m-%d')
+    return str(target_date)
+
+
+def _count_unique_visitors(redis_client, key):
+    """현재 집계 방식에 맞는 명령(PFCOUNT/SCARD)으로 고유 접속자 수를 조회"""
+    if get_unique_backend() == UNIQUE_BACKEND_HLL:
+        return redis_client.pfcount(key)
+    return redis_client.scard(key)
+
+
+def increment_visitor_count(ip_address=None, user_agent=None, weight=1):
     """
     접속자 수를 증가시킵니다.
     
     Args:
         ip_address: 접속자의 IP 주소 (중복 제거용)
         user_agent: 접속자의 User-Agent (선택사항)
+        weight: 표본 집계 가중치 (main.sampling, N건 중 1건을 반영하면 N)
     
     Returns:
         tuple: (오늘 접속자 수, 누적 접속자 수) 또는 None (Redis 연결 실패 시)
+    
+    Redis에 반영하지 못한 접속은 워커별 버퍼에 보관했다가 Redis가 복구되면 반영합니다.
     """
+    now = datetime.now()
     redis_client = get_redis_client()
     if not redis_client:
+        get_visitor_buffer().add(ip_address, when=now, weight=weight)
         return None
     
     try:
-        today = get_today_date_str()
-        daily_key = f"{DAILY_VISITORS_KEY_PREFIX}{today}"
-        visitor_set_key = f"{VISITOR_SET_KEY_PREFIX}{today}"
-        
-        pipe = redis_client.pipeline()
-        
-        # 오늘 날짜 키에 1 증가 (일별 접속자 수)
-        pipe.incr(daily_key)
-        pipe.expire(daily_key, 60 * 60 * 24 * 30)  # 30일 후 만료
-        
-        # 누적 접속자 수 증가
-        pipe.incr(TOTAL_VISITORS_KEY)
-        
-        # IP 주소를 세트에 추가하여 중복 접속자 제거 (같은 IP는 하루에 한 번만 카운트)
-        if ip_address:
-            pipe.sadd(visitor_set_key, ip_address)
-            pipe.expire(visitor_set_key, 60 * 60 * 24 * 30)  # 30일 후 만료
-        
+        # 슬롯이 다른 키를 함께 증가시키므로 MULTI 없이 전송 (Redis Cluster에서 CROSSSLOT 방지)
+        pipe = redis_client.pipeline(transaction=False)
+        seen = []
+        date_str = now.strftime('%Y-%m-%d')
+        _queue_visitor_counts(pipe, date_str, _single_visit(now, ip_address, weight), seen)
+        # 실시간 스트림 구독자(워커별 허브)에게 변경 알림 (결과 인덱스가 바뀌지 않도록 마지막에 추가)
+        pipe.publish(VISITOR_UPDATES_CHANNEL, date_str)
+        started = time.perf_counter()
         results = pipe.execute()
+        get_visitor_sampler().observe(time.perf_counter() - started)
+        get_redis_circuit_breaker().record_success()
+        _mark_seen(seen)
         
-        today_count = results[0]  # daily_key의 증가된 값
-        total_count = results[1]  # TOTAL_VISITORS_KEY의 증가된 값
+        today_count = results[0]  # daily_key의 증가된 값 (샤딩 시 이 워커 샤드의 값)
+        total_count = results[2]  # TOTAL_VISITORS_KEY의 증가된 값 (샤딩 시 이 워커 샤드의 값)
         
         return today_count, total_count
         
     except Exception as e:
         logger.error(f"접속자 수 증가 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        get_visitor_buffer().add(ip_address, when=now, weight=weight)
         return None
 
 
-def get_today_visitors_count():
+def flush_visitor_counts(pending):
     """
-    오늘 접속자 수를 반환합니다.
+    버퍼에 모인 접속자 수를 하나의 파이프라인으로 Redis에 반영합니다.
+    
+    Args:
+        pending: {날짜 문자열: PendingVisitorCounts} 딕셔너리 (main.buffer 참고)
     
     Returns:
-        int: 오늘 접속자 수, Redis 연결 실패 시 0
+        bool: 반영 성공 여부
     """
     redis_client = get_redis_client()
     if not redis_client:
-        return 0
+        return False
     
     try:
-        today = get_today_date_str()
-        daily_key = f"{DAILY_VISITORS_KEY_PREFIX}{today}"
-        count = redis_client.get(daily_key)
-        return int(count) if count else 0
+        pipe = redis_client.pipeline(transaction=False)
+        seen = []
+        for date_str, counts in pending.items():
+            # 주제 조회만 모인 날짜는 접속자 수 명령을 보내지 않음
+            if counts.count:
+                _queue_visitor_counts(pipe, date_str, counts, seen)
+            _queue_topic_views(pipe, date_str, counts)
+        # 실시간 스트림 구독자(워커별 허브)에게 변경 알림
+        pipe.publish(VISITOR_UPDATES_CHANNEL, get_today_date_str())
+        started = time.perf_counter()
+        pipe.execute()
+        get_visitor_sampler().observe(time.perf_counter() - started)
+        get_redis_circuit_breaker().record_success()
+        _mark_seen(seen)
+        return True
     except Exception as e:
-        logger.error(f"오늘 접속자 수 조회 실패: {e}")
-        return 0
+        logger.error(f"접속자 수 일괄 반영 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        return False
+
+
+def _queue_visitor_counts(pipe, date_str, counts, seen=None):
+    """
+    접속자 수 증가 명령을 파이프라인에 추가합니다.
+    
+    단건 증가(increment_visitor_count)와 버퍼 일괄 반영(flush_visitor_counts)이
+    같은 키 구조를 사용하도록 공유합니다.
+    
+    Args:
+        pipe: Redis 파이프라인 (동기/비동기)
+        date_str: 날짜 (YYYY-MM-DD)
+        counts: PendingVisitorCounts (main.buffer)
+        seen: 목록을 넘기면 워커별 Bloom 필터(main.bloom)로 이 워커가 오늘 이미 반영한 IP를
+            SADD/PFADD에서 제외하고, 새로 보낸 IP를 담음 (반영 성공 후 _mark_seen(seen) 호출)
+    """
+    daily_key = _counter_write_key(f"{DAILY_VISITORS_KEY_PREFIX}{date_str}")
+    unique_key = get_unique_visitors_key(date_str)
+    
+    # 일별 접속자 수 증가 (샤딩 시 워커별 샤드 키)
+    pipe.incrby(daily_key, counts.count)
+    pipe.expire(daily_key, VISITOR_KEY_TTL)
+    
+    # 누적 접속자 수 증가
+    pipe.incrby(_counter_write_key(TOTAL_VISITORS_KEY), counts.count)
+    
+    # 일별 방문 수 증가 (방문 쿠키 사용 시 방문의 첫 페이지뷰만)
+    if counts.visits:
+        visits_key = _counter_write_key(f"{DAILY_VISITS_KEY_PREFIX}{date_str}")
+        pipe.incrby(visits_key, counts.visits)
+        pipe.expire(visits_key, VISITOR_KEY_TTL)
+    
+    # 표본 집계 기록 (동기화 시 표본 비율 계산용)
+    if counts.sampled:
+        sampling_key = f"{VISITOR_SAMPLING_KEY_PREFIX}{date_str}"
+        pipe.hincrby(sampling_key, 'requests', counts.sampled)
+        pipe.hincrby(sampling_key, 'weight', counts.sampled_weight)
+        pipe.expire(sampling_key, VISITOR_KEY_TTL)
+    
+    # IP 주소를 세트(또는 HyperLogLog)에 추가하여 중복 접속자 제거 (같은 IP는 하루에 한 번만 카운트)
+    ip_addresses = _unseen_items(date_str, counts.ips, seen)
+    if ip_addresses:
+        if get_unique_backend() == UNIQUE_BACKEND_HLL:
+            pipe.pfadd(unique_key, *ip_addresses)
+        else:
+            pipe.sadd(unique_key, *ip_addresses)
+        pipe.expire(unique_key, VISITOR_KEY_TTL)
+    
+    _queue_timeseries_counts(pipe, date_str, counts, seen)
+
+
+def _unseen_items(date_str, items, seen):
+    """Bloom 필터를 사용하면 이 워커가 오늘 이미 반영한 항목을 제외하고 seen에 기록"""
+    bloom = get_visitor_bloom_filter()
+    if bloom is None or seen is None or not items:
+        return items
+    items = bloom.unseen(date_str, items)
+    if items:
+        seen.append((date_str, items))
+    return items
+
+
+def _mark_seen(seen):
+    """Redis 반영에 성공한 항목을 Bloom 필터에 기록"""
+    bloom = get_visitor_bloom_filter()
+    if bloom is None:
+        return
+    for date_str, items in seen:
+        bloom.update(date_str, items)
+
+
+def _queue_timeseries_counts(pipe, date_str, counts, seen=None):
+    """
+    분/시간 단위 시계열 명령을 파이프라인에 추가합니다.
+    
+    하루치 접속자 수는 해시 하나(m:HHMM, h:HH 필드)에 HINCRBY로 모으고,
+    시간별 고유 접속자는 시간대마다 HyperLogLog 하나에 PFADD합니다.
+    """
+    if not counts.minutes:
+        return
+    
+    timeseries_key = f"{VISITOR_TIMESERIES_KEY_PREFIX}{date_str}"
+    hours = {}
+    for minute, count in counts.minutes.items():
+        pipe.hincrby(timeseries_key, f'm:{minute}', count)
+        hours[minute[:2]] = hours.get(minute[:2], 0) + count
+    for hour, count in hours.items():
+        pipe.hincrby(timeseries_key, f'h:{hour}', count)
+    pipe.expire(timeseries_key, VISITOR_KEY_TTL)
+    
+    for hour, ip_addresses in counts.hour_ips.items():
+        # 시간별 고유 접속자는 "HH|IP" 항목으로 걸러냄 (일별 반영 여부와 별도)
+        ip_addresses = [item[3:] for item in _unseen_items(date_str, [f"{hour}|{ip}" for ip in ip_addresses], seen)]
+        if ip_addresses:
+            hourly_unique_key = f"{VISITOR_HOURLY_UNIQUE_KEY_PREFIX}{date_str}:{hour}"
+            pipe.pfadd(hourly_unique_key, *ip_addresses)
+            pipe.expire(hourly_unique_key, VISITOR_KEY_TTL)
+
+
+def _queue_topic_views(pipe, date_str, counts):
+    """
+    주제별 조회수와 고유 독자 명령을 파이프라인에 추가합니다.
+    
+    조회수는 날짜별 정렬 집합 하나에 ZINCRBY로 모으고(인기 주제 계산 시 ZUNIONSTORE),
+    고유 독자는 주제마다 HyperLogLog 하나에 PFADD합니다.
+    """
+    if not counts.topics:
+        return
+    
+    views_key = f"{TOPIC_VIEWS_KEY_PREFIX}{date_str}"
+    for topic, count in counts.topics.items():
+        pipe.zincrby(views_key, count, topic)
+    pipe.expire(views_key, VISITOR_KEY_TTL)
+    
+    for topic, ip_addresses in counts.topic_ips.items():
+        if ip_addresses:
+            readers_key = f"{TOPIC_READERS_KEY_PREFIX}{date_str}:{topic}"
+            pipe.pfadd(readers_key, *ip_addresses)
+            pipe.expire(readers_key, VISITOR_KEY_TTL)
+
+
+def _single_visit(when, ip_address, weight=1):
+    """접속 1건을 담은 PendingVisitorCounts 생성 (단건 증가 경로용)"""
+    counts = PendingVisitorCounts()
+    counts.add(when, ip_address, weight=weight)
+    return counts
 
 
 def get_today_unique_visitors_count():
@@ -113,47 +477,86 @@ def get_today_unique_visitors_count():
         return 0
     
     try:
-        today = get_today_date_str()
-        visitor_set_key = f"{VISITOR_SET_KEY_PREFIX}{today}"
-        count = redis_client.scard(visitor_set_key)
+        unique_key = get_unique_visitors_key(get_today_date_str())
+        count = _count_unique_visitors(redis_client, unique_key)
         return count if count else 0
     except Exception as e:
         logger.error(f"오늘 고유 접속자 수 조회 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
         return 0
 
 
 def get_total_visitors_count():
     """
     누적 접속자 수를 반환합니다 (DB에 저장된 일별 unique_visitor_count의 총합).
-    오늘 날짜의 데이터는 아직 DB에 동기화되지 않았을 수 있으므로 Redis에서 가져와 합산합니다.
+    
+    어제까지의 합계는 미리 계산해 둔 값(HISTORICAL_TOTAL_KEY)을 읽고,
+    오늘 고유 접속자 수만 Redis에서 가져와 합산하므로 기록이 늘어나도 비용이 일정합니다.
     
     Returns:
-        int: 누적 접속자 수 (DB의 unique_visitor_count 합계 + 오늘의 unique_visitor_count)
+        int: 누적 접속자 수 (어제까지의 unique_visitor_count 합계 + 오늘의 unique_visitor_count)
+    """
+    return get_visitor_stats()['total']
+
+
+def rebuild_historical_visitors_total(redis_client=None):
+    """
+    DB에서 어제까지의 누적 고유 접속자 수를 다시 계산해 Redis에 저장합니다.
+    
+    Redis에 저장된 합계가 어제 날짜 기준이 아닐 때(날짜 변경, 키 유실) get_visitor_stats()가 호출하며,
+    이후 변경분은 upsert_visitor_stats()가 apply_historical_total_delta()로 증분 반영합니다.
+    
+    Returns:
+        int: 어제까지의 unique_visitor_count 합계
     """
     from main.models import VisitorStats
     
+    total = VisitorStats.objects.filter(date__lt=date.today()).aggregate(
+        total=models.Sum('unique_visitor_count')
+    )['total'] or 0
+    
+    if redis_client:
+        try:
+            redis_client.eval(
+                STORE_HISTORICAL_TOTAL_SCRIPT, 1, HISTORICAL_TOTAL_KEY,
+                _historical_through_str(), int(total),
+            )
+        except Exception as e:
+            logger.error(f"누적 합계 저장 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+    
+    return int(total)
+
+
+def apply_historical_total_delta(target_date, delta):
+    """
+    이미 누적 합계에 포함된 날짜의 unique_visitor_count가 바뀐 만큼 합계를 조정합니다.
+    
+    Args:
+        target_date: 변경된 날짜 (date 객체 또는 YYYY-MM-DD 문자열)
+        delta: unique_visitor_count 변화량
+    """
+    if not delta:
+        return
+    
+    redis_client = get_redis_client()
+    if not redis_client:
+        return
+    
     try:
-        today = date.today()
-        
-        # DB에 저장된 모든 날짜의 unique_visitor_count 합계
-        db_total = VisitorStats.objects.aggregate(
-            total=models.Sum('unique_visitor_count')
-        )['total'] or 0
-        
-        # 오늘 날짜가 DB에 있는지 확인
-        today_stats = VisitorStats.objects.filter(date=today).first()
-        
-        if today_stats:
-            # 오늘 날짜가 DB에 있으면 DB 값을 사용 (이미 합계에 포함되어 있음)
-            return int(db_total)
-        else:
-            # 오늘 날짜가 DB에 없으면 Redis에서 오늘의 unique_visitor_count를 가져와 합산
-            today_unique = get_today_unique_visitors_count()
-            return int(db_total) + int(today_unique)
-            
+        redis_client.eval(
+            APPLY_HISTORICAL_TOTAL_DELTA_SCRIPT, 1, HISTORICAL_TOTAL_KEY,
+            _to_date_str(target_date), int(delta),
+        )
     except Exception as e:
-        logger.error(f"누적 접속자 수 조회 실패: {e}")
-        return 0
+        # 다음 날짜 변경 시 DB에서 다시 계산되므로 여기서는 로그만 남김
+        logger.error(f"누적 합계 증분 반영 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+
+
+def _historical_through_str():
+    """누적 합계가 포함해야 하는 마지막 날짜 (어제)"""
+    return (date.today() - timedelta(days=1)).strftime('%Y-%m-%d')
 
 
 def get_daily_visitors_count(target_date=None):
@@ -171,18 +574,12 @@ def get_daily_visitors_count(target_date=None):
         return 0
     
     try:
-        if target_date is None:
-            date_str = get_today_date_str()
-        elif isinstance(target_date, date):
-            date_str = target_date.strftime('%Y-%m-%d')
-        else:
-            date_str = str(target_date)
-        
-        daily_key = f"{DAILY_VISITORS_KEY_PREFIX}{date_str}"
-        count = redis_client.get(daily_key)
-        return int(count) if count else 0
+        daily_keys = get_counter_keys(f"{DAILY_VISITORS_KEY_PREFIX}{_to_date_str(target_date)}")
+        count = _sum_counter_values(redis_client.mget(daily_keys))
+        return count or 0
     except Exception as e:
         logger.error(f"일별 접속자 수 조회 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
         return 0
 
 
@@ -190,6 +587,9 @@ def get_visitor_stats():
     """
     접속자 통계를 딕셔너리로 반환합니다.
     
+    오늘 접속자 수, 오늘 고유 접속자 수, 어제까지의 누적 합계를 파이프라인 하나로
+    조회하므로 Redis 왕복 1회로 끝납니다 (누적 합계가 날짜 기준이 지났을 때만 DB 조회).
+    
     Returns:
         dict: {
             'today': 오늘 접속자 수,
@@ -198,14 +598,128 @@ def get_visitor_stats():
             'date': 오늘 날짜 (YYYY-MM-DD)
         }
     """
+    today_str = get_today_date_str()
+    redis_client = None if _stats_redis_suspended() else get_redis_client()
+    result = None
+    
+    if redis_client:
+        started = time.monotonic()
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            _queue_visitor_stats_reads(pipe, today_str)
+            result = pipe.execute()
+        except Exception as e:
+            logger.error(f"접속자 통계 조회 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+        _record_stats_redis_read(time.monotonic() - started, result is not None)
+    
+    if result is None:
+        # Redis 장애/지연 시 증분 동기화된 오늘 행과 DB 누적 합계로 대체
+        return _visitor_stats_from_db(today_str)
+    
+    today, today_unique, historical = _parse_visitor_stats_result(result)
+    if historical is None:
+        historical = rebuild_historical_visitors_total(redis_client)
+    
     return {
-        'today': get_today_visitors_count(),
-        'today_unique': get_today_unique_visitors_count(),
-        'total': get_total_visitors_count(),
-        'date': get_today_date_str(),
+        'today': today,
+        'today_unique': today_unique,
+        'total': historical + today_unique,
+        'date': today_str,
     }
 
 
+def _stats_redis_suspended():
+    """최근 Redis 통계 조회가 실패했거나 느려서 DB만 사용해야 하는지 여부"""
+    return time.monotonic() < _stats_redis_suspended_until
+
+
+def _record_stats_redis_read(elapsed, succeeded):
+    """
+    Redis 통계 조회 결과를 기록합니다.
+    
+    실패했거나 VISITOR_STATS_REDIS_SLOW_MS보다 오래 걸리면 VISITOR_STATS_DB_FALLBACK_SECONDS 동안
+    Redis를 건너뛰고 DB에서 조회해 요청이 느린 Redis를 기다리지 않도록 합니다.
+    """
+    global _stats_redis_suspended_until
+    if succeeded:
+        get_redis_circuit_breaker().record_success()
+    slow_ms = getattr(settings, 'VISITOR_STATS_REDIS_SLOW_MS', 200)
+    if succeeded and elapsed * 1000 <= slow_ms:
+        return
+    if succeeded:
+        logger.warning(f"접속자 통계 Redis 조회 지연 ({elapsed * 1000:.0f}ms), 당분간 DB에서 조회합니다")
+    _stats_redis_suspended_until = time.monotonic() + getattr(settings, 'VISITOR_STATS_DB_FALLBACK_SECONDS', 30)
+
+
+def _visitor_stats_db_queryset(today_str):
+    from main.models import VisitorStats
+    
+    return VisitorStats.objects.filter(date__lte=date.fromisoformat(today_str))
+
+
+def _visitor_stats_db_aggregates(today_str):
+    """오늘 행과 어제까지의 합계를 쿼리 한 번으로 집계하는 aggregate 인자"""
+    today = date.fromisoformat(today_str)
+    return {
+        'historical': models.Sum('unique_visitor_count', filter=models.Q(date__lt=today)),
+        'today': models.Sum('visitor_count', filter=models.Q(date=today)),
+        'today_unique': models.Sum('unique_visitor_count', filter=models.Q(date=today)),
+    }
+
+
+def _visitor_stats_db_result(stats, today_str):
+    today_unique = stats['today_unique'] or 0
+    return {
+        'today': stats['today'] or 0,
+        'today_unique': today_unique,
+        'total': (stats['historical'] or 0) + today_unique,
+        'date': today_str,
+    }
+
+
+def _visitor_stats_from_db(today_str):
+    """
+    DB만으로 접속자 통계를 조회합니다 (sync_today_visitor_stats_task가 몇 분마다 오늘 행을 갱신).
+    """
+    try:
+        stats = _visitor_stats_db_queryset(today_str).aggregate(**_visitor_stats_db_aggregates(today_str))
+    except Exception as e:
+        logger.error(f"DB에서 접속자 통계 조회 실패: {e}")
+        return {'today': 0, 'today_unique': 0, 'total': 0, 'date': today_str}
+    return _visitor_stats_db_result(stats, today_str)
+
+
+def _queue_visitor_stats_reads(pipe, date_str):
+    """
+    접속자 통계 조회 명령을 파이프라인에 추가합니다 (동기/비동기 공용).
+    
+    고유 접속자 키, 누적 합계 키, 일별 카운터 키는 Redis Cluster에서 슬롯이 다르므로
+    Lua 스크립트나 MULTI로 묶지 않고 transaction=False 파이프라인으로 보냅니다.
+    """
+    if get_unique_backend() == UNIQUE_BACKEND_HLL:
+        pipe.pfcount(get_unique_visitors_key(date_str))
+    else:
+        pipe.scard(get_unique_visitors_key(date_str))
+    pipe.hmget(HISTORICAL_TOTAL_KEY, 'through', 'total')
+    pipe.mget(get_counter_keys(f"{DAILY_VISITORS_KEY_PREFIX}{date_str}"))
+
+
+def _parse_visitor_stats_result(result):
+    """
+    _queue_visitor_stats_reads 결과를 (오늘 접속자 수, 오늘 고유 접속자 수, 누적 합계)로 변환합니다.
+    누적 합계가 없거나 어제 기준이 아니면 None을 반환해 호출자가 다시 계산하도록 합니다.
+    """
+    if not result:
+        return 0, 0, None
+    
+    today_unique, (through, total), counter_values = result
+    historical = None
+    if through is not None and total is not None and through.decode() == _historical_through_str():
+        historical = int(total)
+    return _sum_counter_values(counter_values) or 0, int(today_unique or 0), historical
+
+
 def get_daily_unique_visitors_count(target_date=None):
     """특정 날짜의 고유 접속자 수를 반환"""
     redis_client = get_redis_client()
@@ -213,21 +727,100 @@ def get_daily_unique_visitors_count(target_date=None):
         return 0
     
     try:
-        if target_date is None:
-            date_str = get_today_date_str()
-        elif isinstance(target_date, date):
-            date_str = target_date.strftime('%Y-%m-%d')
-        else:
-            date_str = str(target_date)
-        
-        visitor_set_key = f"{VISITOR_SET_KEY_PREFIX}{date_str}"
-        count = redis_client.scard(visitor_set_key)
+        unique_key = get_unique_visitors_key(_to_date_str(target_date))
+        count = _count_unique_visitors(redis_client, unique_key)
         return count if count else 0
     except Exception as e:
         logger.error(f"일별 고유 접속자 수 조회 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
         return 0
 
 
+def get_period_unique_visitors_counts(target_date=None):
+    """
+    특정 날짜가 속한 주(월요일~일요일)와 달의 고유 접속자 수를 Redis 파이프라인 한 번으로 조회합니다.
+    
+    일별 고유 접속자 키를 병합(PFMERGE/SUNIONSTORE)하며, 병합 결과는 MERGED_UNIQUE_KEY_TTL 동안
+    보관되어 같은 기간을 반복 조회할 때 재사용할 수 있습니다.
+    일별 키는 30일 후 만료되므로 그보다 오래된 날짜는 남아 있는 날짜만 집계됩니다.
+    
+    Args:
+        target_date: 날짜 객체 또는 YYYY-MM-DD 형식 문자열. None이면 오늘 날짜 사용.
+    
+    Returns:
+        dict: {'week_unique': 주 고유 접속자 수, 'month_unique': 월 고유 접속자 수} (오늘 이후 날짜는 제외)
+    """
+    periods = _unique_periods(target_date)
+    redis_client = get_redis_client()
+    if not redis_client:
+        return _parse_period_unique_results(periods, [], [])
+    
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        queued = [name for name, start, end, merged_key in periods if _queue_merged_unique_reads(pipe, start, end, merged_key)]
+        results = pipe.execute()
+    except Exception as e:
+        logger.error(f"기간별 고유 접속자 수 조회 실패 ({_to_date_str(target_date)}): {e}")
+        get_redis_circuit_breaker().record_failure()
+        return _parse_period_unique_results(periods, [], [])
+    return _parse_period_unique_results(periods, queued, results)
+
+
+def _unique_periods(target_date):
+    """target_date가 속한 주와 달의 [(응답 필드 이름, 시작 날짜, 종료 날짜, 병합 결과 키)]"""
+    target = date.fromisoformat(_to_date_str(target_date))
+    backend = get_unique_backend()
+    week_start = target - timedelta(days=target.weekday())
+    iso_year, iso_week, _ = target.isocalendar()
+    month_start = target.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    return [
+        (
+            'week_unique', week_start, week_start + timedelta(days=6),
+            f"{VISITOR_WEEKLY_KEY_PREFIX}{backend}:{iso_year}-W{iso_week:02d}",
+        ),
+        (
+            'month_unique', month_start, next_month - timedelta(days=1),
+            f"{VISITOR_MONTHLY_KEY_PREFIX}{backend}:{month_start.strftime('%Y-%m')}",
+        ),
+    ]
+
+
+def _queue_merged_unique_reads(pipe, start, end, merged_key):
+    """
+    start~end 기간(오늘 이후 제외)의 일별 고유 접속자 키를 병합하고 세는 명령을 파이프라인에 추가합니다.
+    
+    Returns:
+        bool: 명령을 추가했는지 여부 (기간이 모두 오늘 이후이면 False)
+    """
+    end = min(end, date.today())
+    keys = []
+    current = start
+    while current <= end:
+        keys.append(get_unique_visitors_key(current.strftime('%Y-%m-%d')))
+        current += timedelta(days=1)
+    if not keys:
+        return False
+    
+    if get_unique_backend() == UNIQUE_BACKEND_HLL:
+        # PFMERGE는 merged_key의 기존 값과도 합쳐지므로 같은 기간이면 누적해도 결과가 같음
+        pipe.pfmerge(merged_key, *keys)
+        pipe.pfcount(merged_key)
+    else:
+        pipe.sunionstore(merged_key, keys)
+        pipe.scard(merged_key)
+    pipe.expire(merged_key, MERGED_UNIQUE_KEY_TTL)
+    return True
+
+
+def _parse_period_unique_results(periods, queued, results):
+    """파이프라인 결과(기간마다 병합, 개수, 만료 3개)를 {응답 필드 이름: 고유 접속자 수}로 변환"""
+    counts = {name: 0 for name, *_ in periods}
+    for index, name in enumerate(queued):
+        counts[name] = results[index * 3 + 1] or 0
+    return counts
+
+
 def get_visitor_count_from_db(target_date):
     """
     MariaDB에서 접속자 수 조회 (Redis에 없을 때 사용)
@@ -253,4 +846,822 @@ def get_visitor_count_from_db(target_date):
         return None
     except Exception as e:
         logger.error(f"DB에서 접속자 수 조회 실패: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+
+def get_visitor_stats_range(start, end):
+    """
+    기간 내 일별 접속자 수/고유 접속자 수를 한 번에 조회합니다.
+    
+    날짜마다 조회하지 않고 MariaDB 범위 쿼리 한 번과 Redis 파이프라인 한 번
+    (GET + SCARD/PFCOUNT)으로 조회합니다. 동기화된 과거 날짜는 DB 값을,
+    최근 날짜(오늘, 어제)와 DB에 없는 날짜는 Redis 값을 사용하고,
+    Redis 키가 만료되었거나 Redis에 접근할 수 없으면 DB 값으로 대체합니다.
+    
+    Args:
+        start: 시작 날짜 (date 객체)
+        end: 종료 날짜 (date 객체, 포함)
+    
+    Returns:
+        list: [{'date': 'YYYY-MM-DD', 'visitor_count': int, 'unique_visitor_count': int, 'visit_count': int,
+                'sample_rate': float (1.0이면 모든 요청 반영)}]
+    
+    Raises:
+        ValueError: 기간이 잘못되었거나 최대 일수를 넘는 경우
+    """
+    from main.models import VisitorStats
+    
+    dates, redis_dates = _visitor_stats_range_dates(start, end)
+    db_stats = {
+        row[0]: row[1:]
+        for row in VisitorStats.objects.filter(date__range=(start, end)).values_list(
+            'date', 'visitor_count', 'unique_visitor_count', 'visit_count', 'sample_rate'
+        )
+    }
+    redis_dates = [day for day in dates if day in redis_dates or day not in db_stats]
+    
+    redis_stats = {}
+    redis_client = get_redis_client()
+    if redis_client and redis_dates:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            _queue_daily_stats_reads(pipe, redis_dates)
+            redis_stats = _parse_daily_stats_reads(redis_dates, pipe.execute())
+        except Exception as e:
+            logger.error(f"기간 접속자 수 조회 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+    
+    return _merge_visitor_stats_range(dates, db_stats, redis_stats)
+
+
+def _visitor_stats_range_dates(start, end):
+    """
+    기간의 날짜 목록과 Redis에서 우선 조회할 최근 날짜(오늘, 어제)를 반환합니다.
+    """
+    days = (end - start).days + 1
+    if days < 1:
+        raise ValueError('종료 날짜가 시작 날짜보다 빠릅니다')
+    if days > VISITOR_STATS_RANGE_MAX_DAYS:
+        raise ValueError(f'최대 {VISITOR_STATS_RANGE_MAX_DAYS}일까지 조회할 수 있습니다')
+    
+    today = date.today()
+    dates = [start + timedelta(days=i) for i in range(days) if start + timedelta(days=i) <= today]
+    return dates, {today, today - timedelta(days=1)}
+
+
+def _queue_daily_stats_reads(pipe, dates):
+    """날짜별 접속자 수/방문 수(MGET, 샤드 합산)와 고유 접속자 수(SCARD/PFCOUNT) 조회 명령을 파이프라인에 추가"""
+    for day in dates:
+        date_str = day.strftime('%Y-%m-%d')
+        pipe.mget(get_counter_keys(f"{DAILY_VISITORS_KEY_PREFIX}{date_str}"))
+        _count_unique_visitors(pipe, get_unique_visitors_key(date_str))
+        pipe.mget(get_counter_keys(f"{DAILY_VISITS_KEY_PREFIX}{date_str}"))
+        pipe.hmget(f"{VISITOR_SAMPLING_KEY_PREFIX}{date_str}", 'requests', 'weight')
+
+
+def _parse_daily_stats_reads(dates, results):
+    """파이프라인 결과를 {날짜: (접속자 수, 고유 접속자 수, 방문 수, 표본 비율)}로 변환 (만료된 날짜는 제외)"""
+    stats = {}
+    for i, day in enumerate(dates):
+        offset = i * DAILY_STATS_READS_PER_DAY
+        visitor_count = _sum_counter_values(results[offset])
+        if visitor_count is not None:
+            stats[day] = (
+                visitor_count,
+                int(results[offset + 1] or 0),
+                _sum_counter_values(results[offset + 2]) or 0,
+                _sample_rate(visitor_count, *results[offset + 3]),
+            )
+    return stats
+
+
+def _sample_rate(visitor_count, sampled_requests, sampled_weight):
+    """
+    하루 동안 실제로 반영한 요청 비율을 계산합니다.
+    
+    표본 요청은 가중치만큼 더해졌으므로 실제 반영 요청 수는
+    접속자 수 - 가중치 합계 + 표본 요청 수입니다 (표본 집계하지 않은 날은 1.0).
+    """
+    sampled_requests = int(sampled_requests or 0)
+    sampled_weight = int(sampled_weight or 0)
+    if not sampled_requests or not visitor_count:
+        return 1.0
+    recorded = visitor_count - sampled_weight + sampled_requests
+    return round(min(1.0, max(recorded, 1) / visitor_count), 6)
+
+
+def _merge_visitor_stats_range(dates, db_stats, redis_stats):
+    series = []
+    for day in dates:
+        visitor_count, unique_visitor_count, visit_count, sample_rate = (
+            redis_stats.get(day) or db_stats.get(day) or (0, 0, 0, 1.0)
+        )
+        series.append({
+            'date': day.strftime('%Y-%m-%d'),
+            'visitor_count': visitor_count,
+            'unique_visitor_count': unique_visitor_count,
+            'visit_count': visit_count,
+            'sample_rate': sample_rate,
+        })
+    return series
+
+def _bulk_upsert(model, objs, unique_fields, update_fields):
+    """
+    bulk_create(update_conflicts=True)로 여러 행을 한 번의 INSERT ... ON DUPLICATE KEY UPDATE로 저장합니다.
+    
+    MariaDB/MySQL은 충돌 대상 컬럼 지정을 지원하지 않으므로
+    지원하는 DB(SQLite, PostgreSQL)에서만 unique_fields를 넘깁니다.
+    """
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return model.objects.bulk_create(objs, **options)
+
+
+def _queue_hourly_timeseries_reads(pipe, date_str):
+    """하루치 시계열 해시와 시간별 고유 접속자 수(PFCOUNT 24회) 조회 명령을 파이프라인에 추가"""
+    pipe.hgetall(f"{VISITOR_TIMESERIES_KEY_PREFIX}{date_str}")
+    for hour in range(24):
+        pipe.pfcount(f"{VISITOR_HOURLY_UNIQUE_KEY_PREFIX}{date_str}:{hour:02d}")
+
+
+def _parse_timeseries_hash(raw):
+    """
+    HGETALL 결과를 분별/시간별 접속자 수로 변환합니다.
+    
+    Returns:
+        tuple: ({'HHMM': int}, {HH(int): int})
+    """
+    minutes = {}
+    hours = {}
+    for field, value in raw.items():
+        if isinstance(field, bytes):
+            field = field.decode()
+        kind, _, bucket = field.partition(':')
+        if kind == 'm':
+            minutes[bucket] = int(value)
+        elif kind == 'h':
+            hours[int(bucket)] = int(value)
+    return minutes, hours
+
+
+def _read_hourly_timeseries(redis_client, date_strs):
+    """
+    여러 날짜의 시간별 접속자 수/고유 접속자 수를 한 번의 파이프라인으로 조회합니다.
+    
+    Returns:
+        dict: {date_str: [(접속자 수, 고유 접속자 수)] * 24}
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for date_str in date_strs:
+        _queue_hourly_timeseries_reads(pipe, date_str)
+    results = pipe.execute()
+    
+    series = {}
+    for i, date_str in enumerate(date_strs):
+        chunk = results[i * 25:(i + 1) * 25]
+        _, hours = _parse_timeseries_hash(chunk[0])
+        series[date_str] = [(hours.get(hour, 0), int(chunk[hour + 1] or 0)) for hour in range(24)]
+    return series
+
+
+def sync_visitor_stats_range(dates, high_water_mark=False):
+    """
+    여러 날짜의 접속자 통계를 Redis에서 MariaDB로 한 번에 동기화합니다.
+    
+    Redis는 파이프라인 한 번(일별 GET, SCARD/PFCOUNT, 시계열 해시, 시간별 PFCOUNT)으로 조회하고,
+    DB는 한 트랜잭션 안에서 VisitorStats와 VisitorHourlyStats를 각각 bulk upsert 한 번으로 저장합니다.
+    Redis 키가 만료되어 없는 날짜는 기존 DB 값을 0으로 덮어쓰지 않도록 건너뜁니다.
+    표본 집계(main.sampling)한 날은 카운터가 이미 가중치만큼 증가한 추정값이며,
+    실제 반영 비율을 sample_rate로 함께 저장합니다.
+    
+    Args:
+        dates: date 객체 목록
+        high_water_mark: True이면 DB에 저장된 값을 최고 수위로 보고 값이 늘어난 날짜만 저장
+            (Redis 데이터가 유실되어도 DB 값이 줄어들지 않으며, 반복 실행해도 결과가 같음)
+    
+    Returns:
+        dict: {
+            'synced': [{'date', 'visitor_count', 'unique_visitor_count', 'visit_count', 'sample_rate',
+                        'hourly_rows', 'created', 'changed'}],
+            'skipped': [YYYY-MM-DD, ...],
+            'redis_seconds': float,
+            'db_seconds': float,
+        }
+    
+    Raises:
+        RuntimeError: Redis에 연결할 수 없는 경우
+    """
+    from main.models import VisitorHourlyStats, VisitorStats
+    
+    redis_client = get_redis_client()
+    if not redis_client:
+        raise RuntimeError('Redis에 연결할 수 없습니다')
+    
+    dates = sorted(set(dates))
+    date_strs = [day.strftime('%Y-%m-%d') for day in dates]
+    
+    started = time.perf_counter()
+    pipe = redis_client.pipeline(transaction=False)
+    _queue_daily_stats_reads(pipe, dates)
+    for date_str in date_strs:
+        _queue_hourly_timeseries_reads(pipe, date_str)
+    try:
+        results = pipe.execute()
+    except Exception:
+        get_redis_circuit_breaker().record_failure()
+        raise
+    get_redis_circuit_breaker().record_success()
+    redis_seconds = time.perf_counter() - started
+    
+    daily_reads = len(dates) * DAILY_STATS_READS_PER_DAY
+    daily = _parse_daily_stats_reads(dates, results[:daily_reads])
+    hourly_results = results[daily_reads:]
+    
+    daily_rows = []
+    hourly_rows = []
+    synced = []
+    for i, day in enumerate(dates):
+        if day not in daily:
+            continue
+        visitor_count, unique_visitor_count, visit_count, sample_rate = daily[day]
+        daily_rows.append(VisitorStats(
+            date=day,
+            visitor_count=visitor_count,
+            unique_visitor_count=unique_visitor_count,
+            visit_count=visit_count,
+            sample_rate=sample_rate,
+        ))
+        
+        chunk = hourly_results[i * 25:(i + 1) * 25]
+        _, hours = _parse_timeseries_hash(chunk[0])
+        day_hourly_rows = [
+            VisitorHourlyStats(
+                date=day,
+                hour=hour,
+                visitor_count=hours.get(hour, 0),
+                unique_visitor_count=int(chunk[hour + 1] or 0),
+            )
+            for hour in range(24)
+            if hours.get(hour) or chunk[hour + 1]
+        ]
+        hourly_rows.extend(day_hourly_rows)
+        synced.append({
+            'date': date_strs[i],
+            'visitor_count': visitor_count,
+            'unique_visitor_count': unique_visitor_count,
+            'visit_count': visit_count,
+            'sample_rate': sample_rate,
+            'hourly_rows': len(day_hourly_rows),
+        })
+    
+    started = time.perf_counter()
+    daily_rows, previous = upsert_visitor_stats(daily_rows, hourly_rows, high_water_mark=high_water_mark)
+    db_seconds = time.perf_counter() - started
+    
+    # 워커별 카운터 샤드를 기본 키로 합쳐 읽기 시 합산할 키 수를 줄임 (샤딩 사용 시)
+    collapse_counter_shards(date_strs)
+    
+    written = {row.date: row for row in daily_rows}
+    for result in synced:
+        day = date.fromisoformat(result['date'])
+        result['created'] = day not in previous
+        result['changed'] = day in written
+        if day in written:
+            result['visitor_count'] = written[day].visitor_count
+            result['unique_visitor_count'] = written[day].unique_visitor_count
+            result['visit_count'] = written[day].visit_count
+    
+    return {
+        'synced': synced,
+        'skipped': [date_str for day, date_str in zip(dates, date_strs) if day not in daily],
+        'redis_seconds': redis_seconds,
+        'db_seconds': db_seconds,
+    }
+
+
+VISITOR_STATS_UPDATE_FIELDS = ['visitor_count', 'unique_visitor_count', 'visit_count', 'sample_rate', 'updated_at']
+
+
+def upsert_visitor_stats(daily_rows, hourly_rows=(), high_water_mark=False, update_fields=None):
+    """
+    일별/시간별 접속자 통계를 한 트랜잭션 안에서 bulk upsert하고 누적 합계를 증분 갱신합니다.
+    
+    Args:
+        daily_rows: 저장할 VisitorStats 객체 목록
+        hourly_rows: 저장할 VisitorHourlyStats 객체 목록
+        high_water_mark: True이면 DB 값보다 늘어난 날짜만 저장 (sync_visitor_stats_range 참고)
+        update_fields: 이미 있는 날짜에서 덮어쓸 VisitorStats 필드 (기본값: VISITOR_STATS_UPDATE_FIELDS)
+            새로 추가되는 날짜는 객체의 모든 필드로 저장됨
+    
+    Returns:
+        tuple: (실제로 저장한 VisitorStats 목록, 저장 전 DB 값 {날짜: (visitor_count, unique_visitor_count, visit_count)})
+    """
+    from main.models import VisitorHourlyStats, VisitorStats
+    
+    daily_rows = list(daily_rows)
+    hourly_rows = list(hourly_rows)
+    if not daily_rows:
+        return [], {}
+    
+    with transaction.atomic():
+        previous = {
+            row[0]: row[1:]
+            for row in VisitorStats.objects.filter(date__in=[row.date for row in daily_rows])
+            .select_for_update()
+            .values_list('date', 'visitor_count', 'unique_visitor_count', 'visit_count')
+        }
+        if high_water_mark:
+            daily_rows = _apply_high_water_mark(daily_rows, previous)
+            changed_dates = {row.date for row in daily_rows}
+            hourly_rows = [row for row in hourly_rows if row.date in changed_dates]
+        
+        if daily_rows:
+            _bulk_upsert(
+                VisitorStats,
+                daily_rows,
+                unique_fields=['date'],
+                update_fields=update_fields or VISITOR_STATS_UPDATE_FIELDS,
+            )
+        if hourly_rows:
+            _bulk_upsert(
+                VisitorHourlyStats,
+                hourly_rows,
+                unique_fields=['date', 'hour'],
+                update_fields=['visitor_count', 'unique_visitor_count', 'updated_at'],
+            )
+        
+        # 누적 합계 증분 갱신 (이미 합계에 포함된 날짜가 바뀐 경우만 반영됨)
+        for row in daily_rows:
+            delta = row.unique_visitor_count - previous.get(row.date, (0, 0, 0))[1]
+            if delta:
+                transaction.on_commit(
+                    lambda target_date=row.date, delta=delta: apply_historical_total_delta(target_date, delta)
+                )
+    
+    return daily_rows, previous
+
+
+def _apply_high_water_mark(rows, previous):
+    """
+    DB에 저장된 값보다 늘어난 행만 남기고, 각 값은 기존 값과 비교해 큰 값으로 맞춥니다.
+    
+    Args:
+        rows: 저장할 VisitorStats 객체 목록
+        previous: {날짜: (visitor_count, unique_visitor_count, visit_count)} (DB에 저장된 값)
+    """
+    changed = []
+    for row in rows:
+        visitor_count, unique_visitor_count, visit_count = previous.get(row.date, (0, 0, 0))
+        if (
+            row.visitor_count <= visitor_count
+            and row.unique_visitor_count <= unique_visitor_count
+            and row.visit_count <= visit_count
+        ):
+            continue
+        row.visitor_count = max(row.visitor_count, visitor_count)
+        row.unique_visitor_count = max(row.unique_visitor_count, unique_visitor_count)
+        row.visit_count = max(row.visit_count, visit_count)
+        changed.append(row)
+    return changed
+
+
+def get_visitor_timeseries(start, end, resolution=TIMESERIES_RESOLUTION_HOUR):
+    """
+    기간 내 분/시간 단위 접속자 수 시계열을 조회합니다.
+    
+    구간마다 조회하지 않고, 시간 단위는 MariaDB 범위 쿼리 한 번 + (DB에 없는 날짜만)
+    Redis 파이프라인 한 번, 분 단위는 Redis 파이프라인 한 번으로 조회합니다.
+    접속이 없던 구간은 0으로 채우며, 현재 시각 이후 구간은 포함하지 않습니다.
+    분 단위 고유 접속자 수는 보관하지 않으므로 시간 단위에서만 반환합니다.
+    
+    Args:
+        start: 시작 날짜 (date 객체)
+        end: 종료 날짜 (date 객체, 포함)
+        resolution: 'minute' 또는 'hour'
+    
+    Returns:
+        list: [{'time': 'YYYY-MM-DDTHH:MM', 'visitors': int, 'unique_visitors': int(시간 단위만)}]
+    
+    Raises:
+        ValueError: 조회 단위가 잘못되었거나 기간이 최대 기간을 넘는 경우
+    """
+    from main.models import VisitorHourlyStats
+    
+    if resolution not in TIMESERIES_MAX_DAYS:
+        raise ValueError(f'지원하지 않는 조회 단위입니다: {resolution}')
+    days = (end - start).days + 1
+    if days < 1:
+        raise ValueError('종료 날짜가 시작 날짜보다 빠릅니다')
+    if days > TIMESERIES_MAX_DAYS[resolution]:
+        raise ValueError(f'{resolution} 단위는 최대 {TIMESERIES_MAX_DAYS[resolution]}일까지 조회할 수 있습니다')
+    
+    now = datetime.now()
+    dates = [start + timedelta(days=i) for i in range(days) if start + timedelta(days=i) <= now.date()]
+    redis_client = get_redis_client()
+    
+    if resolution == TIMESERIES_RESOLUTION_MINUTE:
+        minutes_by_date = {}
+        if redis_client and dates:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for day in dates:
+                    pipe.hgetall(f"{VISITOR_TIMESERIES_KEY_PREFIX}{day.isoformat()}")
+                for day, raw in zip(dates, pipe.execute()):
+                    minutes_by_date[day] = _parse_timeseries_hash(raw)[0]
+            except Exception as e:
+                logger.error(f"분 단위 시계열 조회 실패: {e}")
+                get_redis_circuit_breaker().record_failure()
+        
+        series = []
+        for day in dates:
+            minutes = minutes_by_date.get(day, {})
+            bucket = datetime.combine(day, datetime.min.time())
+            while bucket.date() == day and bucket <= now:
+                key = bucket.strftime('%H%M')
+                series.append({'time': bucket.strftime('%Y-%m-%dT%H:%M'), 'visitors': minutes.get(key, 0)})
+                bucket += timedelta(minutes=1)
+        return series
+    
+    # 시간 단위: 동기화된 날짜는 DB에서, 오늘과 아직 동기화되지 않은 날짜는 Redis에서 조회
+    hourly = {}
+    for row in VisitorHourlyStats.objects.filter(date__range=(start, end)).values_list(
+        'date', 'hour', 'visitor_count', 'unique_visitor_count'
+    ):
+        hourly.setdefault(row[0], [(0, 0)] * 24)[row[1]] = (row[2], row[3])
+    
+    redis_dates = [day for day in dates if day not in hourly or day == now.date()]
+    if redis_client and redis_dates:
+        try:
+            redis_hourly = _read_hourly_timeseries(redis_client, [day.isoformat() for day in redis_dates])
+            for day in redis_dates:
+                hourly[day] = redis_hourly[day.isoformat()]
+        except Exception as e:
+            logger.error(f"시간 단위 시계열 조회 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+    
+    series = []
+    for day in dates:
+        buckets = hourly.get(day, [(0, 0)] * 24)
+        last_hour = now.hour if day == now.date() else 23
+        for hour in range(last_hour + 1):
+            visitor_count, unique_visitor_count = buckets[hour]
+            series.append({
+                'time': f'{day.isoformat()}T{hour:02d}:00',
+                'visitors': visitor_count,
+                'unique_visitors': unique_visitor_count,
+            })
+    return series
+
+
+def get_popular_topics(limit=5, category=None):
+    """
+    최근 7일 조회수 기준 인기 주제 목록을 반환합니다.
+    
+    Django 캐시에 저장된 목록만 읽으며(Redis 스캔/정렬 없음), 목록은 refresh_popular_topics_task
+    (또는 warm_cache 커맨드)만 계산합니다. 캐시가 비어 있으면 빈 목록을 반환합니다.
+    
+    Args:
+        limit: 반환할 최대 주제 수
+        category: 카테고리 슬러그 (지정 시 해당 카테고리의 주제만)
+    
+    Returns:
+        list: [{'category', 'category_name', 'slug', 'title', 'url', 'views', 'readers'}] (조회수 내림차순)
+    """
+    from django.core.cache import cache
+    
+    topics = cache.get(POPULAR_TOPICS_CACHE_KEY) or []
+    if category is not None:
+        topics = [topic for topic in topics if topic['category'] == category]
+    return topics[:limit]
+
+
+def refresh_popular_topics(target_date=None):
+    """
+    일별 주제 조회수를 합산해 인기 주제 목록을 다시 계산하고 Django 캐시에 저장합니다.
+    
+    최근 7일의 일별 정렬 집합을 ZUNIONSTORE로 합친 뒤 상위 후보만 읽고,
+    주제별 고유 독자는 7일치 HyperLogLog를 PFCOUNT 한 번으로 병합해 셉니다.
+    제목/URL은 후보 주제만 DB에서 한 번에 조회합니다.
+    Celery 작업(refresh_popular_topics_task)이 주기적으로 호출하며,
+    페이지 캐시 무효화와 정적 페이지 갱신은 반환값을 보고 호출한 쪽에서 처리합니다.
+    
+    Args:
+        target_date: 기준 날짜 (date 객체). None이면 오늘.
+    
+    Returns:
+        bool: 표시되는 순위가 바뀌었거나 목록이 비어 있었으면 True (Redis 연결 실패 시 False, 캐시하지 않음)
+    """
+    from django.core.cache import cache
+    from django.db.models import Q
+    from main.models import Topic
+    
+    redis_client = get_redis_client()
+    if not redis_client:
+        return False
+    
+    target_date = target_date or date.today()
+    date_strs = [
+        (target_date - timedelta(days=offset)).strftime('%Y-%m-%d')
+        for offset in range(POPULAR_TOPICS_DAYS)
+    ]
+    
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zunionstore(POPULAR_TOPICS_KEY, [f"{TOPIC_VIEWS_KEY_PREFIX}{date_str}" for date_str in date_strs])
+        pipe.zrevrange(POPULAR_TOPICS_KEY, 0, POPULAR_TOPICS_CANDIDATES - 1, withscores=True)
+        ranked = pipe.execute()[1]
+        
+        members = [member.decode() for member, _ in ranked]
+        pipe = redis_client.pipeline(transaction=False)
+        for member in members:
+            pipe.pfcount(*[f"{TOPIC_READERS_KEY_PREFIX}{date_str}:{member}" for date_str in date_strs])
+        readers = pipe.execute() if members else []
+        get_redis_circuit_breaker().record_success()
+    except Exception as e:
+        logger.error(f"인기 주제 계산 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        return False
+    
+    lookup = Q(pk__in=[])
+    for member in members:
+        category_slug, _, topic_slug = member.partition('/')
+        lookup |= Q(category__slug=category_slug, slug=topic_slug)
+    topic_objs = {
+        f"{topic.category.slug}/{topic.slug}": topic
+        for topic in Topic.objects.filter(lookup).select_related('category')
+    }
+    
+    topics = []
+    for member, (_, views), reader_count in zip(members, ranked, readers):
+        topic = topic_objs.get(member)
+        # 삭제되었거나 slug가 바뀐 주제는 제외
+        if topic is None:
+            continue
+        topics.append({
+            'category': topic.category.slug,
+            'category_name': topic.category.name,
+            'slug': topic.slug,
+            'title': topic.title,
+            'url': topic.get_absolute_url(),
+            'views': int(views),
+            'readers': reader_count,
+        })
+    
+    # 페이지에는 순위와 제목만 표시하므로 조회수/독자 수 변화가 아니라 순위가 바뀌었거나
+    # 목록이 비어 있었을 때만 변경으로 봄 (인기 주제를 표시하는 페이지의 캐시 무효화 기준)
+    listed = cache.get(POPULAR_TOPICS_CACHE_KEY) is not None
+    ranking = [(topic['category'], topic['slug']) for topic in topics]
+    previous_ranking = cache.get(POPULAR_TOPICS_RANKING_CACHE_KEY)
+    cache.set(
+        POPULAR_TOPICS_CACHE_KEY,
+        topics,
+        getattr(settings, 'POPULAR_TOPICS_CACHE_SECONDS', 60 * 10),
+    )
+    if listed and ranking == previous_ranking:
+        return False
+    cache.set(POPULAR_TOPICS_RANKING_CACHE_KEY, ranking, None)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# 비동기(ASGI) 경로
+# 동기 함수와 같은 키 구조를 사용하며, 이벤트 루프를 블로킹하지 않도록
+# redis.asyncio 클라이언트와 Django 비동기 ORM을 사용합니다.
+# ---------------------------------------------------------------------------
+
+# 이벤트 루프별 redis.asyncio 클라이언트 (연결 풀은 생성된 루프에 묶임)
+_async_redis_clients = weakref.WeakKeyDictionary()
+
+# fire-and-forget 작업이 완료 전에 GC되지 않도록 참조 유지
+_background_tasks = set()
+
+
+def get_async_redis_client():
+    """
+    현재 이벤트 루프용 redis.asyncio 클라이언트 반환 (서킷 브레이커가 열려 있으면 None)
+    """
+    if not get_redis_circuit_breaker().allow():
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+        client = _async_redis_clients.get(loop)
+        if client is None:
+            options = settings.CACHES['default'].get('OPTIONS', {})
+            pool_kwargs = options.get('CONNECTION_POOL_KWARGS', {})
+            client = aioredis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=options.get('SOCKET_CONNECT_TIMEOUT'),
+                socket_timeout=options.get('SOCKET_TIMEOUT'),
+                max_connections=pool_kwargs.get('max_connections'),
+            )
+            _async_redis_clients[loop] = client
+        return client
+    except Exception as e:
+        logger.error(f"비동기 Redis 연결 실패: {e}")
+        return None
+
+
+def spawn_background_task(coro):
+    """
+    코루틴을 응답과 무관한 백그라운드 작업으로 실행합니다 (fire-and-forget).
+    """
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def aincrement_visitor_count(ip_address=None, user_agent=None, weight=1):
+    """increment_visitor_count의 비동기 버전"""
+    now = datetime.now()
+    redis_client = get_async_redis_client()
+    if not redis_client:
+        get_visitor_buffer().add(ip_address, when=now, weight=weight)
+        return None
+    
+    try:
+        # 슬롯이 다른 키를 함께 증가시키므로 MULTI 없이 전송 (Redis Cluster에서 CROSSSLOT 방지)
+        pipe = redis_client.pipeline(transaction=False)
+        seen = []
+        date_str = now.strftime('%Y-%m-%d')
+        _queue_visitor_counts(pipe, date_str, _single_visit(now, ip_address, weight), seen)
+        # 실시간 스트림 구독자(워커별 허브)에게 변경 알림 (결과 인덱스가 바뀌지 않도록 마지막에 추가)
+        pipe.publish(VISITOR_UPDATES_CHANNEL, date_str)
+        started = time.perf_counter()
+        results = await pipe.execute()
+        get_visitor_sampler().observe(time.perf_counter() - started)
+        get_redis_circuit_breaker().record_success()
+        _mark_seen(seen)
+        return results[0], results[2]
+    except Exception as e:
+        logger.error(f"접속자 수 증가 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        get_visitor_buffer().add(ip_address, when=now, weight=weight)
+        return None
+
+
+async def aget_daily_visitors_count(target_date=None):
+    """get_daily_visitors_count의 비동기 버전"""
+    redis_client = get_async_redis_client()
+    if not redis_client:
+        return 0
+    
+    try:
+        daily_keys = get_counter_keys(f"{DAILY_VISITORS_KEY_PREFIX}{_to_date_str(target_date)}")
+        count = _sum_counter_values(await redis_client.mget(daily_keys))
+        return count or 0
+    except Exception as e:
+        logger.error(f"일별 접속자 수 조회 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        return 0
+
+
+async def aget_daily_unique_visitors_count(target_date=None):
+    """get_daily_unique_visitors_count의 비동기 버전"""
+    redis_client = get_async_redis_client()
+    if not redis_client:
+        return 0
+    
+    try:
+        unique_key = get_unique_visitors_key(_to_date_str(target_date))
+        count = await _count_unique_visitors(redis_client, unique_key)
+        return count if count else 0
+    except Exception as e:
+        logger.error(f"일별 고유 접속자 수 조회 실패: {e}")
+        get_redis_circuit_breaker().record_failure()
+        return 0
+
+
+async def aget_period_unique_visitors_counts(target_date=None):
+    """get_period_unique_visitors_counts의 비동기 버전"""
+    periods = _unique_periods(target_date)
+    redis_client = get_async_redis_client()
+    if not redis_client:
+        return _parse_period_unique_results(periods, [], [])
+    
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        queued = [name for name, start, end, merged_key in periods if _queue_merged_unique_reads(pipe, start, end, merged_key)]
+        results = await pipe.execute()
+    except Exception as e:
+        logger.error(f"기간별 고유 접속자 수 조회 실패 ({_to_date_str(target_date)}): {e}")
+        get_redis_circuit_breaker().record_failure()
+        return _parse_period_unique_results(periods, [], [])
+    return _parse_period_unique_results(periods, queued, results)
+
+
+async def aget_total_visitors_count():
+    """get_total_visitors_count의 비동기 버전"""
+    return (await aget_visitor_stats())['total']
+
+
+async def arebuild_historical_visitors_total(redis_client=None):
+    """rebuild_historical_visitors_total의 비동기 버전"""
+    from main.models import VisitorStats
+    
+    total = (await VisitorStats.objects.filter(date__lt=date.today()).aaggregate(
+        total=models.Sum('unique_visitor_count')
+    ))['total'] or 0
+    
+    if redis_client:
+        try:
+            await redis_client.eval(
+                STORE_HISTORICAL_TOTAL_SCRIPT, 1, HISTORICAL_TOTAL_KEY,
+                _historical_through_str(), int(total),
+            )
+        except Exception as e:
+            logger.error(f"누적 합계 저장 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+    
+    return int(total)
+
+
+async def aget_visitor_stats():
+    """get_visitor_stats의 비동기 버전 (Redis 왕복 1회)"""
+    today_str = get_today_date_str()
+    redis_client = None if _stats_redis_suspended() else get_async_redis_client()
+    result = None
+    
+    if redis_client:
+        started = time.monotonic()
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            _queue_visitor_stats_reads(pipe, today_str)
+            result = await pipe.execute()
+        except Exception as e:
+            logger.error(f"접속자 통계 조회 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+        _record_stats_redis_read(time.monotonic() - started, result is not None)
+    
+    if result is None:
+        return await _avisitor_stats_from_db(today_str)
+    
+    today, today_unique, historical = _parse_visitor_stats_result(result)
+    if historical is None:
+        historical = await arebuild_historical_visitors_total(redis_client)
+    
+    return {
+        'today': today,
+        'today_unique': today_unique,
+        'total': historical + today_unique,
+        'date': today_str,
+    }
+
+
+async def _avisitor_stats_from_db(today_str):
+    """_visitor_stats_from_db의 비동기 버전"""
+    try:
+        stats = await _visitor_stats_db_queryset(today_str).aaggregate(**_visitor_stats_db_aggregates(today_str))
+    except Exception as e:
+        logger.error(f"DB에서 접속자 통계 조회 실패: {e}")
+        return {'today': 0, 'today_unique': 0, 'total': 0, 'date': today_str}
+    return _visitor_stats_db_result(stats, today_str)
+
+
+async def aget_visitor_count_from_db(target_date):
+    """get_visitor_count_from_db의 비동기 버전"""
+    from main.models import VisitorStats
+    
+    try:
+        if isinstance(target_date, str):
+            target_date = date.fromisoformat(target_date)
+        
+        stats = await VisitorStats.objects.aget(date=target_date)
+        return {
+            'visitor_count': stats.visitor_count,
+            'unique_visitor_count': stats.unique_visitor_count,
+        }
+    except VisitorStats.DoesNotExist:
+        return None
+    except Exception as e:
+        logger.error(f"DB에서 접속자 수 조회 실패: {e}")
+        return None
+
+
+async def aget_visitor_stats_range(start, end):
+    """get_visitor_stats_range의 비동기 버전"""
+    from main.models import VisitorStats
+    
+    dates, redis_dates = _visitor_stats_range_dates(start, end)
+    db_stats = {
+        row[0]: row[1:]
+        async for row in VisitorStats.objects.filter(date__range=(start, end)).values_list(
+            'date', 'visitor_count', 'unique_visitor_count', 'visit_count', 'sample_rate'
+        )
+    }
+    redis_dates = [day for day in dates if day in redis_dates or day not in db_stats]
+    
+    redis_stats = {}
+    redis_client = get_async_redis_client()
+    if redis_client and redis_dates:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            _queue_daily_stats_reads(pipe, redis_dates)
+            redis_stats = _parse_daily_stats_reads(redis_dates, await pipe.execute())
+        except Exception as e:
+            logger.error(f"기간 접속자 수 조회 실패: {e}")
+            get_redis_circuit_breaker().record_failure()
+    
+    return _merge_visitor_stats_range(dates, db_stats, redis_stats)
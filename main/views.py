@@ -1,49 +1,63 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.db.models import Q
-from django.views.decorators.cache import cache_page
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.decorators.cache import never_cache
 from django.conf import settings
+from .bloom import get_visitor_bloom_filter
+from .circuit_breaker import get_redis_circuit_breaker
 from .models import Category, Topic
-from .utils import get_visitor_stats, get_today_visitors_count, get_total_visitors_count, get_daily_visitors_count
+from .page_cache import versioned_cache_page
+from .sampling import get_visitor_sampler
+from .stats_cache import get_visitor_stats_cache
+from .streams import get_visitor_stats_hub
+from .utils import get_popular_topics, get_visitor_stats, get_total_visitors_count, get_daily_visitors_count, get_daily_unique_visitors_count, get_period_unique_visitors_counts, get_visitor_stats_range, get_visitor_timeseries
+from .utils import aget_visitor_stats, aget_total_visitors_count, aget_daily_visitors_count, aget_daily_unique_visitors_count, aget_period_unique_visitors_counts, aget_visitor_count_from_db, aget_visitor_stats_range
 
 
 # 개발 환경에서는 캐싱 비활성화, 프로덕션에서는 24시간 캐싱
+# (콘텐츠가 바뀌면 main.signals가 세대 번호를 올려 해당 페이지만 무효화)
 cache_timeout = 0 if settings.DEBUG else 60 * 60 * 24
 
 
-@cache_page(cache_timeout)
+@versioned_cache_page('index', cache_timeout)
 def index(request):
     """메인 페이지"""
     categories = Category.objects.all()
     context = {
         'categories': categories,
+        'popular_topics': get_popular_topics(getattr(settings, 'POPULAR_TOPICS_LIMIT', 5)),
     }
     return render(request, 'main/index.html', context)
 
 
-@cache_page(cache_timeout)
+@versioned_cache_page('tutorial', cache_timeout)
 def tutorial(request, category):
     """카테고리별 튜토리얼 목록"""
     category_obj = get_object_or_404(Category, slug=category)
-    topics = Topic.objects.filter(category=category_obj)
+    topics = Topic.objects.filter(category=category_obj).defer('content', 'rendered_html')
     
     context = {
         'category': category,
         'category_obj': category_obj,
         'category_name': category_obj.name,
         'topics': topics,
+        'popular_topics': get_popular_topics(getattr(settings, 'POPULAR_TOPICS_LIMIT', 5), category=category),
     }
     return render(request, 'main/tutorial.html', context)
 
 
-@cache_page(cache_timeout)
+@versioned_cache_page('topic_detail', cache_timeout)
 def topic_detail(request, category, topic):
     """주제 상세 페이지"""
     category_obj = get_object_or_404(Category, slug=category)
-    topic_obj = get_object_or_404(Topic, category=category_obj, slug=topic)
+    # 본문은 저장 시 렌더링한 rendered_html만 가져옴 (원본 content는 사용하지 않음)
+    topic_obj = get_object_or_404(Topic.objects.defer('content'), category=category_obj, slug=topic)
     
-    # 같은 카테고리의 다른 주제들 가져오기 (사이드바용)
-    topics = Topic.objects.filter(category=category_obj)
+    # 같은 카테고리의 다른 주제들 가져오기 (사이드바용, 본문 제외)
+    topics = Topic.objects.filter(category=category_obj).defer('content', 'rendered_html')
     
     context = {
         'category': category,
@@ -52,7 +66,7 @@ def topic_detail(request, category, topic):
         'topic': topic,  # sidebar의 active 클래스 비교를 위해 slug 문자열 유지
         'topic_obj': topic_obj,
         'title': topic_obj.title,
-        'content': topic_obj.content,
+        'content': topic_obj.rendered_html,
         'topics': topics,
     }
     return render(request, 'main/topic_detail.html', context)
@@ -69,13 +83,81 @@ def visitor_stats(request):
             'total': 누적 접속자 수,
             'date': 오늘 날짜 (YYYY-MM-DD)
         }
+    
+    워커별로 짧은 시간 캐시한 스냅샷을 사용하고, If-None-Match가 현재 스냅샷의
+    ETag와 같으면 Redis/DB 조회 없이 304를 반환합니다.
+    """
+    stats_cache = get_visitor_stats_cache()
+    snapshot = stats_cache.peek()
+    if snapshot is None or not _etag_matches(request, snapshot.etag):
+        snapshot = stats_cache.get()
+    return _visitor_stats_response(request, snapshot)
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+
+def _visitor_stats_response(request, snapshot):
+    """스냅샷으로 200 또는 304 응답을 만들고 캐시 헤더를 설정"""
+    if _etag_matches(request, snapshot.etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(snapshot.body, content_type='application/json')
+    response['ETag'] = snapshot.etag
+    # 브라우저/프록시가 짧게 재사용하고, 만료 후에도 백그라운드 갱신 동안 이전 값 사용 허용
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=get_visitor_stats_cache().ttl,
+        stale_while_revalidate=getattr(settings, 'VISITOR_STATS_STALE_WHILE_REVALIDATE', 30),
+    )
+    return response
+
+
+def visitor_stats_stream(request):
+    """
+    접속자 수 실시간 스트림 (Server-Sent Events)
+    
+    동기 워커에서는 연결마다 워커 스레드를 점유하므로 VISITOR_STATS_STREAM_MAX_SECONDS 후
+    연결을 끝내고 브라우저의 자동 재연결에 맡깁니다.
     """
-    stats = get_visitor_stats()
-    return JsonResponse(stats)
+    if not getattr(settings, 'VISITOR_STATS_STREAM_ENABLED', False):
+        raise Http404
+    hub = get_visitor_stats_hub()
+    max_seconds = getattr(settings, 'VISITOR_STATS_STREAM_MAX_SECONDS', 300)
+    return _event_stream_response(hub.stream(max_seconds=max_seconds))
+
+
+def _event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 프록시 버퍼링 비활성화
+    return response
 
 
 def visitor_stats_detail(request):
-    """접속자 수 상세 통계 API"""
+    """
+    접속자 수 상세 통계 API
+    
+    ?date=YYYY-MM-DD: 특정 날짜
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD: 기간 내 일별 통계 (DB 쿼리 한 번 + Redis 파이프라인 한 번)
+    
+    날짜 하나를 조회하면 그 날짜가 속한 주(월요일~일요일)와 달의 고유 접속자 수
+    (week_unique, month_unique, Redis에 남아 있는 최근 30일 기준)도 함께 반환합니다.
+    """
+    if 'from' in request.GET or 'to' in request.GET:
+        try:
+            start, end = _parse_date_range(request)
+            days = get_visitor_stats_range(start, end)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return _visitor_stats_range_response(start, end, days, get_total_visitors_count())
+    
     target_date = request.GET.get('date')
     
     if target_date:
@@ -96,23 +178,178 @@ def visitor_stats_detail(request):
                         'today': db_stats['visitor_count'],
                         'today_unique': db_stats['unique_visitor_count'],
                         'total': get_total_visitors_count(),
+                        **get_period_unique_visitors_counts(query_date),
                     })
         except ValueError:
             pass
         
         # 오늘 날짜이거나 DB에 없는 경우 Redis에서 조회
         daily_count = get_daily_visitors_count(target_date)
-        return JsonResponse({
+        response = {
             'date': target_date,
             'today': daily_count,
+            'today_unique': get_daily_unique_visitors_count(target_date),
             'total': get_total_visitors_count(),
+        }
+        try:
+            response.update(get_period_unique_visitors_counts(target_date))
+        except ValueError:
+            pass  # 날짜 형식이 잘못된 경우 기간별 값은 생략
+        return JsonResponse(response)
+    else:
+        # 오늘은 Redis에서 조회 (한 번의 왕복으로 오늘/누적 값을 함께 가져옴)
+        stats = get_visitor_stats()
+        return JsonResponse({
+            'today': stats['today'],
+            'today_unique': stats['today_unique'],
+            'total': stats['total'],
+            'date': stats['date'],
+            **get_period_unique_visitors_counts(stats['date']),
         })
+
+
+def _parse_date_range(request):
+    """?from=&to= 파라미터를 (시작 날짜, 종료 날짜)로 변환 (하나만 있으면 같은 날짜로 간주)"""
+    from datetime import date as date_class
+    
+    start = request.GET.get('from') or request.GET.get('to')
+    end = request.GET.get('to') or start
+    return date_class.fromisoformat(start), date_class.fromisoformat(end)
+
+
+def _visitor_stats_range_response(start, end, days, total):
+    return JsonResponse({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'days': days,
+        'total': total,
+    })
+
+
+def visitor_stats_series(request):
+    """
+    접속자 수 시계열 API
+    
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD&resolution=hour|minute
+    (기본값: 오늘 하루, 시간 단위)
+    """
+    from datetime import date as date_class
+    
+    resolution = request.GET.get('resolution', 'hour')
+    try:
+        today = date_class.today()
+        start = date_class.fromisoformat(request.GET['from']) if request.GET.get('from') else today
+        end = date_class.fromisoformat(request.GET['to']) if request.GET.get('to') else max(start, today)
+        series = get_visitor_timeseries(start, end, resolution)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'resolution': resolution,
+        'series': series,
+    })
+
+
+@never_cache
+@staff_member_required
+def visitor_counting_status(request):
+    """
+    접속자 수 집계 상태 API (관리자 전용)
+    
+    응답한 워커 프로세스의 Redis 서킷 브레이커, 표본 집계, Bloom 필터 지표를 반환합니다.
+    상태는 워커 프로세스별로 따로 유지되므로 pid로 어느 워커의 값인지 구분합니다.
+    
+    Returns:
+        JSON: {
+            'pid': 워커 프로세스 ID,
+            'circuit_breaker': CircuitBreaker.metrics(),
+            'sampler': VisitorSampler.metrics(),
+            'bloom_filter': DailyBloomFilter.metrics() 또는 null (VISITOR_BLOOM_FILTER_ENABLED=False)
+        }
+    """
+    import os
+    
+    bloom = get_visitor_bloom_filter()
+    return JsonResponse({
+        'pid': os.getpid(),
+        'circuit_breaker': get_redis_circuit_breaker().metrics(),
+        'sampler': get_visitor_sampler().metrics(),
+        'bloom_filter': bloom.metrics() if bloom is not None else None,
+    })
+
+
+async def avisitor_stats(request):
+    """접속자 수 통계 API (ASGI용 비동기 버전, 응답 형식은 visitor_stats와 동일)"""
+    stats_cache = get_visitor_stats_cache()
+    snapshot = stats_cache.peek()
+    if snapshot is None or not _etag_matches(request, snapshot.etag):
+        snapshot = await stats_cache.aget()
+    return _visitor_stats_response(request, snapshot)
+
+
+async def avisitor_stats_stream(request):
+    """접속자 수 실시간 스트림 (ASGI용 비동기 버전, 연결마다 스레드를 사용하지 않음)"""
+    if not getattr(settings, 'VISITOR_STATS_STREAM_ENABLED', False):
+        raise Http404
+    hub = get_visitor_stats_hub()
+    max_seconds = getattr(settings, 'VISITOR_STATS_STREAM_MAX_SECONDS', 300)
+    return _event_stream_response(hub.astream(max_seconds=max_seconds))
+
+
+async def avisitor_stats_detail(request):
+    """접속자 수 상세 통계 API (ASGI용 비동기 버전, 응답 형식은 visitor_stats_detail과 동일)"""
+    from datetime import date as date_class
+    
+    if 'from' in request.GET or 'to' in request.GET:
+        try:
+            start, end = _parse_date_range(request)
+            days = await aget_visitor_stats_range(start, end)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return _visitor_stats_range_response(start, end, days, await aget_total_visitors_count())
+    
+    target_date = request.GET.get('date')
+    
+    if target_date:
+        try:
+            query_date = date_class.fromisoformat(target_date)
+            
+            # 오늘 이전 날짜는 DB에서 조회
+            if query_date < date_class.today():
+                db_stats = await aget_visitor_count_from_db(query_date)
+                if db_stats:
+                    return JsonResponse({
+                        'date': target_date,
+                        'today': db_stats['visitor_count'],
+                        'today_unique': db_stats['unique_visitor_count'],
+                        'total': await aget_total_visitors_count(),
+                        **await aget_period_unique_visitors_counts(query_date),
+                    })
+        except ValueError:
+            pass
+        
+        # 오늘 날짜이거나 DB에 없는 경우 Redis에서 조회
+        response = {
+            'date': target_date,
+            'today': await aget_daily_visitors_count(target_date),
+            'today_unique': await aget_daily_unique_visitors_count(target_date),
+            'total': await aget_total_visitors_count(),
+        }
+        try:
+            response.update(await aget_period_unique_visitors_counts(target_date))
+        except ValueError:
+            pass  # 날짜 형식이 잘못된 경우 기간별 값은 생략
+        return JsonResponse(response)
     else:
-        # 오늘은 Redis에서 조회
+        stats = await aget_visitor_stats()
         return JsonResponse({
-            'today': get_today_visitors_count(),
-            'total': get_total_visitors_count(),
-            'date': get_visitor_stats()['date'],
+            'today': stats['today'],
+            'today_unique': stats['today_unique'],
+            'total': stats['total'],
+            'date': stats['date'],
+            **await aget_period_unique_visitors_counts(stats['date']),
         })
 
 
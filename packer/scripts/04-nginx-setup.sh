@@ -27,6 +27,10 @@ upstream django {
     server 127.0.0.1:8000;
 }
 
+# 접속자 수 집계용 로그 형식 (탭 구분, python manage.py tail_visitor_log가 읽음)
+# 시각(초.밀리초), 접속 주소, X-Forwarded-For, 상태 코드, 요청 URI, User-Agent
+log_format visitor_log '\$msec\t\$remote_addr\t\$http_x_forwarded_for\t\$status\t\$request_uri\t\$http_user_agent';
+
 server {
     listen 80;
     server_name _;
@@ -53,8 +57,25 @@ server {
     #     expires 30d;
     # }
 
-    # Django 애플리케이션
+    # 정적 사이트 (python manage.py export_static_site가 내보낸 HTML)
+    # 파일이 있으면 nginx가 직접 제공(.gz가 있으면 그대로 전송)하고, 없으면 Django로 넘김
+    # 모든 페이지 URL은 /로 끝나므로 \${uri}index.html로 찾음 (검색, API, 관리자 등은 파일이 없음)
+    # STATIC_SITE_EXPORT_ENABLED=False이면 배포(scripts/after_install.sh)가 디렉토리를 비워 모든 요청이 Django로 감
     location / {
+        access_log /var/log/nginx/access.log;
+        access_log /var/log/nginx/anonymous_project_visitors.log visitor_log;
+
+        root /home/ubuntu/anonymous_project/static_site;
+        gzip_static on;
+        add_header Cache-Control "no-cache";
+        try_files \${uri}index.html @django;
+    }
+
+    # Django 애플리케이션
+    location @django {
+        access_log /var/log/nginx/access.log;
+        access_log /var/log/nginx/anonymous_project_visitors.log visitor_log;
+
         proxy_pass http://django;
         proxy_set_header Host \$host;
         proxy_set_header X-Real-IP \$remote_addr;
@@ -15,6 +15,7 @@ sudo mkdir -p $APP_DIR
 sudo mkdir -p $LOG_DIR
 sudo mkdir -p $APP_DIR/staticfiles
 sudo mkdir -p $APP_DIR/media
+sudo mkdir -p $APP_DIR/static_site  # export_static_site 출력 (nginx root)
 
 # Python 가상환경 디렉토리 생성
 # 참고: 가상환경 자체는 02-5-python-packages.sh에서 생성되지만, 디렉토리는 미리 생성
@@ -28,6 +29,7 @@ sudo chown -R ubuntu:ubuntu $VENV_DIR
 sudo chmod 755 $LOG_DIR
 sudo chmod 755 $APP_DIR/staticfiles
 sudo chmod 755 $APP_DIR/media
+sudo chmod 755 $APP_DIR/static_site
 sudo chmod 755 $VENV_DIR
 
 echo "✅ 디렉토리 구조 생성 완료"
@@ -194,19 +194,10 @@ if [ $COLLECTSTATIC_EXIT_CODE -eq 0 ]; then
     echo "✅ Static files 수집 성공"
 
     # HTML 캐시 무효화 (새로운 static 파일 URL이 반영되도록)
+    # 페이지 캐시 세대 번호만 올림 (cache.clear()는 같은 Redis의 Celery 데이터까지 지움)
     echo ""
     echo "HTML 캐시 무효화 중..."
-    CACHE_CLEAR_OUTPUT=$(python manage.py shell << EOF 2>&1
-from django.core.cache import cache
-try:
-    cache.clear()
-    print("✅ 캐시가 무효화되었습니다.")
-except Exception as e:
-    print(f"⚠️  캐시 무효화 중 오류 발생: {e}")
-    import sys
-    sys.exit(1)
-EOF
-    )
+    CACHE_CLEAR_OUTPUT=$(python manage.py invalidate_page_cache 2>&1)
     CACHE_CLEAR_EXIT_CODE=$?
     echo "$CACHE_CLEAR_OUTPUT"
     
@@ -391,6 +382,24 @@ if python manage.py migrate --noinput --verbosity 2; then
     echo "생성된 테이블 확인 중..."
     python manage.py showmigrations --list | grep -E "^\[X\]|^\[ \]" | head -n 20 || true
     echo "================================"
+
+    # 주제 본문 재렌더링 (STATIC_URL이 바뀐 주제만 다시 만들고 해당 페이지 캐시 무효화)
+    echo "주제 본문 재렌더링 중..."
+    if ! python manage.py rerender_topics 2>&1; then
+        echo "⚠️  주제 본문 재렌더링 중 오류가 발생했습니다. (계속 진행)"
+    fi
+
+    # 정적 사이트 내보내기 (nginx가 직접 제공할 HTML, 새 템플릿/정적 파일 URL 반영)
+    if [ "$STATIC_SITE_EXPORT_ENABLED" = "True" ]; then
+        echo "정적 사이트 내보내는 중..."
+        if ! python manage.py export_static_site 2>&1; then
+            echo "⚠️  정적 사이트 내보내기 중 오류가 발생했습니다. 파일을 삭제하고 Django로 제공합니다."
+            python manage.py export_static_site --clear 2>&1 || true
+        fi
+    else
+        # nginx는 항상 정적 사이트 파일을 먼저 찾으므로, 꺼져 있으면 이전에 내보낸 파일을 지워 Django로 제공
+        python manage.py export_static_site --clear 2>&1 || echo "⚠️  정적 사이트 파일 삭제 중 오류가 발생했습니다. (계속 진행)"
+    fi
 else
     echo "❌ Migrations 실행 실패"
     echo ""
@@ -144,6 +144,12 @@ if command -v supervisorctl &> /dev/null; then
     echo "Celery 서비스 재시작 중..."
     sudo supervisorctl restart celery_worker || sudo supervisorctl start celery_worker || true
     sudo supervisorctl restart celery_beat || sudo supervisorctl start celery_beat || true
+
+    # 미들웨어 대신 nginx 접속 로그로 접속자 수를 집계하는 경우 (정적 사이트 내보내기 사용 시 필수)
+    if grep -qE '^[[:space:]]*VISITOR_COUNT_MIDDLEWARE_ENABLED[[:space:]]*=[[:space:]]*False' "$APP_DIR/.env" 2>/dev/null; then
+        echo "접속 로그 집계(visitor_log_tail) 재시작 중..."
+        sudo supervisorctl restart visitor_log_tail || sudo supervisorctl start visitor_log_tail || true
+    fi
 fi
 
 deactivate
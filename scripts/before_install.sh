@@ -370,6 +370,21 @@ autostart=false
 autorestart=true
 redirect_stderr=true
 stdout_logfile=/home/ubuntu/anonymous_project/logs/celery_beat.log
+
+; 접속 로그 기반 접속자 수 집계 (필요한 경우, VISITOR_COUNT_MIDDLEWARE_ENABLED=False와 함께 사용)
+; STATIC_SITE_EXPORT_ENABLED=True이면 필수 (nginx가 직접 제공한 페이지는 미들웨어를 거치지 않음)
+; .env에 VISITOR_COUNT_MIDDLEWARE_ENABLED=False가 있으면 application_start.sh가 시작
+; nginx 로그를 읽기 위해 ubuntu 사용자가 adm 그룹에 속해 있어야 함
+[program:visitor_log_tail]
+command=/home/ubuntu/venv/bin/python manage.py tail_visitor_log
+directory=/home/ubuntu/anonymous_project
+environment=DJANGO_SETTINGS_MODULE="anonymous_project.settings.production"
+user=ubuntu
+autostart=false
+autorestart=true
+stopsignal=TERM
+redirect_stderr=true
+stdout_logfile=/home/ubuntu/anonymous_project/logs/visitor_log_tail.log
 EOF
 
 # Supervisor 서비스 활성화 및 재시작
@@ -0,0 +1,29 @@
+#!/bin/bash
+
+# ValidateService 후 페이지 캐시 예열
+# 배포로 워커가 재시작되고 세대 번호가 바뀐 뒤 첫 방문자가 렌더링 비용을 내지 않도록
+# 모든 페이지를 미리 렌더링해 캐시에 저장합니다.
+# 예열 실패는 배포 실패로 처리하지 않음 (캐시가 비어 있어도 서비스는 정상 동작)
+
+echo "================================"
+echo "페이지 캐시 예열 시작"
+echo "================================"
+
+APP_DIR="/home/ubuntu/anonymous_project"
+VENV_DIR="/home/ubuntu/venv"
+
+# 가상환경 활성화
+source $VENV_DIR/bin/activate
+
+cd $APP_DIR
+
+# 환경 변수 설정
+export DJANGO_SETTINGS_MODULE=anonymous_project.settings.production
+
+if python manage.py warm_cache --workers 4 2>&1; then
+    echo "✅ 페이지 캐시 예열 완료"
+else
+    echo "⚠️  페이지 캐시 예열 중 오류가 발생했습니다. (배포는 계속 진행)"
+fi
+
+exit 0
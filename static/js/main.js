@@ -89,23 +89,50 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
 
-        fetch('/api/visitors/stats/')
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error('Network response was not ok');
-                }
-                return response.json();
-            })
-            .then(data => {
-                // API 스펙: views.visitor_stats에서 today, today_unique, total 반환
-                const today = data.today_unique ?? data.today ?? 0;
-                const total = data.total ?? 0;
-                todayEl.textContent = today;
-                totalEl.textContent = total;
-            })
-            .catch(error => {
-                console.error('방문자 통계 로드 실패:', error);
-            });
+        function renderStats(data) {
+            // API 스펙: views.visitor_stats에서 today, today_unique, total 반환
+            const today = data.today_unique ?? data.today ?? 0;
+            const total = data.total ?? 0;
+            todayEl.textContent = today;
+            totalEl.textContent = total;
+        }
+
+        function fetchStats() {
+            fetch('/api/visitors/stats/')
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error('Network response was not ok');
+                    }
+                    return response.json();
+                })
+                .then(renderStats)
+                .catch(error => {
+                    console.error('방문자 통계 로드 실패:', error);
+                });
+        }
+
+        // 실시간 스트림(SSE)이 활성화되어 있으면 폴링 대신 스트림 사용
+        const statsEl = todayEl.closest('.visitor-stats');
+        const streamUrl = statsEl ? statsEl.dataset.streamUrl : null;
+        if (!streamUrl || !window.EventSource) {
+            fetchStats();
+            return;
+        }
+
+        const source = new EventSource(streamUrl);
+        let received = false;
+        source.onmessage = function(event) {
+            received = true;
+            renderStats(JSON.parse(event.data));
+        };
+        source.onerror = function() {
+            // 첫 메시지를 받기 전에 실패하면 스트림을 닫고 한 번 조회로 대체
+            // (이후 오류는 EventSource가 자동으로 재연결)
+            if (!received) {
+                source.close();
+                fetchStats();
+            }
+        };
     })();
 });
 